@@ -0,0 +1,3 @@
+# __init__.py
+
+from benchmarks.harness import benchmark, run, compare, merge_results, load_results, save_results
@@ -0,0 +1,62 @@
+# run the benchmarks, python -m benchmarks --help
+
+import os
+import sys
+import argparse
+import logging
+from benchmarks.harness import run, compare, merge_results, load_results, save_results, DEFAULT_TOLERANCE
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def main(args=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="time the engine hot paths headless and compare to a baseline")
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks with this in their name")
+    parser.add_argument("--repeat", type=int, default=5, help="timed batches per benchmark")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline results to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slow down before failing, 0.25 is 25%%")
+    parser.add_argument("--output", help="write the results as json to this file")
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    options = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.INFO if options.verbose else logging.WARNING)
+
+    results = run(options.pattern, options.repeat)
+
+    if options.update_baseline:
+        baseline = load_results(options.baseline) if os.path.isfile(options.baseline) else {}
+        # a filtered run only replaces the benchmarks it ran
+        timings = dict(baseline.get("benchmarks", {}))
+        timings.update(results["benchmarks"])
+        save_results(options.baseline, dict(results, benchmarks=timings))
+        if options.output:
+            save_results(options.output, results)
+        print("baseline written to {}".format(options.baseline))
+        return 0
+
+    if not os.path.isfile(options.baseline):
+        print("no baseline at {}, run with --update-baseline".format(options.baseline))
+        return 1
+
+    baseline = load_results(options.baseline)
+    lines, regressions = compare(results, baseline, options.tolerance)
+    if regressions:
+        # time the slow ones again so one noisy batch does not fail the run
+        results = merge_results(results, run(repeat=options.repeat, names=regressions))
+        lines, regressions = compare(results, baseline, options.tolerance)
+    if options.output:
+        save_results(options.output, results)
+
+    print("\n".join(lines))
+    if regressions:
+        print("\n{} benchmarks regressed more than {:.0f}%: {}".format(
+            len(regressions), options.tolerance * 100, ", ".join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+# engine hot path benchmarks, all headless
+
+import os
+import atexit
+import shutil
+import tempfile
+import numpy as np
+import arcade
+from PIL import Image
+import orion_core
+from orion_core.shared import collision
+from benchmarks.harness import benchmark
+
+MAP_SIZES = (64, 256, 1024)
+SEED = 1234
+
+
+def make_map_string(size: int) -> str:
+    """ deterministic level of walls, floor and empty space """
+    rng = np.random.default_rng(SEED)
+    chars = np.array(list(" #G"))[rng.choice(3, size * size, p=(0.7, 0.2, 0.1))]
+    return "".join(chars.tolist())
+
+
+def make_tile_map(size: int) -> orion_core.TileMap:
+    tile_map = orion_core.TileMap(size, size, 32)
+    tile_map.parse_map_string(make_map_string(size))
+    tile_map.set_solid_tiles("#G")
+    return tile_map
+
+
+_temp_path = None
+
+
+def temp_path() -> str:
+    global _temp_path
+    if _temp_path is None:
+        _temp_path = tempfile.mkdtemp(prefix="orion-bench-")
+        atexit.register(shutil.rmtree, _temp_path, True)
+    return _temp_path
+
+
+def make_sheet_file(tiles: int, tile_size: int) -> str:
+    file = os.path.join(temp_path(), "sheet_{}_{}.png".format(tiles, tile_size))
+    rng = np.random.default_rng(SEED)
+    pixels = rng.integers(0, 256, (tiles * tile_size, tiles * tile_size, 4), dtype=np.uint8)
+    Image.fromarray(pixels, "RGBA").save(file)
+    return file
+
+
+def _register_map_benchmarks(size: int) -> None:
+
+    @benchmark("tile_map.parse_map_string[{}]".format(size))
+    def parse_map_string():
+        tile_map = orion_core.TileMap(size, size, 32)
+        map_string = make_map_string(size)
+        return lambda: tile_map.parse_map_string(map_string)
+
+    @benchmark("tile_map.get_tile[{}]".format(size))
+    def get_tile():
+        tile_map = make_tile_map(size)
+        rng = np.random.default_rng(SEED)
+        points = rng.integers(1, tile_map.width, (1000, 2)).tolist()
+
+        def run():
+            for x, y in points:
+                tile_map.get_tile(x, y)
+        return run
+
+    @benchmark("tile_map.get_solid[{}]".format(size))
+    def get_solid():
+        tile_map = make_tile_map(size)
+        rng = np.random.default_rng(SEED)
+        x, y = rng.uniform(0, tile_map.width, (2, 10000))
+        return lambda: tile_map.get_solid(x, y)
+
+
+for _size in MAP_SIZES:
+    _register_map_benchmarks(_size)
+
+
+@benchmark("tile_map.parse_map_string_sprites[64]")
+def parse_map_string_sprites():
+    texture = arcade.Texture("bench_tile", Image.new("RGBA", (32, 32), (255, 255, 255, 255)))
+    tile_map = orion_core.TileMap(64, 64, 32)
+    tile_map.load_texture_map({"#": texture, "G": texture})
+    map_string = make_map_string(64)
+    return lambda: tile_map.parse_map_string(map_string)
+
+
+@benchmark("spritesheet.load")
+def spritesheet_load():
+    file = make_sheet_file(16, 32)
+    # a fresh registry each time so the decode is not served from memory
+    return lambda: orion_core.Spritesheet(file, 32, lazy=True, registry=orion_core.TextureRegistry())
+
+
+@benchmark("spritesheet.slice")
+def spritesheet_slice():
+    file = make_sheet_file(16, 32)
+    sheet = orion_core.Spritesheet(file, 32, lazy=True, registry=orion_core.TextureRegistry())
+
+    def run():
+        for region in sheet.regions:
+            region.image()
+    return run
+
+
+@benchmark("spritesheet.textures")
+def spritesheet_textures():
+    file = make_sheet_file(16, 32)
+    return lambda: orion_core.Spritesheet(file, 32, registry=orion_core.TextureRegistry())
+
+
+@benchmark("window.on_update[idle]")
+def window_update_idle():
+    window = orion_core.Window.headless()
+    return lambda: window.on_update(1 / 60)
+
+
+@benchmark("window.on_update[key_repeat]")
+def window_update_key_repeat():
+    window = orion_core.Window.headless()
+    for key in (arcade.key.LEFT, arcade.key.UP, arcade.key.A, arcade.key.D):
+        window.on_key_press(key, 0)
+    return lambda: window.on_update(1 / 60)
+
+
+@benchmark("cellular.step[256]")
+def cellular_step():
+    life = orion_core.CellularAutomaton(256, 256, edges="wrap")
+    life.randomize(0.3, SEED)
+    return life.step
+
+
+@benchmark("grid_renderer.update[1024]")
+def grid_renderer_update():
+    # a large board that is mostly empty, a few live cells change each frame
+    texture = arcade.Texture("bench_cell", Image.new("RGBA", (4, 4), (255, 255, 255, 255)))
+    renderer = orion_core.GridRenderer(1024, 1024, 4, texture)
+    life = orion_core.CellularAutomaton(1024, 1024, edges="wrap")
+    rng = np.random.default_rng(SEED)
+    life.cells[448:576, 448:576] = rng.random((128, 128)) < 0.35
+    states = []
+    for _ in range(8):
+        life.step()
+        states.append(life.cells.copy())
+    frames = iter(range(1 << 62))
+    return lambda: renderer.update(states[next(frames) % len(states)])
+
+
+@benchmark("cellular.bit_packed_step[1024]")
+def bit_packed_step():
+    life = orion_core.BitPackedAutomaton(1024, 1024, edges="wrap")
+    rng = np.random.default_rng(SEED)
+    life.load(rng.random((1024, 1024)) < 0.3)
+    return life.step
+
+
+@benchmark("collision.move_boxes[1000]")
+def move_boxes():
+    tile_map = make_tile_map(256)
+    rng = np.random.default_rng(SEED)
+    x, y = rng.uniform(64, tile_map.width - 64, (2, 1000))
+    delta_x, delta_y = rng.uniform(-40, 40, (2, 1000))
+    return lambda: collision.move_boxes(tile_map, x, y, 12, 16, delta_x, delta_y)
+
+
+@benchmark("collision.move_box")
+def move_box():
+    tile_map = make_tile_map(256)
+    return lambda: collision.move_box(tile_map, 400.0, 400.0, 12, 16, 20.0, -30.0)
+
+
+@benchmark("spatial_hash.query_rect[2000]")
+def spatial_hash_query():
+    spatial = orion_core.SpatialHash(64)
+    rng = np.random.default_rng(SEED)
+    for handle, (x, y) in enumerate(rng.uniform(0, 4096, (2000, 2)).tolist()):
+        spatial.insert(handle, x, y, 16, 16)
+    rects = rng.uniform(0, 3800, (100, 2)).tolist()
+
+    def run():
+        for left, bottom in rects:
+            spatial.query_rect(left, bottom, left + 256, bottom + 256)
+    return run
+
+
+@benchmark("palette.quantize[256]")
+def palette_quantize():
+    table = orion_core.get_palette()
+    table.lookup_cube()
+    pixels = np.random.default_rng(SEED).integers(0, 256, (256, 256, 4), dtype=np.uint8)
+    return lambda: table.quantize(pixels)
+
+
+@benchmark("palette.tint[256]")
+def palette_tint():
+    from orion_core.shared import palette
+    pixels = np.random.default_rng(SEED).integers(0, 256, (256, 256, 4), dtype=np.uint8)
+    return lambda: palette.tint(pixels, (255, 128, 64))
+
+
+@benchmark("entities.update[10000]")
+def entities_update():
+    from orion_core.shared import entities
+    store = orion_core.EntityStore()
+    rng = np.random.default_rng(SEED)
+    for position, velocity in zip(rng.uniform(0, 800, (10000, 2)), rng.uniform(-50, 50, (10000, 2))):
+        store.create(position=position, velocity=velocity, aabb=(8, 8), sprite=0)
+    store.add_system(entities.integrate, entities.POSITION | entities.VELOCITY)
+    store.add_system(entities.confine(0, 0, 800, 600), entities.POSITION | entities.AABB)
+    return lambda: store.update(1 / 60)
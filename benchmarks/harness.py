@@ -0,0 +1,211 @@
+# headless benchmark harness
+
+import gc
+import json
+import time
+import logging
+import platform
+import numpy as np
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# setup functions by benchmark name, each returns the callable to time
+BENCHMARKS = OrderedDict()
+
+DEFAULT_TOLERANCE = 0.25
+MIN_RUN_TIME = 0.1
+# slow downs smaller than this many seconds per call are timer and
+# scheduler noise whatever their percentage
+NOISE_FLOOR = 2e-6
+
+
+def benchmark(name: str):
+    """
+    register a benchmark, the decorated function does any setup and
+    returns a callable taking no arguments that runs the hot path once
+    :param name: dotted name, such as "tile_map.get_tile"
+    """
+    def register(setup):
+        if name in BENCHMARKS:
+            raise ValueError("duplicate benchmark {}".format(name))
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def measure(fn, repeat: int = 5, min_time: float = MIN_RUN_TIME) -> (float, int):
+    """
+    time fn like timeit, calling it in batches long enough to measure
+    :param fn: callable to time
+    :param repeat: batches to run, the fastest one is kept
+    :param min_time: seconds a batch should take at least
+    :return: best seconds per call and calls per batch
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        number, elapsed = _batch_size(fn, min_time)
+        best = elapsed / number
+        for _ in range(repeat - 1):
+            best = min(best, _time_batch(fn, number) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return best, number
+
+
+def sample(fn, repeat: int = 5, min_time: float = MIN_RUN_TIME) -> dict:
+    """
+    time fn with a calibration batch after each of its batches, so both
+    see the same load on the machine, which drifts during a run
+    :param fn: callable to time
+    :param repeat: batches to run
+    :param min_time: seconds a batch should take at least
+    :return: timing with the best seconds per call, calls per batch, the
+             best calibration seconds and the spread, how much slower the
+             median batch was than the best one
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        number = _batch_size(fn, min_time)[0]
+        calibration_number = _batch_size(_calibration, min_time)[0]
+        times = []
+        calibrations = []
+        for _ in range(repeat):
+            times.append(_time_batch(fn, number) / number)
+            calibrations.append(_time_batch(_calibration, calibration_number) / calibration_number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    best = min(times)
+    return {"seconds": best, "number": number, "calibration": min(calibrations),
+            "spread": float(np.median(times)) / best - 1.0 if best > 0 else 0.0}
+
+
+def _batch_size(fn, min_time: float) -> (int, float):
+    # calls per batch for a batch to take min_time, and that batch's time
+    number = 1
+    while True:
+        elapsed = _time_batch(fn, number)
+        if elapsed >= min_time:
+            return number, elapsed
+        number *= 10 if elapsed < min_time / 10 else 2
+
+
+def _time_batch(fn, number: int) -> float:
+    # collect between batches since the collector is off while timing
+    gc.collect()
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return time.perf_counter() - start
+
+
+def _calibration() -> None:
+    # fixed mix of interpreter and numpy work, used to scale results
+    # between machines and runs on a busy machine
+    total = 0
+    for i in range(2000):
+        total += i * i
+    values = np.arange(20000, dtype=np.float64)
+    np.sqrt(values, out=values)
+    values.sort()
+
+
+def run(pattern: str = None, repeat: int = 5, names=None) -> dict:
+    """
+    run the registered benchmarks
+    :param pattern: only run benchmarks with this in their name
+    :param repeat: timed batches per benchmark
+    :param names: only run these benchmarks
+    :return: results with the seconds per call of each benchmark
+    """
+    # importing the suite registers the engine benchmarks
+    import benchmarks.bench_engine
+
+    calibration = float("inf")
+    timings = OrderedDict()
+    for name, setup in BENCHMARKS.items():
+        if pattern and pattern not in name or names is not None and name not in names:
+            continue
+        timing = timings[name] = sample(setup(), repeat)
+        calibration = min(calibration, timing["calibration"])
+        logger.info("{} {:.3f} ms".format(name, timing["seconds"] * 1000))
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "calibration": calibration if timings else 0.0,
+        "benchmarks": timings,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> (list, list):
+    """
+    compare results against a baseline
+    :param results: from run
+    :param baseline: earlier results
+    :param tolerance: allowed slow down, 0.25 fails anything 25% slower,
+                      widened by the spread of both timings and ignoring
+                      slow downs under NOISE_FLOOR
+    :return: report lines and the names of the regressed benchmarks
+    """
+    current = results["benchmarks"]
+    previous = baseline.get("benchmarks", {})
+    # how much slower this run's machine is than the baseline's
+    scale = 1.0
+    if results.get("calibration") and baseline.get("calibration"):
+        scale = results["calibration"] / baseline["calibration"]
+    lines = ["{:<40} {:>12} {:>12} {:>8}".format("benchmark", "baseline ms", "current ms", "change")]
+    regressions = []
+    for name, timing in current.items():
+        seconds = timing["seconds"]
+        if name not in previous:
+            lines.append("{:<40} {:>12} {:>12.4f} {:>8}".format(name, "-", seconds * 1000, "new"))
+            continue
+        before = previous[name]
+        # timings carrying their own calibration are scaled by it, it was
+        # measured under the same load as the benchmark
+        if timing.get("calibration") and before.get("calibration"):
+            base = before["seconds"] * timing["calibration"] / before["calibration"]
+        else:
+            base = before["seconds"] * scale
+        change = seconds / base - 1.0 if base > 0 else 0.0
+        allowed = tolerance + timing.get("spread", 0.0) + before.get("spread", 0.0)
+        mark = ""
+        if change > allowed and seconds - base > NOISE_FLOOR:
+            regressions.append(name)
+            mark = "  REGRESSION"
+        lines.append("{:<40} {:>12.4f} {:>12.4f} {:>+7.1f}%{}".format(
+            name, base * 1000, seconds * 1000, change * 100, mark))
+    if scale != 1.0:
+        lines.append("baseline scaled by {:.2f} for machine speed".format(scale))
+    return lines, regressions
+
+
+def merge_results(results: dict, retry: dict) -> dict:
+    """ keep the faster timing of each benchmark from two runs, relative to its calibration if it has one """
+    timings = OrderedDict(results["benchmarks"])
+    for name, timing in retry["benchmarks"].items():
+        if name not in timings or _relative(timing) < _relative(timings[name]):
+            timings[name] = timing
+    calibration = min(results.get("calibration") or float("inf"), retry.get("calibration") or float("inf"))
+    return dict(results, benchmarks=timings, calibration=calibration)
+
+
+def _relative(timing: dict) -> float:
+    if timing.get("calibration"):
+        return timing["seconds"] / timing["calibration"]
+    return timing["seconds"]
+
+
+def load_results(file: str) -> dict:
+    with open(file) as f:
+        return json.load(f)
+
+
+def save_results(file: str, results: dict) -> None:
+    with open(file, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
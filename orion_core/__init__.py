@@ -1,13 +1,8 @@
 # __init__.py
 
 import sys
-import os
-from orion_core.application import *
-from orion_core.frontend import *
-from orion_core.commands import *
-from orion_core.shared import *
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import logging
+from orion_core.lazy_import import attach
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +10,17 @@ if sys.version_info < (3, 7, 2):
     logger.error("Python version must be 3.7.2 or higher")
     sys.exit(1)
 
-
-
-
+# public names are imported on first use, so scripts that only need the
+# tile or grid maths do not load arcade, pyglet and OpenGL
+__getattr__, __dir__, __all__ = attach(__name__, submodules=("application", "backend", "commands", "engine",
+                                                             "frontend", "shared"), exports={
+    "application": ("init", "get_simulation", "get_preload", "run"),
+    "frontend": ("Window", "GridRenderer", "TextPanel", "frontend_run"),
+    "commands": ("set_camera",),
+    "shared": ("TileMap", "Spritesheet", "TextureAtlas", "TextureRegion", "pack_atlas", "SpatialHash",
+               "SpritesheetCache", "TextureRegistry", "TextureHandle", "get_texture_registry", "preload",
+               "LoadProgress", "CellularAutomaton", "BitPackedAutomaton", "FrameProfiler", "InputState",
+               "InputEvent", "InputLog", "InputRecorder", "replay", "Palette", "get_palette", "TextureVariants",
+               "get_texture_variants", "Tint", "Blend", "Remap", "Quantize", "Custom", "EntityStore", "key",
+               "color", "collision", "palette", "entities"),
+})
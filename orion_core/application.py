@@ -1,23 +1,68 @@
 
-import threading
+import copy
 import logging
 from . import backend
-from orion_core.frontend.base_frontend import frontend_run
 
 logger = logging.getLogger(__name__)
 
+_simulation = None
+_preload = None
+
+
+def init(tick_rate: int = backend.DEFAULT_TICK_RATE, manifest: dict = None,
+         workers: int = None, copy_state=copy.deepcopy) -> backend.Simulation:
+    """
+    start the backend and begin loading assets
+    :param tick_rate: simulation ticks per second
+    :param manifest: assets to preload in parallel, see orion_core.shared.preloader
+    :param workers: preload pool size, one per core if None
+    :param copy_state: copies the state for each snapshot, see backend.SnapshotBuffer
+    """
+    global _simulation, _preload
+
+    if _simulation is not None:
+        # a second init replaces the simulation, the old one must not keep ticking
+        _simulation.stop()
 
-def init():
     logger.info("initializing backend . . .")
-    base_backend = threading.Thread(target=backend.test, daemon=True)
-    base_backend.start()
+    _simulation = backend.Simulation(tick_rate, copy_state=copy_state)
+    _simulation.start()
+
+    if manifest:
+        from orion_core.shared.preloader import preload
+        logger.info("preloading assets . . .")
+        _preload = preload(manifest, workers)
 
     logger.info("initializing frontend . . .")
-    pass
+    return _simulation
 
 
-def run():
-    logger.info("starting frontend run level . . .")
-    frontend_run()
+def get_simulation() -> backend.Simulation:
+    return _simulation
 
 
+def get_preload():
+    """ progress of the assets preloaded by init, None without a manifest """
+    return _preload
+
+
+def run(headless: bool = False) -> None:
+    if headless:
+        logger.info("starting headless run level . . .")
+        if _simulation is None:
+            init()
+        _simulation.stop()
+        try:
+            _simulation.run()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    # the frontend pulls in arcade and OpenGL, headless runs never need it
+    from orion_core.frontend.base_frontend import frontend_run
+    logger.info("starting frontend run level . . .")
+    try:
+        frontend_run()
+    finally:
+        if _simulation is not None:
+            _simulation.stop()
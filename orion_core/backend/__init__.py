@@ -1,4 +1,4 @@
 # __init__.py
 
 from .base_backend import *
-
+from .sharded_grid import ShardedAutomaton, split_bands
@@ -1,4 +1,177 @@
 
-def test():
-    return True
+# fixed rate simulation engine
 
+import copy
+import time
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TICK_RATE = 60
+MAX_CATCH_UP_TICKS = 5
+
+
+class Snapshot(object):
+    """
+    read only view of the simulation state, published once per tick
+    """
+
+    def __init__(self, tick: int, time_elapsed: float, state: dict):
+        self.tick = tick
+        self.time_elapsed = time_elapsed
+        self.state = state
+
+    def get(self, name: str, default=None):
+        return self.state.get(name, default)
+
+
+class SnapshotBuffer(object):
+    """
+    double buffered hand off between the simulation and the frontend.
+    The simulation publishes its live state as the back buffer without
+    copying it, and the first read after each publish copies it into the
+    front buffer, so the copy runs on the reader's thread, at most once
+    per frame, and never when nothing reads, such as a headless server
+    """
+
+    def __init__(self, copy_state=copy.deepcopy, lock=None):
+        """
+        :param copy_state: copies the back buffer into the front buffer, its
+                           cost grows with the state and the simulation
+                           waits on lock while it runs
+        :param lock: lock the simulation holds while it changes the state,
+                     reentrant so publish can be called with it held
+        """
+        self.copy_state = copy_state
+        self._lock = threading.RLock() if lock is None else lock
+        self._front = Snapshot(0, 0.0, {})
+        self._back = None
+
+    def publish(self, tick: int, time_elapsed: float, state: dict) -> None:
+        """
+        swap the state in as the new back buffer
+        :param tick:
+        :param time_elapsed:
+        :param state: live state, not changed again without holding the lock
+        """
+        with self._lock:
+            self._back = (tick, time_elapsed, state)
+
+    def read(self) -> Snapshot:
+        """ the last published state, copied on the first read after each publish """
+        with self._lock:
+            if self._back is not None:
+                tick, time_elapsed, state = self._back
+                self._back = None
+                self._front = Snapshot(tick, time_elapsed, self.copy_state(state))
+            return self._front
+
+
+class Simulation(object):
+    """
+    ticks the registered systems at a fixed rate, either on its own
+    thread with start() or on the calling thread with run()
+    """
+
+    def __init__(self, tick_rate: int = DEFAULT_TICK_RATE,
+                 max_catch_up: int = MAX_CATCH_UP_TICKS, copy_state=copy.deepcopy) -> None:
+        """
+        :param tick_rate: ticks per second
+        :param max_catch_up: most ticks run at once after falling behind
+        :param copy_state: copies the state for each snapshot read, see SnapshotBuffer
+        """
+        self.tick_rate = tick_rate
+        self.tick_time = 1.0 / tick_rate
+        self.max_catch_up = max_catch_up
+        self.tick = 0
+        self.time_elapsed = 0.0
+        self.state = {}
+        self.systems = []
+        self._lock = threading.RLock()
+        self.buffer = SnapshotBuffer(copy_state, self._lock)
+        self.error = None
+        self._running = threading.Event()
+        self._thread = None
+
+    def add_system(self, system) -> None:
+        """
+        register a system, called as system(state, delta_time) every tick
+        :param system:
+        """
+        with self._lock:
+            self.systems.append(system)
+
+    def remove_system(self, system) -> None:
+        with self._lock:
+            if system in self.systems:
+                self.systems.remove(system)
+
+    def step(self, ticks: int = 1) -> None:
+        """
+        advance the simulation by a number of fixed ticks and publish
+        :param ticks:
+        """
+        with self._lock:
+            for _ in range(ticks):
+                for system in self.systems:
+                    system(self.state, self.tick_time)
+                self.tick += 1
+                self.time_elapsed += self.tick_time
+            self.buffer.publish(self.tick, self.time_elapsed, self.state)
+
+    def snapshot(self) -> Snapshot:
+        """ the last finished state of the simulation """
+        return self.buffer.read()
+
+    @property
+    def running(self) -> bool:
+        return self._running.is_set()
+
+    def start(self) -> None:
+        """ run the simulation loop on a daemon thread, a system that raises stops it and is kept in error """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.error = None
+        self._running.set()
+        self._thread = threading.Thread(target=self._loop, name="orion-simulation", daemon=True)
+        self._thread.start()
+
+    def run(self) -> None:
+        """ run the simulation loop on the calling thread until stopped, raises what a system raised """
+        self.error = None
+        self._running.set()
+        self._loop()
+        if self.error is not None:
+            raise self.error
+
+    def stop(self, timeout: float = None) -> None:
+        self._running.clear()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _loop(self) -> None:
+        logger.info("simulation running at {} ticks per second".format(self.tick_rate))
+        next_tick = time.perf_counter()
+        while self._running.is_set():
+            now = time.perf_counter()
+            if now < next_tick:
+                time.sleep(next_tick - now)
+                continue
+
+            # run every tick that is due, dropping time we cannot catch up on
+            ticks = int((now - next_tick) // self.tick_time) + 1
+            if ticks > self.max_catch_up:
+                logger.debug("simulation behind, dropping {} ticks".format(ticks - self.max_catch_up))
+                next_tick = now - self.tick_time * (self.max_catch_up - 1)
+                ticks = self.max_catch_up
+            next_tick += self.tick_time * ticks
+
+            try:
+                self.step(ticks)
+            except Exception as error:
+                logger.exception("simulation stopped by an error at tick {}".format(self.tick))
+                self.error = error
+                self._running.clear()
+        logger.info("simulation stopped at tick {}".format(self.tick))
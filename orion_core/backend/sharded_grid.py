@@ -0,0 +1,254 @@
+
+# multi process grid simulation with shared memory bands
+
+import logging
+import threading
+import weakref
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from orion_core.shared.cellular import EDGE_MODES, parse_rule, rule_table, pad_columns, count_neighbours
+
+logger = logging.getLogger(__name__)
+
+_EXIT = -1
+
+DEFAULT_TIMEOUT = 60.0
+
+
+def split_bands(height: int, count: int) -> list:
+    """ (first_row, rows) of count horizontal bands covering height rows """
+    count = max(1, min(count, height))
+    base, extra = divmod(height, count)
+    bands = []
+    first = 0
+    for i in range(count):
+        rows = base + (1 if i < extra else 0)
+        bands.append((first, rows))
+        first += rows
+    return bands
+
+
+def _attach(name: str, rows: int, width: int) -> (shared_memory.SharedMemory, np.ndarray):
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray((rows + 2, width), dtype=np.uint8, buffer=block.buf)
+
+
+def _band_worker(index: int, names: list, bands: list, width: int, table: np.ndarray, edges: str,
+                 command, start, sync, done) -> None:
+    """
+    steps one band, each band buffer holds its rows plus a halo row above
+    and below that the neighbouring bands write after every generation
+    """
+    count = len(bands)
+    blocks = []
+    views = []
+    for name, (first, rows) in zip(names, bands):
+        block, view = _attach(name, rows, width)
+        blocks.append(block)
+        views.append(view)
+
+    own = views[index]
+    rows = bands[index][1]
+    up = index - 1 if index > 0 or edges == "wrap" else None
+    down = index + 1 if index < count - 1 or edges == "wrap" else None
+    if up is not None:
+        up %= count
+    if down is not None:
+        down %= count
+
+    padded = np.zeros((rows + 2, width + 2), dtype=np.uint8)
+    counts = np.zeros((rows, width), dtype=np.uint8)
+
+    try:
+        while True:
+            start.wait()
+            generations = command.value
+            if generations == _EXIT:
+                break
+            for _ in range(generations):
+                padded[:, 1:-1] = own
+                pad_columns(padded, edges)
+                count_neighbours(padded, counts)
+                result = table[own[1:-1], counts]
+
+                # everyone has read their halos, publish the new rows
+                sync.wait()
+                own[1:-1] = result
+                if up is not None:
+                    views[up][-1] = result[0]
+                elif edges == "clamp":
+                    own[0] = result[0]
+                if down is not None:
+                    views[down][0] = result[-1]
+                elif edges == "clamp":
+                    own[-1] = result[-1]
+                sync.wait()
+            done.wait()
+    finally:
+        for block in blocks:
+            block.close()
+
+
+def _shutdown(processes: list, blocks: list) -> None:
+    """ stop any workers still running and free the shared memory, never touches the automaton """
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+    for block in blocks:
+        try:
+            block.close()
+        except BufferError:
+            # views of the block are still around, the mapping goes with them
+            pass
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+    del processes[:]
+    del blocks[:]
+
+
+class ShardedAutomaton(object):
+    """
+    CellularAutomaton split into horizontal bands stepped by a pool of
+    processes. Bands live in shared memory and swap one halo row with
+    their neighbours each generation, giving the same cells as the single
+    process engine
+    """
+
+    def __init__(self, width: int, height: int, rule: str = "B3/S23", edges: str = "dead",
+                 workers: int = None, start_method: str = None, timeout: float = DEFAULT_TIMEOUT) -> None:
+        """
+        :param width: cells across
+        :param height: cells down
+        :param rule: birth/survive rule
+        :param edges: "dead", "wrap" or "clamp", see CellularAutomaton
+        :param workers: processes to use, one per core if None
+        :param start_method: multiprocessing start method, the platform default if None
+        :param timeout: seconds to wait for the workers before giving up on them
+        """
+        if edges not in EDGE_MODES:
+            raise ValueError("edges must be one of {}".format(", ".join(EDGE_MODES)))
+        self.width = width
+        self.height = height
+        self.rule = rule
+        self.edges = edges
+        self.timeout = timeout
+        self.generation = 0
+        self.birth, self.survive = parse_rule(rule)
+        self.bands = split_bands(height, workers or multiprocessing.cpu_count())
+
+        self.blocks = []
+        self.views = []
+        self.processes = []
+        # frees the workers and memory even if close is never called
+        self._finalizer = weakref.finalize(self, _shutdown, self.processes, self.blocks)
+        for first, rows in self.bands:
+            block = shared_memory.SharedMemory(create=True, size=max((rows + 2) * width, 1))
+            view = np.ndarray((rows + 2, width), dtype=np.uint8, buffer=block.buf)
+            view[:] = 0
+            self.blocks.append(block)
+            self.views.append(view)
+
+        context = multiprocessing.get_context(start_method)
+        count = len(self.bands)
+        self._command = context.Value("i", 0)
+        self._start = context.Barrier(count + 1)
+        self._done = context.Barrier(count + 1)
+        self._sync = context.Barrier(count)
+        table = rule_table(self.birth, self.survive)
+        names = [block.name for block in self.blocks]
+        for index in range(count):
+            process = context.Process(target=_band_worker, name="orion-band-{}".format(index),
+                                      args=(index, names, self.bands, width, table, edges,
+                                            self._command, self._start, self._sync, self._done),
+                                      daemon=True)
+            process.start()
+            self.processes.append(process)
+        logger.info("sharded grid {} x {} on {} processes".format(width, height, count))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def cells(self) -> np.ndarray:
+        """ copy of the grid, indexed [y, x] """
+        return np.concatenate([view[1:-1] for view in self.views])
+
+    def load(self, cells: np.ndarray) -> None:
+        """
+        replace the grid, only call between steps
+        :param cells: [y, x] array of 0/1 cells
+        """
+        if cells.shape != (self.height, self.width):
+            raise ValueError("expected cells of shape {}".format((self.height, self.width)))
+        cells = (np.asarray(cells) != 0).astype(np.uint8)
+        count = len(self.bands)
+        for index, ((first, rows), view) in enumerate(zip(self.bands, self.views)):
+            view[1:-1] = cells[first:first + rows]
+            if index > 0:
+                view[0] = cells[first - 1]
+            elif self.edges == "wrap":
+                view[0] = cells[-1]
+            elif self.edges == "clamp":
+                view[0] = cells[0]
+            else:
+                view[0] = 0
+            if index < count - 1:
+                view[-1] = cells[first + rows]
+            elif self.edges == "wrap":
+                view[-1] = cells[0]
+            elif self.edges == "clamp":
+                view[-1] = cells[-1]
+            else:
+                view[-1] = 0
+
+    def step(self, generations: int = 1) -> None:
+        """
+        advance every band, returning once all of them are done
+        :param generations: number of generations to run
+        """
+        if not self._finalizer.alive:
+            raise RuntimeError("sharded grid is closed")
+        if generations <= 0:
+            return
+        self._command.value = generations
+        self._wait(self._start)
+        self._wait(self._done)
+        self.generation += generations
+
+    def _wait(self, barrier) -> None:
+        """ wait on a barrier with the workers, shutting down and raising if any of them fail """
+        dead = [process.name for process in self.processes if not process.is_alive()]
+        if not dead:
+            try:
+                barrier.wait(self.timeout)
+                return
+            except threading.BrokenBarrierError:
+                dead = [process.name for process in self.processes if not process.is_alive()]
+        self.views = []
+        self._finalizer()
+        if dead:
+            raise RuntimeError("band workers {} stopped".format(", ".join(dead)))
+        raise RuntimeError("band workers did not finish within {} seconds".format(self.timeout))
+
+    def close(self) -> None:
+        """ stop the workers and free the shared memory """
+        if not self._finalizer.alive:
+            return
+        if all(process.is_alive() for process in self.processes):
+            self._command.value = _EXIT
+            try:
+                self._start.wait(self.timeout)
+            except threading.BrokenBarrierError:
+                pass
+            for process in self.processes:
+                process.join(self.timeout)
+        self.views = []
+        # terminates whatever did not exit in time
+        self._finalizer()
@@ -1,6 +1,9 @@
 # __init__.py
 
-from orion_core.frontend.base_frontend import Window
-
-
+from orion_core.lazy_import import attach
 
+__getattr__, __dir__, __all__ = attach(__name__, exports={
+    "base_frontend": ("Window", "frontend_run"),
+    "grid_renderer": ("GridRenderer",),
+    "text_panel": ("TextPanel",),
+})
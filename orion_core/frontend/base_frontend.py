@@ -3,6 +3,9 @@
 import arcade
 import logging
 from orion_core.commands import set_camera
+from orion_core.frontend.text_panel import TextPanel
+from orion_core.shared.profiler import FrameProfiler
+from orion_core.shared.input_events import InputState, KEY_REPEAT
 
 logger = logging.getLogger(__name__)
 
@@ -15,24 +18,57 @@ class Window(arcade.Window):
     camera_y = 0.0
     camera_offset_x = 0
     camera_offset_y = 0
+    camera_view = (0, 0, 0, 0)
 
     fps = 0.0
     time_elapsed = 0.0
 
+    fixed_step = False
+    tick_rate = 60
+    update_step = 1.0 / 60
+    max_update_steps = 5
+    update_accumulator = 0.0
+    alpha = 1.0
+
     debug_console = True
     debug_color = arcade.color.LIGHT_GRAY
+    debug_refresh_rate = 4
+    debug_panel = None
+    debug_stats_time = None
+    debug_graph_height = 40
+    frame_budget = 1.0 / 60
 
-    keys_down = {}
     key_repeat_delay = 0.2
     key_repeat_time = 0.05
     key_repeat_ignore = (arcade.key.RETURN,)
 
     def __init__(self, width: int, height: int, title: str) -> None:
         super().__init__(width, height, title, antialiasing=False)
+        self._init_state(width, height)
+
+    @classmethod
+    def headless(cls, width: int = 800, height: int = 600):
+        """
+        window that is never opened, for replaying input, tests and
+        benchmarks without a display. It skips the arcade constructor and
+        the __init__ of subclasses, so only the engine state is set up and
+        nothing may be drawn
+        :param width:
+        :param height:
+        """
+        window = cls.__new__(cls)
+        window._width = width
+        window._height = height
+        window._init_state(width, height)
+        return window
+
+    def _init_state(self, width: int, height: int) -> None:
         self.camera_offset_x = width // 2
         self.camera_offset_y = height // 2
         self.camera_x = self.camera_offset_x
         self.camera_y = self.camera_offset_y
+        self.profiler = FrameProfiler()
+        self.input = InputState(self.key_repeat_delay, self.key_repeat_time, self.key_repeat_ignore)
 
     def on_draw(self) -> None:
         """
@@ -44,41 +80,80 @@ class Window(arcade.Window):
         left = self.camera_x - self.camera_offset_x
         right = self.camera_x + self.camera_offset_x
 
+        profiler = self.profiler
+        profiler.start("camera")
+        self.camera_view = (left, right, bottom, top)
         set_camera(left, right, bottom, top)
+        profiler.stop("camera")
 
         # clear the screen
         arcade.start_render()
         arcade.set_background_color(arcade.color.BLACK)
 
         # draw the current frame
-        self.on_draw_frame()
+        profiler.start("draw")
+        if self.fixed_step:
+            self.on_draw_frame(self.alpha)
+        else:
+            self.on_draw_frame()
+        profiler.stop("draw")
 
         # draw the debug text
         if self.debug_console:
+            profiler.start("debug")
             self.draw_debug(top, left)
+            profiler.stop("debug")
 
-    def on_draw_frame(self) -> None:
-        """ override this function to draw the screen """
+    def on_draw_frame(self, alpha: float = 1.0) -> None:
+        """
+        override this function to draw the screen
+        :param alpha: in fixed step mode, how far the frame is between the
+                      last and the next update, for interpolating positions
+        """
         pass
 
     def draw_debug(self, top: int, left: int) -> None:
         """ Default debug text handling """
-        debug_text = "Time elapsed: {0:7.2f} \n".format(self.time_elapsed)
-        debug_text += "FPS: {0:3.2f} \n".format(self.fps)
-        debug_text += "Window ({0} x {1}) \n".format(self.width, self.height)
-        debug_text += "Mouse Position ({0} x {1}) \n".format(self.mouse_x, self.mouse_y)
-        debug_text += "Camera Position ({0} x {1}) \n".format(self.camera_x, self.camera_y)
-
-        line_height = 14
-        left_padding = left + 20
-        line_y = top - 10 - line_height
-        for line in debug_text.split("\n"):
-            if not line:
-                continue
-            arcade.draw_text(text=line, start_x=left_padding, start_y=line_y,
-                             color=self.debug_color, font_size=10,
-                             anchor_x="left", anchor_y="bottom")
-            line_y -= line_height
+        if self.debug_panel is None:
+            self.debug_panel = TextPanel(color=self.debug_color)
+
+        # fast changing values only re-render at the debug refresh rate
+        panel = self.debug_panel
+        rate = self.debug_refresh_rate
+        panel.set("time", "Time elapsed: {0:7.2f}".format(self.time_elapsed), rate)
+        panel.set("fps", "FPS: {0:3.2f}".format(self.fps), rate)
+        panel.set("window", "Window ({0} x {1})".format(self.width, self.height))
+        panel.set("mouse", "Mouse Position ({0} x {1})".format(self.mouse_x, self.mouse_y))
+        panel.set("camera", "Camera Position ({0} x {1})".format(self.camera_x, self.camera_y))
+        # the percentiles are only worked out when their lines would refresh
+        now = panel.clock()
+        if self.debug_stats_time is None or not rate or now - self.debug_stats_time >= 1.0 / rate:
+            self.debug_stats_time = now
+            for name, (p50, p95, p99) in self.profiler.stats().items():
+                panel.set("profile_" + name, "{0:<7} p50 {1:6.2f}  p95 {2:6.2f}  p99 {3:6.2f} ms".format(
+                    name, p50, p95, p99), rate)
+        panel.draw(left + 20, top - 10)
+
+        self.draw_frame_graph(left + 20, top - 10 - len(panel.lines) * panel.line_height - 10)
+
+    def draw_frame_graph(self, left: int, top: int) -> None:
+        """
+        draw recent frame times as a line, with the frame budget marked
+        :param left:
+        :param top:
+        """
+        times = self.profiler.frame_times()
+        if times.size < 2:
+            return
+        height = self.debug_graph_height
+        bottom = top - height
+        # the budget line sits at half the graph height
+        scale = height * 0.5 / self.frame_budget
+        heights = bottom + (times * scale).clip(0, height)
+        points = list(zip(range(left, left + times.size), heights.tolist()))
+        arcade.draw_line(left, bottom + height * 0.5, left + self.profiler.capacity,
+                         bottom + height * 0.5, arcade.color.DARK_RED)
+        arcade.draw_line_strip(points, self.debug_color)
 
     def on_update(self, delta_time: float) -> None:
         """
@@ -89,14 +164,56 @@ class Window(arcade.Window):
         self.time_elapsed += delta_time
         self.fps = 1.0 / delta_time
 
-        for key, t in sorted(self.keys_down.items()):
-            t += delta_time
-            while t > self.key_repeat_delay:
-                t -= self.key_repeat_time
-                self.on_key_press(key=key, key_modifiers=0)
-            self.keys_down[key] = t
-
-        self.on_update_frame(delta_time)
+        profiler = self.profiler
+        profiler.next_frame()
+        profiler.start("input")
+        for event in self.input.poll(self.time_elapsed):
+            if event.type == KEY_REPEAT:
+                self.on_key_press(key=event.key, key_modifiers=event.modifiers)
+            if event.action is not None:
+                self.on_action(event)
+        profiler.stop("input")
+
+        profiler.start("update")
+        self.update_frames(delta_time)
+        profiler.stop("update")
+
+    def update_frames(self, delta_time: float) -> None:
+        """
+        run the game logic for a frame, once with the frame time or in
+        fixed steps when fixed step mode is on
+        :param delta_time:
+        """
+        if not self.fixed_step:
+            self.on_update_frame(delta_time)
+            return
+
+        # run the game logic in fixed steps, capping the steps per frame
+        # so a slow frame does not snowball into ever slower frames
+        self.update_accumulator += delta_time
+        steps = 0
+        while self.update_accumulator >= self.update_step:
+            if steps >= self.max_update_steps:
+                self.update_accumulator %= self.update_step
+                break
+            self.on_update_frame(self.update_step)
+            self.update_accumulator -= self.update_step
+            steps += 1
+
+        self.alpha = self.update_accumulator / self.update_step
+
+    def set_fixed_step(self, enabled: bool = True, tick_rate: int = None) -> None:
+        """
+        switch between variable and fixed step game logic updates
+        :param enabled:
+        :param tick_rate: updates per second, keeps the current rate if None
+        """
+        self.fixed_step = enabled
+        if tick_rate is not None:
+            self.tick_rate = tick_rate
+            self.update_step = 1.0 / tick_rate
+        self.update_accumulator = 0.0
+        self.alpha = 1.0
 
     def on_update_frame(self, delta_time: float) -> None:
         """
@@ -105,15 +222,22 @@ class Window(arcade.Window):
         """
         pass
 
+    def on_action(self, event) -> None:
+        """
+        override this function to handle input events of keys bound to
+        actions with self.input.bind
+        :param event: InputEvent with the action name in event.action
+        """
+        pass
+
     def on_key_press(self, key, key_modifiers):
         """
-        called when a key is presses
+        called when a key is presses, and again for each key repeat
         :param key:
         :param key_modifiers:
         """
 
-        if key not in self.key_repeat_ignore:
-            self.keys_down.setdefault(key, 0.0)
+        self.input.press(key, key_modifiers, self.time_elapsed)
 
         if key == arcade.key.GRAVE:
             self.debug_console = not self.debug_console
@@ -125,7 +249,7 @@ class Window(arcade.Window):
         :param key_modifiers:
         """
 
-        self.keys_down.pop(key, None)
+        self.input.release(key, key_modifiers, self.time_elapsed)
 
     def on_mouse_motion(self, x, y, delta_x, delta_y):
         """
@@ -137,6 +261,7 @@ class Window(arcade.Window):
         """
         self.mouse_x = x
         self.mouse_y = y
+        self.input.mouse_motion(x, y, self.time_elapsed)
 
     def on_mouse_press(self, x, y, button, key_modifiers):
         """
@@ -146,7 +271,7 @@ class Window(arcade.Window):
         :param button:
         :param key_modifiers:
         """
-        pass
+        self.input.mouse_press(x, y, button, key_modifiers, self.time_elapsed)
 
     def on_mouse_release(self, x, y, button, key_modifiers):
         """
@@ -156,7 +281,7 @@ class Window(arcade.Window):
         :param button:
         :param key_modifiers:
         """
-        pass
+        self.input.mouse_release(x, y, button, key_modifiers, self.time_elapsed)
 
 
 def frontend_run():
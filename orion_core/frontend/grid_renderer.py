@@ -0,0 +1,92 @@
+
+import arcade
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# hidden sprites kept for reuse before the list is compacted
+MIN_SPARE_SPRITES = 256
+
+
+class GridRenderer(object):
+    """
+    draws the live cells of a grid as one persistent sprite list, keeping
+    the last state drawn and only touching the sprites of cells that
+    changed. A dying cell's sprite is hidden and reused for the next cell
+    born, and the list is compacted once the hidden sprites outnumber the
+    live ones, so drawing costs grow with the live cells rather than the
+    size of the board
+    """
+
+    def __init__(self, width: int, height: int, cell_size: int, texture: arcade.Texture,
+                 left: int = 0, top: int = None) -> None:
+        """
+        :param width: cells across
+        :param height: cells down
+        :param cell_size: size of a cell in pixels
+        :param texture: texture drawn for live cells
+        :param left: world x of the left edge of the grid
+        :param top: world y of the top edge of the grid, row 0 is drawn here
+        """
+        if top is None:
+            top = height * cell_size
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.texture = texture
+        self.left = left
+        self.top = top
+        self.state = np.zeros((height, width), dtype=np.uint8)
+        # sprites of the live cells by flat cell index, and hidden ones to reuse
+        self.cell_sprites = {}
+        self.spare = []
+        self.sprites = arcade.SpriteList(use_spatial_hash=False)
+
+    def _show(self, index: int) -> None:
+        if self.spare:
+            sprite = self.spare.pop()
+        else:
+            sprite = arcade.Sprite()
+            sprite.append_texture(self.texture)
+            sprite.set_texture(0)
+            self.sprites.append(sprite)
+        y, x = divmod(index, self.width)
+        sprite.center_x = self.left + self.cell_size * x + self.cell_size // 2
+        sprite.center_y = self.top - self.cell_size * y - self.cell_size // 2
+        sprite.alpha = 255
+        self.cell_sprites[index] = sprite
+
+    def _hide(self, index: int) -> None:
+        sprite = self.cell_sprites.pop(index)
+        sprite.alpha = 0
+        self.spare.append(sprite)
+
+    def update(self, state: np.ndarray) -> int:
+        """
+        show the cells that are set in state, updating only the sprites
+        whose cells changed since the last call
+        :param state: [y, x] array, non zero for live cells
+        :return: number of cells that changed
+        """
+        live = state != 0
+        changed = np.flatnonzero(live != self.state)
+        if changed.size == 0:
+            return 0
+        alive = live.ravel()[changed]
+        # hide first so the births can reuse the sprites of the deaths
+        for index in changed[~alive].tolist():
+            self._hide(index)
+        for index in changed[alive].tolist():
+            self._show(index)
+        np.copyto(self.state, live)
+
+        if len(self.spare) > max(MIN_SPARE_SPRITES, len(self.cell_sprites)):
+            # removing sprites one at a time scans the list for each
+            self.sprites.clear()
+            self.sprites.extend(self.cell_sprites.values())
+            self.spare = []
+        return int(changed.size)
+
+    def draw(self) -> None:
+        self.sprites.draw()
@@ -0,0 +1,97 @@
+
+import time
+import arcade
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TextLine(object):
+    """
+    one retained line of a text panel, the label is only laid out again
+    when its text changes
+    """
+
+    def __init__(self, text: str = "", refresh_rate: float = None) -> None:
+        self.text = text
+        self.pending = text
+        self.refresh_rate = refresh_rate
+        self.last_refresh = None
+        self.label = None
+        self.dirty = True
+
+    def due(self, now: float) -> bool:
+        if not self.refresh_rate or self.last_refresh is None:
+            return True
+        return now - self.last_refresh >= 1.0 / self.refresh_rate
+
+    def commit(self, now: float) -> bool:
+        """ show the pending text if it differs and the line is due """
+        if self.pending == self.text or not self.due(now):
+            return False
+        self.text = self.pending
+        self.last_refresh = now
+        self.dirty = True
+        return True
+
+
+class TextPanel(object):
+    """
+    a block of text lines drawn top down, lines keep their rendered
+    labels between frames and can limit how often they refresh
+    """
+
+    def __init__(self, line_height: int = 14, font_size: int = 10, color=arcade.color.LIGHT_GRAY,
+                 anchor_x: str = "left", clock=time.perf_counter) -> None:
+        self.line_height = line_height
+        self.font_size = font_size
+        self.color = color
+        self.anchor_x = anchor_x
+        self.clock = clock
+        self.lines = {}
+
+    def set(self, name: str, text: str, refresh_rate: float = None) -> bool:
+        """
+        set the text of a line, adding it below the others if it is new
+        :param name: key of the line
+        :param text:
+        :param refresh_rate: most times a second the line re-renders, unlimited if None
+        :return: true if the line will be rendered again
+        """
+        line = self.lines.get(name)
+        if line is None:
+            line = TextLine(text, refresh_rate)
+            line.last_refresh = self.clock()
+            self.lines[name] = line
+            return True
+        if refresh_rate is not None:
+            line.refresh_rate = refresh_rate
+        line.pending = text
+        return line.commit(self.clock())
+
+    def remove(self, name: str) -> None:
+        self.lines.pop(name, None)
+
+    def clear(self) -> None:
+        self.lines = {}
+
+    def draw(self, x: float, top: float) -> None:
+        """
+        draw the lines with the first line's top at top
+        :param x: left edge, or right edge for right anchored panels
+        :param top:
+        """
+        now = self.clock()
+        line_y = top - self.line_height
+        for line in self.lines.values():
+            line.commit(now)
+            if line.label is None:
+                line.label = arcade.Text(line.text, x, line_y, self.color, self.font_size,
+                                         anchor_x=self.anchor_x, anchor_y="bottom")
+            elif line.dirty:
+                line.label.text = line.text
+            line.dirty = False
+            if line.label.x != x or line.label.y != line_y:
+                line.label.position = (x, line_y)
+            line.label.draw()
+            line_y -= self.line_height
@@ -0,0 +1,37 @@
+# lazy attribute access for packages
+
+import importlib
+
+
+def attach(package: str, submodules=(), exports: dict = None):
+    """
+    build the module level __getattr__, __dir__ and __all__ of a package
+    whose public names are only imported when first used, so importing
+    the package does not import the modules behind it
+    :param package: __name__ of the package
+    :param submodules: names of modules in the package to expose
+    :param exports: public names by the module, relative to the package, they live in
+    :return: __getattr__, __dir__, __all__
+    """
+    origins = {}
+    for module, names in (exports or {}).items():
+        for name in names:
+            origins[name] = module
+    submodules = set(submodules)
+    names = sorted(submodules | set(origins))
+
+    def __getattr__(name: str):
+        if name in submodules:
+            value = importlib.import_module(package + "." + name)
+        elif name in origins:
+            value = getattr(importlib.import_module(package + "." + origins[name]), name)
+        else:
+            raise AttributeError("module {!r} has no attribute {!r}".format(package, name))
+        # cache on the package so __getattr__ only runs once per name
+        setattr(importlib.import_module(package), name, value)
+        return value
+
+    def __dir__() -> list:
+        return names
+
+    return __getattr__, __dir__, list(names)
@@ -1,6 +1,21 @@
+# __init__.py
 
-from orion_core.shared.tile_map import TileMap
-from orion_core.shared.spritesheet import Spritesheet
-from orion_core.shared import key
-from orion_core.shared import color
+from orion_core.lazy_import import attach
 
+__getattr__, __dir__, __all__ = attach(__name__, submodules=("key", "color", "collision", "palette", "entities"),
+                                       exports={
+    "tile_map": ("TileMap",),
+    "spritesheet": ("Spritesheet", "TextureAtlas", "TextureRegion", "pack_atlas"),
+    "spatial_hash": ("SpatialHash",),
+    "asset_cache": ("SpritesheetCache",),
+    "texture_registry": ("TextureRegistry", "TextureHandle", "get_texture_registry"),
+    "preloader": ("preload", "LoadProgress"),
+    "cellular": ("CellularAutomaton", "BitPackedAutomaton"),
+    "profiler": ("FrameProfiler",),
+    "input_events": ("InputState", "InputEvent"),
+    "input_log": ("InputLog", "InputRecorder", "replay"),
+    "palette": ("Palette", "get_palette"),
+    "entities": ("EntityStore",),
+    "texture_variants": ("TextureVariants", "get_texture_variants", "Tint", "Blend", "Remap", "Quantize",
+                         "Custom"),
+})
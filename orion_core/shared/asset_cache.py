@@ -0,0 +1,94 @@
+# persistent cache of decoded spritesheet pixels
+
+import os
+import hashlib
+import logging
+import tempfile
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENV = "ORION_CACHE_DIR"
+CACHE_VERSION = 1
+
+
+def default_cache_path() -> str:
+    path = os.environ.get(CACHE_ENV)
+    if path:
+        return path
+    base = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "orion_core", "spritesheets")
+
+
+class SpritesheetCache(object):
+    """
+    keeps decoded RGBA spritesheet pixels on disk as .npy files, loaded
+    memory mapped so a warm start skips image decoding entirely
+    """
+
+    def __init__(self, path: str = None, content_hash: bool = False) -> None:
+        """
+        :param path: cache directory, defaults to $ORION_CACHE_DIR or the user cache
+        :param content_hash: key entries on the file contents instead of its mtime and size
+        """
+        self.path = path or default_cache_path()
+        self.content_hash = content_hash
+
+    def key(self, file: str, tile_size: int) -> str:
+        digest = hashlib.sha1()
+        digest.update("{}|{}|{}|".format(CACHE_VERSION, os.path.abspath(file), tile_size).encode("utf-8"))
+        if self.content_hash:
+            with open(file, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+        else:
+            stat = os.stat(file)
+            digest.update("{}|{}".format(stat.st_mtime_ns, stat.st_size).encode("utf-8"))
+        return digest.hexdigest()
+
+    def entry_path(self, file: str, tile_size: int) -> str:
+        return os.path.join(self.path, self.key(file, tile_size) + ".npy")
+
+    def load(self, file: str, tile_size: int) -> np.ndarray:
+        """
+        cached pixels of a spritesheet, or None on a miss
+        :param file:
+        :param tile_size:
+        """
+        try:
+            entry = self.entry_path(file, tile_size)
+        except OSError:
+            return None
+        if not os.path.exists(entry):
+            return None
+        try:
+            pixels = np.load(entry, mmap_mode="r")
+        except (OSError, ValueError):
+            logger.warning("discarding unreadable cache entry: {}".format(entry))
+            return None
+        logger.debug("spritesheet cache hit: {}".format(file))
+        return pixels
+
+    def store(self, file: str, tile_size: int, pixels: np.ndarray) -> None:
+        """
+        write the pixels of a spritesheet to the cache
+        :param file:
+        :param tile_size:
+        :param pixels: RGBA array of shape (height, width, 4)
+        """
+        try:
+            entry = self.entry_path(file, tile_size)
+            os.makedirs(self.path, exist_ok=True)
+            fd, temp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.ascontiguousarray(pixels, dtype=np.uint8))
+            os.replace(temp, entry)
+        except OSError as e:
+            logger.warning("unable to write spritesheet cache for {}: {}".format(file, e))
+
+    def clear(self) -> None:
+        if not os.path.isdir(self.path):
+            return
+        for name in os.listdir(self.path):
+            if name.endswith(".npy") or name.endswith(".tmp"):
+                os.remove(os.path.join(self.path, name))
@@ -0,0 +1,408 @@
+# cellular automaton engine
+
+import re
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EDGE_MODES = ("dead", "wrap", "clamp")
+
+
+def parse_rule(rule: str) -> (tuple, tuple):
+    """
+    birth and survive counts of a rule string such as "B3/S23"
+    :param rule:
+    """
+    match = re.match(r"^\s*B([0-8]*)\s*/\s*S([0-8]*)\s*$", rule, re.IGNORECASE)
+    if match is None:
+        raise ValueError("invalid rule: {}".format(rule))
+    return tuple(int(c) for c in match.group(1)), tuple(int(c) for c in match.group(2))
+
+
+def pad_columns(padded: np.ndarray, edges: str) -> None:
+    """
+    fill the first and last column of a padded grid with the cells just
+    past the left and right edges
+    :param padded: grid with a one cell border, rows already filled
+    :param edges: "dead", "wrap" or "clamp"
+    """
+    if edges == "dead":
+        padded[:, 0] = 0
+        padded[:, -1] = 0
+    elif edges == "wrap":
+        padded[:, 0] = padded[:, -2]
+        padded[:, -1] = padded[:, 1]
+    else:
+        padded[:, 0] = padded[:, 1]
+        padded[:, -1] = padded[:, -2]
+
+
+def count_neighbours(padded: np.ndarray, counts: np.ndarray = None) -> np.ndarray:
+    """
+    live neighbour counts of the cells inside a padded grid
+    :param padded: uint8 grid of shape (height + 2, width + 2)
+    :param counts: optional uint8 output of shape (height, width)
+    """
+    height = padded.shape[0] - 2
+    width = padded.shape[1] - 2
+    if counts is None:
+        counts = np.empty((height, width), dtype=np.uint8)
+    np.copyto(counts, padded[0:height, 0:width])
+    counts += padded[0:height, 1:width + 1]
+    counts += padded[0:height, 2:width + 2]
+    counts += padded[1:height + 1, 0:width]
+    counts += padded[1:height + 1, 2:width + 2]
+    counts += padded[2:height + 2, 0:width]
+    counts += padded[2:height + 2, 1:width + 1]
+    counts += padded[2:height + 2, 2:width + 2]
+    return counts
+
+
+def rule_table(birth: tuple, survive: tuple) -> np.ndarray:
+    """ next cell state indexed by [alive, neighbours] """
+    table = np.zeros((2, 9), dtype=np.uint8)
+    table[0, list(birth)] = 1
+    table[1, list(survive)] = 1
+    return table
+
+
+class CellularAutomaton(object):
+    """
+    two state automaton on a NumPy grid, indexed [y, x], using the Moore
+    neighbourhood and birth/survive rules
+    """
+
+    def __init__(self, width: int, height: int, rule: str = "B3/S23", edges: str = "dead") -> None:
+        """
+        :param width: cells across
+        :param height: cells down
+        :param rule: birth/survive rule, "B3/S23" is Conway's game of life
+        :param edges: "dead" treats cells past the edge as dead, "wrap" joins
+                      opposite edges and "clamp" repeats the edge cells
+        """
+        if edges not in EDGE_MODES:
+            raise ValueError("edges must be one of {}".format(", ".join(EDGE_MODES)))
+        self.width = width
+        self.height = height
+        self.edges = edges
+        self.generation = 0
+        self.cells = np.zeros((height, width), dtype=np.uint8)
+        self.set_rule(rule)
+
+        # scratch buffers reused every generation
+        self._padded = np.zeros((height + 2, width + 2), dtype=np.uint8)
+        self._counts = np.zeros((height, width), dtype=np.uint8)
+
+    def set_rule(self, rule: str) -> None:
+        self.rule = rule
+        self.birth, self.survive = parse_rule(rule)
+        self._table = rule_table(self.birth, self.survive)
+
+    def _pad(self) -> np.ndarray:
+        padded = self._padded
+        padded[1:-1, 1:-1] = self.cells
+        if self.edges == "wrap":
+            padded[0, 1:-1] = self.cells[-1]
+            padded[-1, 1:-1] = self.cells[0]
+        elif self.edges == "clamp":
+            padded[0, 1:-1] = self.cells[0]
+            padded[-1, 1:-1] = self.cells[-1]
+        pad_columns(padded, self.edges)
+        return padded
+
+    def neighbours(self) -> np.ndarray:
+        """ live neighbour count of every cell """
+        return count_neighbours(self._pad(), self._counts)
+
+    def step(self, generations: int = 1) -> np.ndarray:
+        """
+        advance the automaton
+        :param generations: number of generations to run
+        :return: the cell grid
+        """
+        for _ in range(generations):
+            counts = self.neighbours()
+            self.cells = self._table[self.cells, counts]
+        self.generation += generations
+        return self.cells
+
+    def clear(self) -> None:
+        self.cells[:] = 0
+
+    def randomize(self, density: float = 0.5, seed: int = None) -> None:
+        rng = np.random.RandomState(seed)
+        self.cells = (rng.random_sample((self.height, self.width)) < density).astype(np.uint8)
+
+    def set_pattern(self, x: int, y: int, pattern: str, alive: str = "#") -> None:
+        """
+        set cells from a pattern, rows separated by newlines
+        :param x: left column of the pattern
+        :param y: top row of the pattern
+        :param pattern:
+        :param alive: character marking live cells
+        """
+        for row, line in enumerate(pattern.split("\n")):
+            for column, c in enumerate(line):
+                if c == alive:
+                    self.cells[y + row, x + column] = 1
+
+    @property
+    def population(self) -> int:
+        return int(np.count_nonzero(self.cells))
+
+
+WORD_BITS = 64
+TILE_ROWS = 64
+_ONE = np.uint64(1)
+_HIGH = np.uint64(WORD_BITS - 1)
+
+
+def pack_cells(cells: np.ndarray) -> np.ndarray:
+    """
+    pack a [y, x] grid of 0/1 cells into uint64 words, one bit per cell,
+    cell x of a row is bit x % 64 of word x // 64
+    :param cells:
+    """
+    height, width = cells.shape
+    words = -(-width // WORD_BITS)
+    padded = np.zeros((height, words * WORD_BITS), dtype=np.uint8)
+    padded[:, :width] = cells != 0
+    packed = np.packbits(padded, axis=1, bitorder="little")
+    return packed.view(np.dtype("<u8")).astype(np.uint64)
+
+
+def unpack_cells(words: np.ndarray, width: int) -> np.ndarray:
+    """ reverse of pack_cells """
+    raw = np.ascontiguousarray(words.astype(np.dtype("<u8"))).view(np.uint8)
+    return np.unpackbits(raw, axis=1, bitorder="little")[:, :width]
+
+
+def _popcount(words: np.ndarray) -> int:
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum())
+    return int(np.unpackbits(words.view(np.uint8)).sum())
+
+
+class BitPackedAutomaton(object):
+    """
+    the same automaton as CellularAutomaton with every cell stored as one
+    bit of a uint64 word, neighbours are summed 64 cells at a time with
+    bitwise adders. In sparse mode only 64 x 64 tiles with live cells in
+    or next to them are stepped
+    """
+
+    def __init__(self, width: int, height: int, rule: str = "B3/S23", edges: str = "dead",
+                 sparse: bool = False) -> None:
+        """
+        :param width: cells across
+        :param height: cells down
+        :param rule: birth/survive rule
+        :param edges: "dead", "wrap" or "clamp", see CellularAutomaton
+        :param sparse: skip tiles that are dead along with their neighbours
+        """
+        if edges not in EDGE_MODES:
+            raise ValueError("edges must be one of {}".format(", ".join(EDGE_MODES)))
+        self.width = width
+        self.height = height
+        self.edges = edges
+        self.sparse = sparse
+        self.generation = 0
+        self.word_width = -(-width // WORD_BITS)
+        self.words = np.zeros((height, self.word_width), dtype=np.uint64)
+        self.set_rule(rule)
+
+        # bits of the last word that hold cells
+        tail = width % WORD_BITS
+        self._tail_mask = np.uint64((1 << tail) - 1) if tail else ~np.uint64(0)
+        self._padded = np.zeros((height + 2, self.word_width + 2), dtype=np.uint64)
+
+    def set_rule(self, rule: str) -> None:
+        self.rule = rule
+        self.birth, self.survive = parse_rule(rule)
+
+    @property
+    def cells(self) -> np.ndarray:
+        """ unpacked copy of the grid, indexed [y, x] """
+        return unpack_cells(self.words, self.width)
+
+    def load(self, cells: np.ndarray) -> None:
+        """ replace the grid with a [y, x] array of 0/1 cells """
+        if cells.shape != (self.height, self.width):
+            raise ValueError("expected cells of shape {}".format((self.height, self.width)))
+        self.words = pack_cells(cells)
+
+    def clear(self) -> None:
+        self.words[:] = 0
+
+    def randomize(self, density: float = 0.5, seed: int = None) -> None:
+        rng = np.random.RandomState(seed)
+        for top in range(0, self.height, TILE_ROWS):
+            rows = min(TILE_ROWS, self.height - top)
+            cells = rng.random_sample((rows, self.width)) < density
+            self.words[top:top + rows] = pack_cells(cells)
+
+    def set_pattern(self, x: int, y: int, pattern: str, alive: str = "#") -> None:
+        """ set cells from a pattern, see CellularAutomaton.set_pattern """
+        for row, line in enumerate(pattern.split("\n")):
+            for column, c in enumerate(line):
+                if c == alive:
+                    self.set_cell(x + column, y + row, 1)
+
+    def set_cell(self, x: int, y: int, alive: int) -> None:
+        bit = _ONE << np.uint64(x % WORD_BITS)
+        if alive:
+            self.words[y, x // WORD_BITS] |= bit
+        else:
+            self.words[y, x // WORD_BITS] &= ~bit
+
+    def get_cell(self, x: int, y: int) -> int:
+        return int((self.words[y, x // WORD_BITS] >> np.uint64(x % WORD_BITS)) & _ONE)
+
+    @property
+    def population(self) -> int:
+        return _popcount(self.words)
+
+    def _pad(self) -> np.ndarray:
+        """
+        words with a one word and one row border holding the cells just
+        past each edge, so every neighbour is a shift of the padded rows
+        """
+        padded = self._padded
+        words = self.words
+        padded[:] = 0
+        padded[1:-1, 1:-1] = words
+        if self.edges == "dead":
+            return padded
+
+        if self.edges == "wrap":
+            padded[0, 1:-1] = words[-1]
+            padded[-1, 1:-1] = words[0]
+        else:
+            padded[0, 1:-1] = words[0]
+            padded[-1, 1:-1] = words[-1]
+
+        last = self.word_width
+        last_bit = np.uint64((self.width - 1) % WORD_BITS)
+        first_cells = padded[:, 1] & _ONE
+        last_cells = (padded[:, last] >> last_bit) & _ONE
+        if self.edges == "wrap":
+            west, east = last_cells, first_cells
+        else:
+            west, east = first_cells, last_cells
+
+        padded[:, 0] = west << _HIGH
+        if self.width % WORD_BITS:
+            padded[:, last] |= east << (last_bit + _ONE)
+        else:
+            padded[:, last + 1] = east
+        return padded
+
+    def _next(self, padded: np.ndarray) -> np.ndarray:
+        """
+        next generation of the cells inside a padded block
+        :param padded: words of shape (..., rows + 2, words + 2)
+        :return: words of shape (..., rows, words)
+        """
+        def center(rows):
+            return rows[..., 1:-1]
+
+        def west(rows):
+            return (rows[..., 1:-1] << _ONE) | (rows[..., :-2] >> _HIGH)
+
+        def east(rows):
+            return (rows[..., 1:-1] >> _ONE) | (rows[..., 2:] << _HIGH)
+
+        north = padded[..., :-2, :]
+        middle = padded[..., 1:-1, :]
+        south = padded[..., 2:, :]
+
+        # bit sliced counter, four bits of neighbour count per cell
+        s0 = center(north).copy()
+        s1 = np.zeros_like(s0)
+        s2 = np.zeros_like(s0)
+        s3 = np.zeros_like(s0)
+        for neighbour in (center(south), west(middle), east(middle),
+                          west(north), east(north), west(south), east(south)):
+            carry = s0 & neighbour
+            s0 ^= neighbour
+            carry1 = s1 & carry
+            s1 ^= carry
+            carry2 = s2 & carry1
+            s2 ^= carry1
+            s3 |= carry2
+
+        def count_is(n):
+            out = s0 if n & 1 else ~s0
+            out = out & (s1 if n & 2 else ~s1)
+            out &= s2 if n & 4 else ~s2
+            out &= s3 if n & 8 else ~s3
+            return out
+
+        alive = center(middle)
+        born = np.zeros_like(s0)
+        for n in self.birth:
+            born |= count_is(n)
+        kept = np.zeros_like(s0)
+        for n in self.survive:
+            kept |= count_is(n)
+        return (~alive & born) | (alive & kept)
+
+    def _active_tiles(self) -> np.ndarray:
+        """ (tile_y, word) indices of the tiles that may change """
+        starts = np.arange(0, self.height, TILE_ROWS)
+        live = np.logical_or.reduceat(self.words != 0, starts, axis=0)
+        wrap = self.edges == "wrap"
+        active = live.copy()
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                if dx == 0 and dy == 0:
+                    continue
+                shifted = np.roll(live, (dy, dx), axis=(0, 1))
+                if not wrap:
+                    if dy == 1:
+                        shifted[0, :] = False
+                    elif dy == -1:
+                        shifted[-1, :] = False
+                    if dx == 1:
+                        shifted[:, 0] = False
+                    elif dx == -1:
+                        shifted[:, -1] = False
+                active |= shifted
+        return np.argwhere(active)
+
+    def _step_sparse(self, padded: np.ndarray) -> np.ndarray:
+        tiles = self._active_tiles()
+        result = np.zeros_like(self.words)
+        if tiles.size == 0:
+            return result
+
+        # gather each tile with a one row and one word border
+        rows = tiles[:, 0:1] * TILE_ROWS + np.arange(TILE_ROWS + 2)
+        rows = np.minimum(rows, self.height + 1)
+        columns = tiles[:, 1:2] + np.arange(3)
+        block = padded[rows[:, :, None], columns[:, None, :]]
+        block_next = self._next(block)[..., 0]
+
+        # scatter the center word back, dropping rows past the bottom edge
+        out_rows = tiles[:, 0:1] * TILE_ROWS + np.arange(TILE_ROWS)
+        valid = out_rows < self.height
+        out_columns = np.broadcast_to(tiles[:, 1:2], out_rows.shape)
+        result[out_rows[valid], out_columns[valid]] = block_next[valid]
+        return result
+
+    def step(self, generations: int = 1) -> None:
+        """
+        advance the automaton
+        :param generations: number of generations to run
+        """
+        # with birth on zero neighbours dead tiles come alive, nothing can be skipped
+        sparse = self.sparse and 0 not in self.birth
+        for _ in range(generations):
+            padded = self._pad()
+            if sparse:
+                self.words = self._step_sparse(padded)
+            else:
+                self.words = self._next(padded)
+            self.words[:, -1] &= self._tail_mask
+        self.generation += generations
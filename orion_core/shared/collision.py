@@ -0,0 +1,125 @@
+# swept box collision against a tile map
+
+import logging
+from collections import namedtuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EPSILON = 1e-6
+
+# result of moving boxes through a tile map, fields are floats for
+# move_box and arrays for move_boxes
+#   x, y: resolved box centers
+#   normal_x, normal_y: contact normal per axis, 0 when nothing was hit
+#   time_x, time_y: fraction of the move made before impact, 1.0 if no hit
+Sweep = namedtuple("Sweep", ["x", "y", "normal_x", "normal_y", "time_x", "time_y"])
+
+
+def _solid_cells(tile_map, lookup: np.ndarray, tile_x: np.ndarray, tile_y: np.ndarray) -> np.ndarray:
+    """ solidity of tile cells, cells off the map are solid """
+    inside = (tile_x >= 0) & (tile_x < tile_map.tile_width) & (tile_y >= 0) & (tile_y < tile_map.tile_height)
+    solid = np.ones(tile_x.shape, dtype=bool)
+    solid[inside] = lookup[tile_map.grid[tile_y[inside], tile_x[inside]]]
+    return solid
+
+
+def _sweep_axis(tile_map, lookup, lo, hi, span_lo, span_hi, delta, along_x):
+    """
+    move the boxes along one axis in tile units, visiting only the cells
+    the leading edge enters
+    :param lo: box start along the moving axis
+    :param hi: box end along the moving axis
+    :param span_lo: box start along the other axis
+    :param span_hi: box end along the other axis
+    :param delta: movement along the axis
+    :param along_x: true to move along columns, false for rows
+    :return: allowed movement and a mask of the boxes that hit
+    """
+    forward = delta > 0
+    step = np.where(forward, 1, -1)
+    start = np.where(forward, np.floor(hi - EPSILON) + 1, np.floor(lo + EPSILON) - 1).astype(np.intp)
+    end = np.where(forward, np.floor(hi + delta - EPSILON), np.floor(lo + delta + EPSILON)).astype(np.intp)
+    count = np.where(delta == 0, 0, (end - start) * step + 1).clip(0)
+
+    first_span = np.floor(span_lo + EPSILON).astype(np.intp)
+    spans = np.floor(span_hi - EPSILON).astype(np.intp) - first_span + 1
+
+    allowed = delta.copy()
+    hit = np.zeros(delta.shape, dtype=bool)
+    max_span = int(spans.max()) if spans.size else 0
+    for k in range(int(count.max()) if count.size else 0):
+        active = (k < count) & ~hit
+        if not active.any():
+            break
+        cell = start + step * k
+        blocked = np.zeros(delta.shape, dtype=bool)
+        for j in range(max_span):
+            rows = np.flatnonzero(active & (j < spans))
+            if along_x:
+                blocked[rows] |= _solid_cells(tile_map, lookup, cell[rows], first_span[rows] + j)
+            else:
+                blocked[rows] |= _solid_cells(tile_map, lookup, first_span[rows] + j, cell[rows])
+        newly = active & blocked
+        allowed[newly] = np.where(forward, cell - hi, cell + 1 - lo)[newly]
+        hit |= newly
+    return allowed, hit
+
+
+def move_boxes(tile_map, x, y, half_width, half_height, delta_x, delta_y) -> Sweep:
+    """
+    move axis aligned boxes through the solid tiles of a tile map, first
+    along x then along y, stopping each axis at the first solid tile
+    :param tile_map: TileMap with its solid tiles set
+    :param x: array of box centers in world coordinates
+    :param y: array of box centers in world coordinates
+    :param half_width: half the box width, scalar or array
+    :param half_height: half the box height, scalar or array
+    :param delta_x: array of world movement along x
+    :param delta_y: array of world movement along y
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    shape = np.broadcast(x, y, half_width, half_height, delta_x, delta_y).shape
+    x = np.broadcast_to(x, shape)
+    y = np.broadcast_to(y, shape)
+    half_width = np.broadcast_to(np.asarray(half_width, dtype=np.float64), shape)
+    half_height = np.broadcast_to(np.asarray(half_height, dtype=np.float64), shape)
+    delta_x = np.broadcast_to(np.asarray(delta_x, dtype=np.float64), shape)
+    delta_y = np.broadcast_to(np.asarray(delta_y, dtype=np.float64), shape)
+
+    lookup = tile_map.solid_lookup()
+    size = tile_map.tile_size
+
+    # work in tile units with rows counting down from the top of the map
+    left = (x - half_width) / size
+    right = (x + half_width) / size
+    top = (tile_map.height - y - half_height) / size
+    bottom = (tile_map.height - y + half_height) / size
+
+    move_x, hit_x = _sweep_axis(tile_map, lookup, left, right, top, bottom, delta_x / size, True)
+    left = left + move_x
+    right = right + move_x
+
+    move_y, hit_y = _sweep_axis(tile_map, lookup, top, bottom, left, right, -delta_y / size, False)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        time_x = np.where(hit_x, move_x * size / delta_x, 1.0)
+        time_y = np.where(hit_y, -move_y * size / delta_y, 1.0)
+
+    return Sweep(x=x + move_x * size,
+                 y=y - move_y * size,
+                 normal_x=np.where(hit_x, -np.sign(delta_x), 0.0),
+                 normal_y=np.where(hit_y, -np.sign(delta_y), 0.0),
+                 time_x=time_x,
+                 time_y=time_y)
+
+
+def move_box(tile_map, x: float, y: float, half_width: float, half_height: float,
+             delta_x: float, delta_y: float) -> Sweep:
+    """
+    move a single box through the solid tiles of a tile map, see move_boxes
+    """
+    sweep = move_boxes(tile_map, np.array([x]), np.array([y]), half_width, half_height,
+                       np.array([delta_x]), np.array([delta_y]))
+    return Sweep(*(float(field[0]) for field in sweep))
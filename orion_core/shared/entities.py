@@ -0,0 +1,225 @@
+# struct of arrays entity component store
+
+import heapq
+import logging
+import numpy as np
+from orion_core.shared import collision
+
+logger = logging.getLogger(__name__)
+
+# component bits, an entity's mask says which of its columns are in use
+POSITION = 1
+VELOCITY = 2
+AABB = 4
+SPRITE = 8
+COMPONENTS = {"position": POSITION, "velocity": VELOCITY, "aabb": AABB, "sprite": SPRITE}
+
+
+class EntityStore(object):
+    """
+    entities are integer ids into columns of component data, one NumPy
+    array per component, so systems update every matching entity in one
+    vectorized pass instead of one Python object at a time. Systems run
+    fastest when the matching ids are contiguous, selected with a slice
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        """
+        :param capacity: entities to allocate room for, the columns grow as needed
+        """
+        self.count = 0
+        self.position = np.zeros((capacity, 2), dtype=np.float64)
+        self.velocity = np.zeros((capacity, 2), dtype=np.float64)
+        # half width and half height of the box around the position
+        self.aabb = np.zeros((capacity, 2), dtype=np.float64)
+        self.sprite = np.full(capacity, -1, dtype=np.int32)
+        self.mask = np.zeros(capacity, dtype=np.uint8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.systems = []
+        self._free = []
+        self._next = 0
+        self._queries = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, entity: int) -> bool:
+        return 0 <= entity < self._next and bool(self.alive[entity])
+
+    def _check(self, entity: int) -> None:
+        if entity not in self:
+            raise KeyError("no entity {}".format(entity))
+
+    @property
+    def capacity(self) -> int:
+        return len(self.alive)
+
+    def _grow(self, capacity: int) -> None:
+        for name in ("position", "velocity", "aabb", "sprite", "mask", "alive"):
+            column = getattr(self, name)
+            grown = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+            if name == "sprite":
+                grown[:] = -1
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def create(self, position=None, velocity=None, aabb=None, sprite: int = None) -> int:
+        """
+        add an entity with the given components
+        :param position: (x, y)
+        :param velocity: (x, y) per second
+        :param aabb: (half_width, half_height)
+        :param sprite: sprite or texture index
+        :return: entity id, ids of destroyed entities are reused
+        """
+        # reuse the lowest free id, keeping the ids in use packed together
+        # so queries can select them with a slice
+        if self._free:
+            entity = heapq.heappop(self._free)
+        else:
+            entity = self._next
+            if entity >= self.capacity:
+                self._grow(max(self.capacity * 2, 16))
+            self._next += 1
+
+        self.alive[entity] = True
+        self.mask[entity] = 0
+        self.count += 1
+        self._queries = {}
+        self.set(entity, position=position, velocity=velocity, aabb=aabb, sprite=sprite)
+        return entity
+
+    def set(self, entity: int, **components) -> None:
+        """
+        add or update components of an entity, such as set(e, velocity=(1, 0))
+        :param entity:
+        :param components: values by component name, None values are skipped
+        """
+        self._check(entity)
+        for name in components:
+            if name not in COMPONENTS:
+                raise KeyError("unknown component {}".format(name))
+        for name, value in components.items():
+            if value is None:
+                continue
+            getattr(self, name)[entity] = value
+            bit = COMPONENTS[name]
+            if not self.mask[entity] & bit:
+                self.mask[entity] |= bit
+                self._queries = {}
+
+    def remove(self, entity: int, name: str) -> None:
+        """ take a component off an entity """
+        self._check(entity)
+        if name not in COMPONENTS:
+            raise KeyError("unknown component {}".format(name))
+        self.mask[entity] &= ~COMPONENTS[name] & 0xff
+        self._queries = {}
+
+    def destroy(self, entity: int) -> None:
+        if entity not in self:
+            return
+        self.alive[entity] = False
+        self.mask[entity] = 0
+        self.sprite[entity] = -1
+        self.count -= 1
+        heapq.heappush(self._free, entity)
+        self._queries = {}
+
+    def _query(self, components: int) -> tuple:
+        query = self._queries.get(components)
+        if query is None:
+            mask = self.mask[:self._next]
+            ids = np.flatnonzero((mask & components) == components)
+            # a run of ids is selected with a slice, which NumPy handles
+            # as a view rather than a gather and scatter of every row
+            index = ids
+            if ids.size and ids[-1] - ids[0] + 1 == ids.size:
+                index = slice(int(ids[0]), int(ids[-1]) + 1)
+            query = self._queries[components] = (ids, index)
+        return query
+
+    def query(self, components: int) -> np.ndarray:
+        """
+        ids of the entities that have every component, cached until
+        entities or their components change
+        :param components: component bits, such as POSITION | VELOCITY
+        """
+        return self._query(components)[0]
+
+    def select(self, components: int):
+        """
+        index of the column rows of the entities that have every
+        component, a slice when their ids are contiguous and an id array
+        otherwise, use it as store.position[index]
+        :param components: component bits
+        """
+        return self._query(components)[1]
+
+    def bounds(self, index) -> (np.ndarray, np.ndarray, np.ndarray, np.ndarray):
+        """ left, bottom, right and top of the boxes of entities, by id array or select index """
+        position = self.position[index]
+        aabb = self.aabb[index]
+        return (position[:, 0] - aabb[:, 0], position[:, 1] - aabb[:, 1],
+                position[:, 0] + aabb[:, 0], position[:, 1] + aabb[:, 1])
+
+    def add_system(self, system, components: int) -> None:
+        """
+        run a system on every update
+        :param system: called as system(store, index, delta_time) with the
+                       select index of the entities that have the components
+        :param components: component bits the system needs
+        """
+        self.systems.append((system, components))
+
+    def remove_system(self, system) -> None:
+        self.systems = [(fn, components) for fn, components in self.systems if fn is not system]
+
+    def update(self, delta_time: float) -> None:
+        """ run the systems in the order they were added """
+        for system, components in self.systems:
+            ids, index = self._query(components)
+            if ids.size:
+                system(self, index, delta_time)
+
+
+def integrate(store: EntityStore, index, delta_time: float) -> None:
+    """ system moving entities by their velocity, needs POSITION | VELOCITY """
+    store.position[index] += store.velocity[index] * delta_time
+
+
+def confine(left: float, bottom: float, right: float, top: float):
+    """
+    system keeping boxes inside a rectangle such as the screen, needs
+    POSITION | AABB
+    """
+    low = np.array((left, bottom), dtype=np.float64)
+    high = np.array((right, top), dtype=np.float64)
+
+    def system(store: EntityStore, index, delta_time: float) -> None:
+        aabb = store.aabb[index]
+        position = store.position[index]
+        np.maximum(position, low + aabb, out=position)
+        np.minimum(position, high - aabb, out=position)
+        store.position[index] = position
+    return system
+
+
+def collide_tiles(tile_map):
+    """
+    system moving boxes by their velocity through the solid tiles of a
+    map with collision.move_boxes, stopping them on the axis they hit.
+    Needs POSITION | VELOCITY | AABB and replaces integrate for them
+    """
+    def system(store: EntityStore, index, delta_time: float) -> None:
+        position = store.position[index]
+        velocity = store.velocity[index]
+        aabb = store.aabb[index]
+        sweep = collision.move_boxes(tile_map, position[:, 0], position[:, 1], aabb[:, 0], aabb[:, 1],
+                                     velocity[:, 0] * delta_time, velocity[:, 1] * delta_time)
+        store.position[index, 0] = sweep.x
+        store.position[index, 1] = sweep.y
+        velocity[sweep.normal_x != 0, 0] = 0.0
+        velocity[sweep.normal_y != 0, 1] = 0.0
+        store.velocity[index] = velocity
+    return system
@@ -0,0 +1,191 @@
+# event queue input handling
+
+import heapq
+import logging
+from collections import namedtuple, deque
+
+logger = logging.getLogger(__name__)
+
+KEY_PRESS = 0
+KEY_RELEASE = 1
+KEY_REPEAT = 2
+MOUSE_MOTION = 3
+MOUSE_PRESS = 4
+MOUSE_RELEASE = 5
+
+# time is in seconds of game time, key holds the mouse button for mouse
+# events and action is the action the key is bound to, if any
+InputEvent = namedtuple("InputEvent", ["time", "type", "key", "modifiers", "x", "y", "action"])
+
+
+class KeySet(object):
+    """
+    set of key codes kept as a bitset, codes past the bitset such as
+    pyglet's user_key(scancode), which is scancode << 32, go in a plain set
+    """
+
+    def __init__(self, size: int = 1 << 16) -> None:
+        """
+        :param size: key codes below this are kept in the bitset
+        """
+        self.size = size
+        self.bits = bytearray((size + 7) >> 3)
+        self.large = set()
+        self.count = 0
+
+    def __contains__(self, key: int) -> bool:
+        if 0 <= key < self.size:
+            return bool(self.bits[key >> 3] & (1 << (key & 7)))
+        return key in self.large
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self):
+        for byte, bits in enumerate(self.bits):
+            if bits:
+                for bit in range(8):
+                    if bits & (1 << bit):
+                        yield (byte << 3) | bit
+        yield from sorted(self.large)
+
+    def add(self, key: int) -> bool:
+        """ add a key, false if it was already in the set """
+        if key in self:
+            return False
+        if 0 <= key < self.size:
+            self.bits[key >> 3] |= 1 << (key & 7)
+        else:
+            self.large.add(key)
+        self.count += 1
+        return True
+
+    def discard(self, key: int) -> bool:
+        """ remove a key, false if it was not in the set """
+        if key not in self:
+            return False
+        if 0 <= key < self.size:
+            self.bits[key >> 3] &= ~(1 << (key & 7)) & 0xff
+        else:
+            self.large.discard(key)
+        self.count -= 1
+        return True
+
+    def clear(self) -> None:
+        self.bits = bytearray(len(self.bits))
+        self.large = set()
+        self.count = 0
+
+
+class InputState(object):
+    """
+    queues timestamped input events, tracks held keys, schedules key
+    repeats on a timer and maps keys to named actions
+    """
+
+    def __init__(self, repeat_delay: float = 0.2, repeat_time: float = 0.05, repeat_ignore=()) -> None:
+        """
+        :param repeat_delay: seconds a key is held before it repeats
+        :param repeat_time: seconds between repeats
+        :param repeat_ignore: keys that never repeat
+        """
+        self.repeat_delay = repeat_delay
+        self.repeat_time = repeat_time
+        self.repeat_ignore = set(repeat_ignore)
+        self.pressed = KeySet()
+        self.mouse_x = 0
+        self.mouse_y = 0
+        self.events = deque()
+        self.actions = {}
+        self._repeats = []
+        self._press_count = {}
+        self._modifiers = {}
+
+    def bind(self, action: str, *keys: int) -> None:
+        """
+        map keys to an action, a key has at most one action
+        :param action:
+        :param keys:
+        """
+        for key in keys:
+            self.actions[key] = action
+
+    def unbind(self, action: str) -> None:
+        self.actions = dict((key, name) for key, name in self.actions.items() if name != action)
+
+    def is_pressed(self, key: int) -> bool:
+        return key in self.pressed
+
+    def is_action_pressed(self, action: str) -> bool:
+        return any(key in self.pressed for key, name in self.actions.items() if name == action)
+
+    def _queue(self, time: float, event_type: int, key: int, modifiers: int, x: int = 0, y: int = 0) -> None:
+        self.events.append(InputEvent(time, event_type, key, modifiers, x, y, self.actions.get(key)))
+
+    def press(self, key: int, modifiers: int, time: float) -> bool:
+        """
+        record a key press
+        :return: false if the key was already held
+        """
+        if not self.pressed.add(key):
+            return False
+        self._queue(time, KEY_PRESS, key, modifiers)
+        if key not in self.repeat_ignore:
+            count = self._press_count.get(key, 0) + 1
+            self._press_count[key] = count
+            self._modifiers[key] = modifiers
+            heapq.heappush(self._repeats, (time + self.repeat_delay, key, count))
+        return True
+
+    def release(self, key: int, modifiers: int, time: float) -> bool:
+        """
+        record a key release, cancelling its repeats
+        :return: false if the key was not held
+        """
+        if not self.pressed.discard(key):
+            return False
+        self._queue(time, KEY_RELEASE, key, modifiers)
+        return True
+
+    def mouse_motion(self, x: int, y: int, time: float) -> None:
+        self.mouse_x = x
+        self.mouse_y = y
+        self._queue(time, MOUSE_MOTION, 0, 0, x, y)
+
+    def mouse_press(self, x: int, y: int, button: int, modifiers: int, time: float) -> None:
+        self._queue(time, MOUSE_PRESS, button, modifiers, x, y)
+
+    def mouse_release(self, x: int, y: int, button: int, modifiers: int, time: float) -> None:
+        self._queue(time, MOUSE_RELEASE, button, modifiers, x, y)
+
+    def poll(self, now: float) -> list:
+        """
+        take the queued events and the key repeats due by now, oldest first
+        :param now: current game time
+        """
+        repeats = self._repeats
+        if not self.events and (not repeats or repeats[0][0] > now):
+            return []
+
+        events = list(self.events)
+        self.events.clear()
+
+        due = []
+        while repeats and repeats[0][0] <= now:
+            time, key, count = heapq.heappop(repeats)
+            # drop repeats of keys released or pressed again since
+            if key not in self.pressed or self._press_count.get(key) != count:
+                continue
+            due.append(InputEvent(time, KEY_REPEAT, key, self._modifiers.get(key, 0), 0, 0,
+                                  self.actions.get(key)))
+            heapq.heappush(repeats, (time + self.repeat_time, key, count))
+
+        if due:
+            events.extend(due)
+            events.sort(key=lambda event: event.time)
+        return events
+
+    def reset(self) -> None:
+        self.pressed.clear()
+        self.events.clear()
+        self._repeats = []
@@ -0,0 +1,149 @@
+# input recording and deterministic replay
+
+import struct
+import logging
+from orion_core.shared.input_events import KEY_PRESS, KEY_RELEASE, MOUSE_MOTION, MOUSE_PRESS, MOUSE_RELEASE
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ORIL"
+VERSION = 1
+FRAME = 255
+
+_HEADER = struct.Struct("<4sH")
+
+# each record is a type byte followed by its fields, events are stored in
+# the order they arrived and the frame record closes the frame they fell in
+_RECORDS = {
+    FRAME: struct.Struct("<Bd"),
+    KEY_PRESS: struct.Struct("<BqH"),
+    KEY_RELEASE: struct.Struct("<BqH"),
+    MOUSE_MOTION: struct.Struct("<Biiii"),
+    MOUSE_PRESS: struct.Struct("<BiiBH"),
+    MOUSE_RELEASE: struct.Struct("<BiiBH"),
+}
+
+
+class InputLog(object):
+    """
+    compact binary log of input events and frame times
+    """
+
+    def __init__(self, data: bytes = b"") -> None:
+        """
+        :param data: encoded records, without the file header
+        """
+        self.data = bytearray(data)
+        self.frames = 0
+        for record in self:
+            if record[0] == FRAME:
+                self.frames += 1
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __iter__(self):
+        """ yields (type, fields...) tuples, oldest first """
+        data = self.data
+        offset = 0
+        while offset < len(data):
+            record = _RECORDS.get(data[offset])
+            if record is None:
+                raise ValueError("bad input log record {} at {}".format(data[offset], offset))
+            yield record.unpack_from(data, offset)
+            offset += record.size
+
+    def append(self, record_type: int, *fields) -> None:
+        self.data += _RECORDS[record_type].pack(record_type, *fields)
+        if record_type == FRAME:
+            self.frames += 1
+
+    def save(self, file: str) -> None:
+        with open(file, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION))
+            f.write(self.data)
+
+    @classmethod
+    def load(cls, file: str):
+        with open(file, "rb") as f:
+            data = f.read()
+        magic, version = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("{} is not an input log".format(file))
+        if version != VERSION:
+            raise ValueError("unsupported input log version {}".format(version))
+        return cls(data[_HEADER.size:])
+
+
+class InputRecorder(object):
+    """
+    records the input of a window into an InputLog. It sits on the pyglet
+    event stack so it sees the events arcade dispatches, not the key
+    repeats the window generates itself
+    """
+
+    def __init__(self, log: InputLog = None) -> None:
+        self.log = InputLog() if log is None else log
+        self.window = None
+
+    def attach(self, window) -> None:
+        """ start recording the events of window """
+        self.detach()
+        self.window = window
+        window.push_handlers(self)
+
+    def detach(self) -> None:
+        """ stop recording """
+        if self.window is not None:
+            self.window.remove_handlers(self)
+            self.window = None
+
+    def on_key_press(self, key, key_modifiers):
+        self.log.append(KEY_PRESS, key, key_modifiers)
+
+    def on_key_release(self, key, key_modifiers):
+        self.log.append(KEY_RELEASE, key, key_modifiers)
+
+    def on_mouse_motion(self, x, y, delta_x, delta_y):
+        self.log.append(MOUSE_MOTION, int(x), int(y), int(delta_x), int(delta_y))
+
+    def on_mouse_press(self, x, y, button, key_modifiers):
+        self.log.append(MOUSE_PRESS, int(x), int(y), button, key_modifiers)
+
+    def on_mouse_release(self, x, y, button, key_modifiers):
+        self.log.append(MOUSE_RELEASE, int(x), int(y), button, key_modifiers)
+
+    def on_update(self, delta_time):
+        self.log.append(FRAME, delta_time)
+
+
+def replay(window, log: InputLog, draw: bool = False) -> int:
+    """
+    feed a recorded session into a window as fast as it will run, calling
+    the handlers directly so no display or event loop is needed
+    :param window: Window to drive, normally freshly created, use
+                   Window.headless() to replay without a display
+    :param log: recorded InputLog
+    :param draw: also call on_draw after every frame, needs a real window
+    :return: number of frames replayed
+    """
+    frames = 0
+    for record in log:
+        record_type = record[0]
+        if record_type == FRAME:
+            window.on_update(record[1])
+            if draw:
+                window.on_draw()
+            frames += 1
+        elif record_type == KEY_PRESS:
+            window.on_key_press(record[1], record[2])
+        elif record_type == KEY_RELEASE:
+            window.on_key_release(record[1], record[2])
+        elif record_type == MOUSE_MOTION:
+            window.on_mouse_motion(*record[1:])
+        elif record_type == MOUSE_PRESS:
+            window.on_mouse_press(*record[1:])
+        elif record_type == MOUSE_RELEASE:
+            window.on_mouse_release(*record[1:])
+    logger.info("replayed {} frames".format(frames))
+    return frames
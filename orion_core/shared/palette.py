@@ -0,0 +1,223 @@
+# palette table and vectorized recolor operations
+
+import logging
+import numpy as np
+from orion_core.shared import color
+
+logger = logging.getLogger(__name__)
+
+CUBE_BITS = 5
+
+
+def _pack(rgba: np.ndarray) -> np.ndarray:
+    """ uint32 key of each RGBA row """
+    rgba = np.ascontiguousarray(rgba, dtype=np.uint8)
+    return rgba.view(np.uint32).reshape(rgba.shape[:-1])
+
+
+def as_rgba(colors) -> np.ndarray:
+    """
+    uint8 RGBA array from colors given as RGB or RGBA tuples or arrays,
+    missing alpha is opaque
+    :param colors: one color or a sequence of colors
+    """
+    colors = np.asarray(colors, dtype=np.uint8)
+    if colors.shape[-1] == 4:
+        return colors
+    if colors.shape[-1] != 3:
+        raise ValueError("colors must have 3 or 4 channels")
+    alpha = np.full(colors.shape[:-1] + (1,), 255, dtype=np.uint8)
+    return np.concatenate([colors, alpha], axis=-1)
+
+
+def _opaque(rgba: np.ndarray) -> np.ndarray:
+    """ copy of RGBA values with full alpha, for comparing RGB alone """
+    rgba = rgba.copy()
+    rgba[..., 3] = 255
+    return rgba
+
+
+class Palette(object):
+    """
+    named colors packed into one uint8 array of RGBA rows, with lookups
+    by name and by color and nearest color matching for whole images
+    """
+
+    def __init__(self, names: list, colors) -> None:
+        """
+        :param names: color names, one per row
+        :param colors: RGB or RGBA rows
+        """
+        self.names = list(names)
+        self.colors = as_rgba(colors).reshape(-1, 4)
+        if len(self.names) != len(self.colors):
+            raise ValueError("expected {} colors, got {}".format(len(self.names), len(self.colors)))
+        self.index = dict((name, i) for i, name in enumerate(self.names))
+
+        # sorted packed colors for reverse lookups, the first name wins
+        # when several names share a color
+        keys = _pack(self.colors)
+        self._keys, first = np.unique(keys, return_index=True)
+        self._key_rows = first
+        self._rgb_keys = None
+        self._cube = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def __getitem__(self, name: str) -> tuple:
+        return tuple(self.colors[self.index[name]].tolist())
+
+    @property
+    def rgb(self) -> np.ndarray:
+        """ Nx3 view of the colors without alpha """
+        return self.colors[:, :3]
+
+    def subset(self, names) -> "Palette":
+        """ palette of some of the colors, in the order given """
+        names = list(names)
+        return Palette(names, self.colors[[self.index[name] for name in names]])
+
+    def lookup(self, colors, alpha: bool = True) -> np.ndarray:
+        """
+        row of each color in the palette, -1 where it is not in it
+        :param colors: RGB or RGBA values of any shape
+        :param alpha: match alpha too, otherwise only RGB is compared
+        """
+        if not len(self):
+            raise ValueError("cannot look up colors in an empty palette")
+        colors = as_rgba(colors)
+        sorted_keys, key_rows = self._keys, self._key_rows
+        if not alpha:
+            if self._rgb_keys is None:
+                self._rgb_keys = np.unique(_pack(_opaque(self.colors)), return_index=True)
+            sorted_keys, key_rows = self._rgb_keys
+            colors = _opaque(colors)
+        keys = _pack(colors)
+        rows = np.searchsorted(sorted_keys, keys)
+        rows = np.minimum(rows, len(sorted_keys) - 1)
+        found = sorted_keys[rows] == keys
+        return np.where(found, key_rows[rows], -1)
+
+    def name_of(self, rgb) -> str:
+        """ name of a color, None if it is not in the palette """
+        row = int(self.lookup(rgb))
+        return None if row < 0 else self.names[row]
+
+    def nearest(self, colors, exact: bool = False) -> np.ndarray:
+        """
+        row of the closest palette color to each color, by RGB distance
+        :param colors: RGB or RGBA values of any shape
+        :param exact: compare against every palette color instead of using
+                      the lookup cube, which picks the closest color to the
+                      center of each cube cell rather than to the color
+        """
+        colors = np.asarray(colors, dtype=np.uint8)[..., :3]
+        if exact:
+            return self._nearest_exact(colors.reshape(-1, 3)).reshape(colors.shape[:-1])
+        shift = 8 - CUBE_BITS
+        cube = self.lookup_cube()
+        return cube[colors[..., 0] >> shift, colors[..., 1] >> shift, colors[..., 2] >> shift]
+
+    def _nearest_exact(self, colors: np.ndarray, chunk: int = 2048) -> np.ndarray:
+        # |a - b|^2 = |a|^2 - 2ab + |b|^2, |a|^2 is the same for every
+        # palette color so it can be left out of the argmin
+        palette = self.rgb.astype(np.float64)
+        norms = (palette ** 2).sum(axis=1)
+        rows = np.empty(len(colors), dtype=np.intp)
+        # chunks keep the distance matrix small for big images
+        for start in range(0, len(colors), chunk):
+            part = colors[start:start + chunk].astype(np.float64)
+            rows[start:start + chunk] = (norms - 2.0 * part @ palette.T).argmin(axis=1)
+        return rows
+
+    def lookup_cube(self) -> np.ndarray:
+        """
+        nearest palette row for every cell of an RGB cube with CUBE_BITS
+        bits per channel, built on first use
+        """
+        if self._cube is None:
+            size = 1 << CUBE_BITS
+            step = 256 // size
+            centers = np.arange(size) * step + step // 2
+            grid = np.stack(np.meshgrid(centers, centers, centers, indexing="ij"), axis=-1)
+            self._cube = self._nearest_exact(grid.reshape(-1, 3)).reshape(size, size, size)
+            logger.debug("built {} color lookup cube".format(len(self)))
+        return self._cube
+
+    def quantize(self, pixels: np.ndarray, exact: bool = False) -> np.ndarray:
+        """
+        snap the RGB of every pixel to the nearest palette color, keeping alpha
+        :param pixels: [y, x, 4] uint8 RGBA image
+        :param exact: see nearest
+        """
+        out = pixels.copy()
+        out[..., :3] = self.rgb[self.nearest(pixels, exact)]
+        return out
+
+
+def from_module(module=color) -> Palette:
+    """ palette of the color tuples of a module such as orion_core.shared.color """
+    names = sorted(name for name, value in vars(module).items()
+                   if name.isupper() and isinstance(value, tuple) and len(value) in (3, 4))
+    return Palette(names, [as_rgba(getattr(module, name)) for name in names])
+
+
+_palette = None
+
+
+def get_palette() -> Palette:
+    """ palette of every color in orion_core.shared.color """
+    global _palette
+    if _palette is None:
+        _palette = from_module()
+    return _palette
+
+
+def tint(pixels: np.ndarray, rgb, amount: float = 1.0) -> np.ndarray:
+    """
+    multiply an image by a color, the way sprite colors tint textures
+    :param pixels: [y, x, 4] uint8 RGBA image
+    :param rgb: RGB or RGBA tint
+    :param amount: 0.0 leaves the image as is, 1.0 is the full tint
+    """
+    factor = as_rgba(rgb).astype(np.float32) / 255.0
+    factor = 1.0 + (factor - 1.0) * amount
+    return np.rint(pixels * factor).astype(np.uint8)
+
+
+def blend(pixels: np.ndarray, other, amount=0.5) -> np.ndarray:
+    """
+    mix an image towards another image or a single color
+    :param pixels: [y, x, 4] uint8 RGBA image
+    :param other: image of the same shape, or RGB or RGBA color
+    :param amount: 0.0 keeps pixels, 1.0 gives other, either one value or
+                   a [y, x] array such as a light map
+    """
+    if not isinstance(other, np.ndarray) or other.ndim == 1:
+        other = as_rgba(other)
+    amount = np.asarray(amount, dtype=np.float32)
+    if amount.ndim == 2:
+        amount = amount[..., None]
+    source = pixels.astype(np.float32)
+    return np.rint(source + (other.astype(np.float32) - source) * amount).astype(np.uint8)
+
+
+def remap(pixels: np.ndarray, source: Palette, target: Palette) -> np.ndarray:
+    """
+    palette swap, replace the RGB of every pixel that is a source color
+    with the target color of the same row, such as team colors. Colors
+    match on RGB alone and each pixel keeps its alpha, so antialiased and
+    semi transparent pixels are swapped too
+    :param pixels: [y, x, 4] uint8 RGBA image
+    :param source: colors to replace
+    :param target: replacement colors, at least as many as source
+    """
+    rows = source.lookup(pixels, alpha=False)
+    out = pixels.copy()
+    hit = rows >= 0
+    out[hit, :3] = target.rgb[rows[hit]]
+    return out
@@ -0,0 +1,187 @@
+# parallel asset preloading
+
+import os
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from orion_core.shared.spritesheet import Spritesheet
+from orion_core.shared.tile_map import TileMap
+
+logger = logging.getLogger(__name__)
+
+# a manifest maps asset names to specs, for example
+#
+#   {
+#       "tiles": {"type": "spritesheet", "file": "tiles.png", "tile_size": 32},
+#       "level": {"type": "tile_map", "width": 64, "height": 16, "tile_size": 32,
+#                 "map_file": "level.txt", "textures": {"#": ("tiles", 2)}, "solid": "#"},
+#       "music": {"type": "custom", "loader": load_music},
+#   }
+#
+# tile maps are only queued once the sheets or custom assets they take
+# textures from are done, so no worker sits waiting on another. A tile map gives either "map", the map string, or
+# "map_file", a file holding it. The workers only decode images and parse
+# grids, tile map sprites need the GL context so they are built on the
+# thread that asks LoadProgress for the map
+
+
+def _load_spritesheet(spec: dict, registry) -> Spritesheet:
+    return Spritesheet(spec["file"], spec["tile_size"], cache=spec.get("cache"),
+                       lazy=spec.get("lazy", False), registry=registry)
+
+
+def _load_tile_map(spec: dict, assets: dict) -> TileMap:
+    tile_map = TileMap(spec["width"], spec["height"], spec["tile_size"], spec.get("chunk_size", 16))
+
+    textures = {}
+    for c, (sheet_name, index) in spec.get("textures", {}).items():
+        textures[c] = assets[sheet_name].result().get_texture(index)
+    tile_map.load_texture_map(textures)
+
+    if "map_file" in spec:
+        with open(spec["map_file"]) as f:
+            # only the line endings go, spaces can be tiles
+            map_string = "".join(line.rstrip("\r\n") for line in f)
+    else:
+        map_string = spec["map"]
+    tile_map.parse_map_string(map_string, build_chunks=False)
+
+    if "solid" in spec:
+        tile_map.set_solid_tiles(spec["solid"])
+    return tile_map
+
+
+def _forward(source: Future, target: Future) -> None:
+    error = source.exception()
+    if error is not None:
+        target.set_exception(error)
+    else:
+        target.set_result(source.result())
+
+
+def _submit_after(executor: ThreadPoolExecutor, dependencies: list, fn, *args) -> Future:
+    """
+    future of fn run on the pool once every dependency is done, chained
+    with done callbacks so no worker blocks on a future queued after it
+    """
+    future = Future()
+    remaining = [len(dependencies)]
+    lock = threading.Lock()
+
+    def submit() -> None:
+        executor.submit(fn, *args).add_done_callback(lambda done: _forward(done, future))
+
+    def on_dependency(done: Future) -> None:
+        with lock:
+            remaining[0] -= 1
+            ready = remaining[0] == 0
+        if ready:
+            submit()
+
+    if not dependencies:
+        submit()
+    for dependency in dependencies:
+        dependency.add_done_callback(on_dependency)
+    return future
+
+
+class LoadProgress(object):
+    """
+    handle on a running preload, poll it from a loading screen
+    """
+
+    def __init__(self, futures: dict, executor: ThreadPoolExecutor, finishers: dict = None) -> None:
+        """
+        :param futures: futures of the assets by name
+        :param executor: pool the assets load on
+        :param finishers: steps run on the caller's thread by result, by name
+        """
+        self.futures = futures
+        self._executor = executor
+        self._finishers = dict(finishers or {})
+        self._lock = threading.Lock()
+        self.loaded = 0
+        for future in futures.values():
+            future.add_done_callback(self._on_done)
+
+    def _on_done(self, future) -> None:
+        with self._lock:
+            self.loaded += 1
+            finished = self.loaded == self.total
+        if finished:
+            self._executor.shutdown(wait=False)
+
+    @property
+    def total(self) -> int:
+        return len(self.futures)
+
+    @property
+    def fraction(self) -> float:
+        """ share of the assets loaded, from 0.0 to 1.0 """
+        return self.loaded / self.total if self.futures else 1.0
+
+    @property
+    def done(self) -> bool:
+        return self.loaded == self.total
+
+    def errors(self) -> dict:
+        """ exceptions of the assets that failed, by name """
+        return dict((name, future.exception()) for name, future in self.futures.items()
+                    if future.done() and future.exception() is not None)
+
+    def result(self, name: str, timeout: float = None):
+        """
+        the loaded asset, waiting for it if needed. Tile maps build their
+        sprites here, so call it from the thread that owns the window
+        :param name:
+        :param timeout:
+        """
+        value = self.futures[name].result(timeout)
+        with self._lock:
+            finish = self._finishers.pop(name, None)
+        if finish is not None:
+            finish(value)
+        return value
+
+    def wait(self, timeout: float = None) -> dict:
+        """ wait for every asset and return them by name """
+        return dict((name, self.result(name, timeout)) for name in self.futures)
+
+
+def preload(manifest: dict, workers: int = None, registry=None) -> LoadProgress:
+    """
+    load the assets of a manifest on a thread pool
+    :param manifest: asset specs by name
+    :param workers: pool size, one per core if None
+    :param registry: TextureRegistry for spritesheets, the process registry if None
+    """
+    for name, spec in manifest.items():
+        if spec["type"] not in ("spritesheet", "tile_map", "custom"):
+            raise ValueError("unknown asset type {} for {}".format(spec["type"], name))
+        if spec["type"] == "tile_map":
+            for sheet_name, index in spec.get("textures", {}).values():
+                if manifest.get(sheet_name, {}).get("type") not in ("spritesheet", "custom"):
+                    raise ValueError("tile map {} takes textures from {}, which is not a spritesheet "
+                                     "or custom asset".format(name, sheet_name))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="orion-preload")
+
+    futures = {}
+    finishers = {}
+    for name, spec in manifest.items():
+        if spec["type"] == "spritesheet":
+            futures[name] = executor.submit(_load_spritesheet, spec, registry)
+        elif spec["type"] == "custom":
+            futures[name] = executor.submit(spec["loader"])
+    for name, spec in manifest.items():
+        if spec["type"] == "tile_map":
+            dependencies = [futures[sheet_name] for sheet_name, index in spec.get("textures", {}).values()]
+            futures[name] = _submit_after(executor, dependencies, _load_tile_map, spec, futures)
+            finishers[name] = TileMap.build_chunks
+    if not futures:
+        executor.shutdown(wait=False)
+
+    logger.info("preloading {} assets on {} workers".format(len(futures), workers))
+    return LoadProgress(futures, executor, finishers)
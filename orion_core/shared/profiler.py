@@ -0,0 +1,86 @@
+# per phase frame timing
+
+import time
+import logging
+from contextlib import contextmanager
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FRAME_PHASES = ("input", "update", "camera", "draw", "debug")
+PERCENTILES = (50, 95, 99)
+
+
+class FrameProfiler(object):
+    """
+    times named phases of each frame into a fixed size ring buffer of
+    the most recent frames
+    """
+
+    def __init__(self, phases=FRAME_PHASES, capacity: int = 240, clock=time.perf_counter) -> None:
+        """
+        :param phases: names of the phases timed each frame
+        :param capacity: number of frames kept
+        :param clock: time source in seconds
+        """
+        self.phases = tuple(phases)
+        self.phase_index = dict((name, i) for i, name in enumerate(self.phases))
+        self.capacity = capacity
+        self.clock = clock
+        self.samples = np.zeros((capacity, len(self.phases)), dtype=np.float64)
+        self.frame = -1
+        self.count = 0
+        self._started = {}
+
+    def next_frame(self) -> None:
+        """ start recording a new frame, overwriting the oldest """
+        self.frame = (self.frame + 1) % self.capacity
+        self.samples[self.frame] = 0.0
+        self.count = min(self.count + 1, self.capacity)
+
+    def start(self, name: str) -> None:
+        self._started[name] = self.clock()
+
+    def stop(self, name: str) -> None:
+        elapsed = self.clock() - self._started.pop(name)
+        if self.frame < 0:
+            self.next_frame()
+        self.samples[self.frame, self.phase_index[name]] += elapsed
+
+    @contextmanager
+    def phase(self, name: str):
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(name)
+
+    def history(self) -> np.ndarray:
+        """ recorded frames oldest first, shape (frames, phases) in seconds """
+        if self.count < self.capacity:
+            return self.samples[:self.count]
+        return np.roll(self.samples, -(self.frame + 1), axis=0)
+
+    def frame_times(self) -> np.ndarray:
+        """ total time of each recorded frame oldest first, in seconds """
+        return self.history().sum(axis=1)
+
+    def percentiles(self, name: str = None, q=PERCENTILES) -> tuple:
+        """
+        percentiles of a phase, or of whole frames, in milliseconds
+        :param name: phase name, whole frames if None
+        :param q: percentiles to compute
+        """
+        if self.count == 0:
+            return tuple(0.0 for _ in q)
+        if name is None:
+            values = self.frame_times()
+        else:
+            values = self.history()[:, self.phase_index[name]]
+        return tuple(float(v) * 1000.0 for v in np.percentile(values, q))
+
+    def stats(self) -> dict:
+        """ p50, p95 and p99 in milliseconds of every phase and of the frame """
+        stats = dict((name, self.percentiles(name)) for name in self.phases)
+        stats["frame"] = self.percentiles()
+        return stats
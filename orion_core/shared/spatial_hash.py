@@ -0,0 +1,202 @@
+# uniform grid spatial hash for dynamic entities
+
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SpatialHash(object):
+    """
+    buckets entity boxes into a uniform grid of cells, entities are
+    integer handles and their boxes are kept in arrays indexed by handle
+    """
+
+    def __init__(self, cell_size: int = None, tile_map=None, capacity: int = 64) -> None:
+        if cell_size is None:
+            if tile_map is None:
+                raise ValueError("cell_size or tile_map is required")
+            cell_size = tile_map.tile_size
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.cell_size = cell_size
+        self.cells = {}
+        self.count = 0
+
+        # per handle box (left, bottom, right, top) and covered cell range
+        self.bounds = np.zeros((capacity, 4), dtype=np.float64)
+        self.cell_range = np.zeros((capacity, 4), dtype=np.int64)
+        self.active = np.zeros(capacity, dtype=bool)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, handle: int) -> bool:
+        return 0 <= handle < self.active.size and bool(self.active[handle])
+
+    def _grow(self, handle: int) -> None:
+        size = max(self.active.size, 1)
+        while size <= handle:
+            size *= 2
+        self.bounds = np.resize(self.bounds, (size, 4))
+        self.cell_range = np.resize(self.cell_range, (size, 4))
+        active = np.zeros(size, dtype=bool)
+        active[:self.active.size] = self.active
+        self.active = active
+
+    def _cells_for(self, left: float, bottom: float, right: float, top: float) -> tuple:
+        size = self.cell_size
+        return int(left // size), int(bottom // size), int(right // size), int(top // size)
+
+    def _link(self, handle: int, cell_range: tuple) -> None:
+        x1, y1, x2, y2 = cell_range
+        cells = self.cells
+        for cy in range(y1, y2 + 1):
+            for cx in range(x1, x2 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = {handle}
+                else:
+                    bucket.add(handle)
+
+    def _unlink(self, handle: int, cell_range) -> None:
+        x1, y1, x2, y2 = (int(v) for v in cell_range)
+        cells = self.cells
+        for cy in range(y1, y2 + 1):
+            for cx in range(x1, x2 + 1):
+                bucket = cells[(cx, cy)]
+                bucket.discard(handle)
+                if not bucket:
+                    del cells[(cx, cy)]
+
+    def insert(self, handle: int, x: float, y: float, half_width: float = 0.0, half_height: float = 0.0) -> None:
+        """
+        add an entity box, centered on x, y
+        :param handle: non negative integer id of the entity
+        :param x:
+        :param y:
+        :param half_width:
+        :param half_height:
+        """
+        if handle < 0:
+            raise ValueError("handle must be non negative")
+        if handle in self:
+            self.remove(handle)
+        if handle >= self.active.size:
+            self._grow(handle)
+        box = (x - half_width, y - half_height, x + half_width, y + half_height)
+        cell_range = self._cells_for(*box)
+        self.bounds[handle] = box
+        self.cell_range[handle] = cell_range
+        self.active[handle] = True
+        self.count += 1
+        self._link(handle, cell_range)
+
+    def move(self, handle: int, x: float, y: float, half_width: float = None, half_height: float = None) -> None:
+        """
+        update an entity box, only touching the buckets when it changes cells
+        :param handle:
+        :param x:
+        :param y:
+        :param half_width: keeps the current size if None
+        :param half_height: keeps the current size if None
+        """
+        if handle not in self:
+            raise KeyError(handle)
+        left, bottom, right, top = self.bounds[handle]
+        if half_width is None:
+            half_width = (right - left) * 0.5
+        if half_height is None:
+            half_height = (top - bottom) * 0.5
+        box = (x - half_width, y - half_height, x + half_width, y + half_height)
+        self.bounds[handle] = box
+
+        cell_range = self._cells_for(*box)
+        old_range = self.cell_range[handle]
+        if (old_range[0] == cell_range[0] and old_range[1] == cell_range[1] and
+                old_range[2] == cell_range[2] and old_range[3] == cell_range[3]):
+            return
+        self._unlink(handle, old_range)
+        self.cell_range[handle] = cell_range
+        self._link(handle, cell_range)
+
+    def remove(self, handle: int) -> None:
+        if handle not in self:
+            return
+        self._unlink(handle, self.cell_range[handle])
+        self.active[handle] = False
+        self.count -= 1
+
+    def clear(self) -> None:
+        self.cells = {}
+        self.active[:] = False
+        self.count = 0
+
+    def _candidates(self, left: float, bottom: float, right: float, top: float) -> np.ndarray:
+        x1, y1, x2, y2 = self._cells_for(left, bottom, right, top)
+        found = set()
+        cells = self.cells
+        if (x2 - x1 + 1) * (y2 - y1 + 1) > len(cells):
+            # the query covers more cells than are occupied
+            for (cx, cy), bucket in cells.items():
+                if x1 <= cx <= x2 and y1 <= cy <= y2:
+                    found.update(bucket)
+        else:
+            for cy in range(y1, y2 + 1):
+                for cx in range(x1, x2 + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket:
+                        found.update(bucket)
+        return np.fromiter(found, dtype=np.int64, count=len(found))
+
+    def query_rect(self, left: float, bottom: float, right: float, top: float) -> np.ndarray:
+        """
+        handles of the entities whose boxes overlap the rectangle
+        :param left:
+        :param bottom:
+        :param right:
+        :param top:
+        """
+        handles = self._candidates(left, bottom, right, top)
+        box = self.bounds[handles]
+        overlap = (box[:, 0] <= right) & (box[:, 2] >= left) & (box[:, 1] <= top) & (box[:, 3] >= bottom)
+        return np.sort(handles[overlap])
+
+    def query_radius(self, x: float, y: float, radius: float) -> np.ndarray:
+        """
+        handles of the entities whose boxes are within radius of a point
+        :param x:
+        :param y:
+        :param radius:
+        """
+        handles = self._candidates(x - radius, y - radius, x + radius, y + radius)
+        box = self.bounds[handles]
+        near_x = np.clip(x, box[:, 0], box[:, 2]) - x
+        near_y = np.clip(y, box[:, 1], box[:, 3]) - y
+        inside = near_x * near_x + near_y * near_y <= radius * radius
+        return np.sort(handles[inside])
+
+    def query_point(self, x: float, y: float) -> np.ndarray:
+        """ handles of the entities whose boxes contain a point, for picking """
+        return self.query_rect(x, y, x, y)
+
+    def pairs(self) -> np.ndarray:
+        """
+        every pair of entities whose boxes overlap, as an (n, 2) array of
+        handles with the lower handle first
+        """
+        found = set()
+        for bucket in self.cells.values():
+            if len(bucket) < 2:
+                continue
+            members = sorted(bucket)
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    found.add((a, b))
+        if not found:
+            return np.zeros((0, 2), dtype=np.int64)
+        pairs = np.array(sorted(found), dtype=np.int64)
+        a = self.bounds[pairs[:, 0]]
+        b = self.bounds[pairs[:, 1]]
+        overlap = (a[:, 0] <= b[:, 2]) & (a[:, 2] >= b[:, 0]) & (a[:, 1] <= b[:, 3]) & (a[:, 3] >= b[:, 1])
+        return pairs[overlap]
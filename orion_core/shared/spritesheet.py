@@ -1,39 +1,242 @@
 # spritesheet management
 
+import os
 import logging
+import itertools
 from PIL import Image
+import numpy as np
 import arcade
+from orion_core.shared.texture_registry import get_texture_registry
+from orion_core.shared.texture_variants import get_texture_variants
 
 
 logger = logging.getLogger(__name__)
 
+_atlas_ids = itertools.count()
 
-class Spritesheet(object):
 
-    sprite_textures = []
+class TextureAtlas(object):
+    """
+    a single image holding the tiles of one or more spritesheets, kept as
+    an RGBA pixel array of shape (height, width, 4)
+    """
+
+    def __init__(self, name: str, pixels: np.ndarray) -> None:
+        self.name = name
+        # names can repeat, such as two packs both called "atlas", the id
+        # keeps the textures of different atlases apart
+        self.id = next(_atlas_ids)
+        self.pixels = pixels
+        self.height, self.width = pixels.shape[:2]
+        self._image = None
+
+    @property
+    def image(self) -> Image:
+        if self._image is None:
+            self._image = Image.fromarray(np.ascontiguousarray(self.pixels), "RGBA")
+        return self._image
+
+
+class TextureRegion(object):
+    """
+    lightweight handle to a rectangle of a texture atlas
+    """
+
+    __slots__ = ("atlas", "x", "y", "width", "height")
+
+    def __init__(self, atlas: TextureAtlas, x: int, y: int, width: int, height: int) -> None:
+        self.atlas = atlas
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    @property
+    def name(self) -> str:
+        """ unique name of the region, used to key its texture """
+        return "{}#{}:{},{},{},{}".format(self.atlas.name, self.atlas.id, self.x, self.y, self.width, self.height)
+
+    @property
+    def uv(self) -> (float, float, float, float):
+        """ normalized (left, top, right, bottom) of the region in the atlas """
+        return (self.x / self.atlas.width, self.y / self.atlas.height,
+                (self.x + self.width) / self.atlas.width, (self.y + self.height) / self.atlas.height)
 
-    def __init__(self, file: str, tile_size: int):
+    def pixels(self) -> np.ndarray:
+        """ view of the region in the atlas pixel array """
+        return self.atlas.pixels[self.y:self.y + self.height, self.x:self.x + self.width]
+
+    def image(self) -> Image:
+        return Image.fromarray(np.ascontiguousarray(self.pixels()), "RGBA")
+
+    def texture(self) -> arcade.Texture:
+        return arcade.Texture(self.name, self.image())
+
+
+def load_atlas(file: str, tile_size: int, cache=None) -> TextureAtlas:
+    """
+    decode an image file into an atlas, through the cache when given
+    :param file:
+    :param tile_size:
+    :param cache: SpritesheetCache for the decoded pixels
+    :return: the atlas, or None if the file cannot be read
+    """
+    pixels = cache.load(file, tile_size) if cache is not None else None
+
+    if pixels is None:
         try:
             image = Image.open(file)
+            image.load()
         except:
             logger.error("unable to read file: {}".format(file))
+            return None
+        pixels = np.asarray(image.convert("RGBA"))
+        if cache is not None:
+            cache.store(file, tile_size, pixels)
+
+    return TextureAtlas(os.path.abspath(file), pixels)
+
+
+class Spritesheet(object):
+
+    # optional SpritesheetCache used when no cache is passed in
+    cache = None
+
+    def __init__(self, file: str, tile_size: int, cache=None, lazy: bool = False, registry=None):
+        """
+        :param file: image file of the sheet
+        :param tile_size: width and height of each tile in pixels
+        :param cache: SpritesheetCache for the decoded pixels
+        :param lazy: build tile textures on first use instead of up front
+        :param registry: TextureRegistry to load through, the process registry if None
+        """
+        self.file = file
+        self.tile_size = tile_size
+        self.lazy = lazy
+        self.registry = registry if registry is not None else get_texture_registry()
+        self.atlas = None
+        self.regions = []
+        self.sprite_textures = []
+        self.handles = {}
+
+        if cache is None:
+            cache = self.cache
+        handle = self.registry.acquire(("atlas", os.path.abspath(file)),
+                                       lambda: load_atlas(file, tile_size, cache))
+        if handle is None:
             return
+        self.handles["atlas"] = handle
 
-        width, height = image.size
+        self.atlas = handle.value
+        height, width = self.atlas.pixels.shape[:2]
         tiles_wide = int(width // tile_size)
         tiles_tall = int(height // tile_size)
 
         for y in range(tiles_tall):
             for x in range(tiles_wide):
-                left = x * tile_size
-                top = y * tile_size
-                right = left + tile_size
-                bottom = top + tile_size
-                cropped = image.crop((left, top, right, bottom))
-                texture = arcade.Texture(f"{file}{x}{y}", cropped)
-                self.sprite_textures.append(texture)
-
-    def get_texture(self, index: int) -> Image:
-        if index < 0 or index > len(self.sprite_textures):
+                self.regions.append(TextureRegion(self.atlas, x * tile_size, y * tile_size, tile_size, tile_size))
+
+        self.sprite_textures = [None] * len(self.regions)
+        if not lazy:
+            self.prefetch()
+
+    def get_region(self, index: int) -> TextureRegion:
+        if index < 0 or index >= len(self.regions):
+            return None
+        return self.regions[index]
+
+    def get_texture(self, index: int) -> arcade.Texture:
+        if index < 0 or index >= len(self.sprite_textures):
+            return None
+        texture = self.sprite_textures[index]
+        if texture is None:
+            region = self.regions[index]
+            handle = self.registry.acquire(("texture", region.name), region.texture)
+            self.handles[index] = handle
+            texture = handle.value
+            self.sprite_textures[index] = texture
+        return texture
+
+    def get_variant(self, index: int, transform, variants=None) -> arcade.Texture:
+        """
+        recolored texture of a tile, built once and shared, the sheet
+        holds it until release
+        :param index: tile index
+        :param transform: Tint, Blend, Remap, Quantize or Custom
+        :param variants: TextureVariants cache, the process cache if None
+        """
+        region = self.get_region(index)
+        if region is None:
             return None
-        return self.sprite_textures[index]
+        if variants is None:
+            variants = get_texture_variants()
+        key = ("variant", index, transform, id(variants))
+        handle = self.handles.get(key)
+        if handle is None:
+            handle = self.handles[key] = variants.acquire(region, transform)
+        return handle.value
+
+    def prefetch(self, indices=None) -> None:
+        """
+        build the textures of several tiles ahead of use
+        :param indices: tile indices, every tile if None
+        """
+        if indices is None:
+            indices = range(len(self.regions))
+        for index in indices:
+            self.get_texture(index)
+
+    def release(self) -> None:
+        """ give the sheet's textures back to the registry """
+        for handle in self.handles.values():
+            handle.release()
+        self.handles = {}
+        self.sprite_textures = [None] * len(self.regions)
+
+
+def pack_atlas(sheets: list, name: str = "atlas", max_width: int = 2048, padding: int = 1) -> TextureAtlas:
+    """
+    pack the atlases of several spritesheets into one image, pointing
+    their regions at the packed atlas
+    :param sheets: spritesheets to pack
+    :param name: name of the packed atlas
+    :param max_width: widest the packed image may grow before a new shelf
+    :param padding: pixels between packed sheets
+    """
+    atlases = []
+    for sheet in sheets:
+        if sheet.atlas is not None and sheet.atlas not in atlases:
+            atlases.append(sheet.atlas)
+
+    # shelf packing, tallest sheets first
+    placements = {}
+    shelf_x = shelf_y = shelf_height = packed_width = 0
+    for atlas in sorted(atlases, key=lambda a: a.height, reverse=True):
+        if shelf_x > 0 and shelf_x + atlas.width > max_width:
+            shelf_y += shelf_height + padding
+            shelf_x = shelf_height = 0
+        placements[id(atlas)] = (shelf_x, shelf_y)
+        shelf_x += atlas.width + padding
+        shelf_height = max(shelf_height, atlas.height)
+        packed_width = max(packed_width, shelf_x - padding)
+
+    pixels = np.zeros((max(shelf_y + shelf_height, 1), max(packed_width, 1), 4), dtype=np.uint8)
+    for atlas in atlases:
+        x, y = placements[id(atlas)]
+        pixels[y:y + atlas.height, x:x + atlas.width] = atlas.pixels
+    packed = TextureAtlas(name, pixels)
+
+    for sheet in sheets:
+        if sheet.atlas is None:
+            continue
+        offset_x, offset_y = placements[id(sheet.atlas)]
+        sheet.regions = [TextureRegion(packed, region.x + offset_x, region.y + offset_y,
+                                       region.width, region.height) for region in sheet.regions]
+        sheet.atlas = packed
+
+        # hold the packed atlas instead of the one the sheet was loaded from
+        handle = sheet.registry.acquire(("atlas", "packed", packed.id), lambda: packed)
+        sheet.handles.pop("atlas").release()
+        sheet.handles["atlas"] = handle
+    logger.debug("packed {} atlases into {} ({} x {})".format(len(atlases), name, packed.width, packed.height))
+    return packed
@@ -0,0 +1,161 @@
+# process wide texture and resource registry
+
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET = 256 * 1024 * 1024
+
+
+def resource_size(value) -> int:
+    """ estimated memory in bytes held by a texture or atlas """
+    pixels = getattr(value, "pixels", None)
+    if pixels is not None and hasattr(pixels, "nbytes"):
+        return int(pixels.nbytes)
+    image = getattr(value, "image", None)
+    if image is not None and hasattr(image, "size"):
+        width, height = image.size
+        return width * height * len(image.getbands())
+    return 0
+
+
+class TextureHandle(object):
+    """
+    counted reference to a registry entry, release it when done
+    """
+
+    __slots__ = ("registry", "key", "value", "released")
+
+    def __init__(self, registry, key, value) -> None:
+        self.registry = registry
+        self.key = key
+        self.value = value
+        self.released = False
+
+    def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self.registry.release(self.key)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+
+class _Entry(object):
+
+    __slots__ = ("value", "size", "refs")
+
+    def __init__(self, value, size: int) -> None:
+        self.value = value
+        self.size = size
+        self.refs = 0
+
+
+class TextureRegistry(object):
+    """
+    loads each resource once, keyed by path and region, and hands out
+    counted handles. Entries nobody holds stay cached and are evicted
+    least recently used first when the registry grows past its budget
+    """
+
+    def __init__(self, budget: int = DEFAULT_BUDGET) -> None:
+        """
+        :param budget: memory budget in bytes for cached entries
+        """
+        self.budget = budget
+        self.memory_used = 0
+        self.entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self.entries
+
+    def acquire(self, key, loader, size: int = None) -> TextureHandle:
+        """
+        handle to the resource for key, calling loader() if it is not loaded
+        :param key: hashable key, such as (path, region)
+        :param loader: builds the resource, returning None on failure
+        :param size: memory in bytes, estimated from the resource if None
+        :return: a handle, or None when the loader fails
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry.refs += 1
+                self.entries.move_to_end(key)
+                return TextureHandle(self, key, entry.value)
+
+        # load outside the lock so different resources load in parallel
+        value = loader()
+        if value is None:
+            return None
+
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = _Entry(value, resource_size(value) if size is None else size)
+                self.entries[key] = entry
+                self.memory_used += entry.size
+            entry.refs += 1
+            self.entries.move_to_end(key)
+            self.evict()
+            return TextureHandle(self, key, entry.value)
+
+    def release(self, key) -> None:
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or entry.refs == 0:
+                logger.warning("release of unreferenced resource: {}".format(key))
+                return
+            entry.refs -= 1
+            if entry.refs == 0:
+                self.evict()
+
+    def refs(self, key) -> int:
+        entry = self.entries.get(key)
+        return 0 if entry is None else entry.refs
+
+    def evict(self, budget: int = None) -> int:
+        """
+        drop unreferenced entries, oldest first, until within budget
+        :param budget: bytes to fit in, the registry budget if None
+        :return: number of entries evicted
+        """
+        if budget is None:
+            budget = self.budget
+        evicted = 0
+        with self._lock:
+            if self.memory_used <= budget:
+                return 0
+            for key in list(self.entries):
+                if self.memory_used <= budget:
+                    break
+                entry = self.entries[key]
+                if entry.refs > 0:
+                    continue
+                del self.entries[key]
+                self.memory_used -= entry.size
+                evicted += 1
+        if evicted:
+            logger.debug("evicted {} textures, {} bytes in use".format(evicted, self.memory_used))
+        return evicted
+
+    def clear(self) -> None:
+        """ drop every unreferenced entry """
+        self.evict(0)
+
+
+_registry = TextureRegistry()
+
+
+def get_texture_registry() -> TextureRegistry:
+    """ the registry shared by the whole process """
+    return _registry
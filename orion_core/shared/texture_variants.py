@@ -0,0 +1,150 @@
+# cached recolored variants of textures
+
+import logging
+import itertools
+from collections import namedtuple
+import numpy as np
+from PIL import Image
+import arcade
+from orion_core.shared import palette
+from orion_core.shared.texture_registry import TextureRegistry, TextureHandle
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VARIANT_BUDGET = 64 * 1024 * 1024
+
+_names = itertools.count()
+
+# transforms are hashable so they can key the cache, palettes compare by
+# identity so keep one Palette object per team or time of day
+
+
+class Tint(namedtuple("Tint", ["rgb", "amount"])):
+    """ multiply by a color, see palette.tint """
+
+    def __new__(cls, rgb, amount: float = 1.0):
+        return super().__new__(cls, tuple(rgb), amount)
+
+    def apply(self, pixels: np.ndarray) -> np.ndarray:
+        return palette.tint(pixels, self.rgb, self.amount)
+
+
+class Blend(namedtuple("Blend", ["rgb", "amount"])):
+    """ mix towards a color, see palette.blend """
+
+    def __new__(cls, rgb, amount: float = 0.5):
+        return super().__new__(cls, tuple(rgb), amount)
+
+    def apply(self, pixels: np.ndarray) -> np.ndarray:
+        return palette.blend(pixels, self.rgb, self.amount)
+
+
+class Remap(namedtuple("Remap", ["source", "target"])):
+    """ palette swap, see palette.remap """
+
+    def apply(self, pixels: np.ndarray) -> np.ndarray:
+        return palette.remap(pixels, self.source, self.target)
+
+
+class Custom(namedtuple("Custom", ["key", "function"])):
+    """
+    any function taking and returning an RGBA pixel array, cached by key
+    alone, so a new lambda with the same key still hits the cache
+    """
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Custom) and self.key == other.key
+
+    def __ne__(self, other) -> bool:
+        return not self == other
+
+    def __hash__(self) -> int:
+        return hash(("Custom", self.key))
+
+    def apply(self, pixels: np.ndarray) -> np.ndarray:
+        return self.function(pixels)
+
+
+class Quantize(namedtuple("Quantize", ["palette", "exact"])):
+    """ snap to the nearest palette colors, see Palette.quantize """
+
+    def __new__(cls, table, exact: bool = False):
+        return super().__new__(cls, table, exact)
+
+    def apply(self, pixels: np.ndarray) -> np.ndarray:
+        return self.palette.quantize(pixels, self.exact)
+
+
+def source_pixels(source) -> np.ndarray:
+    """ RGBA pixels of a TextureRegion or an arcade.Texture """
+    pixels = getattr(source, "pixels", None)
+    if callable(pixels):
+        return pixels()
+    return np.asarray(source.image.convert("RGBA"))
+
+
+def check_transform(transform) -> None:
+    """
+    raise TypeError for transforms that cannot key the cache, a bare
+    function is a new object each time a lambda is written, so it would
+    never be found again, wrap it in Custom with a key instead
+    """
+    if not isinstance(transform, (Tint, Blend, Remap, Quantize, Custom)):
+        raise TypeError("transform must be Tint, Blend, Remap, Quantize or Custom, not {}".format(
+            type(transform).__name__))
+
+
+class TextureVariants(object):
+    """
+    recolored textures built on first use and shared by every sprite that
+    asks for the same source and transform. Variants nobody holds a handle
+    to are evicted least recently used first once past the memory budget
+    """
+
+    def __init__(self, budget: int = DEFAULT_VARIANT_BUDGET) -> None:
+        """
+        :param budget: memory budget in bytes for cached variants
+        """
+        self.registry = TextureRegistry(budget)
+
+    def __len__(self) -> int:
+        return len(self.registry)
+
+    def __contains__(self, key) -> bool:
+        return key in self.registry
+
+    @staticmethod
+    def key(source, transform) -> tuple:
+        # region names carry their atlas id and arcade treats textures of
+        # the same name as one texture, so the name identifies the pixels
+        return source.name, transform
+
+    def acquire(self, source, transform) -> TextureHandle:
+        """
+        handle to the variant, it stays cached while any handle to it is
+        held, release the handle once no sprite draws with it
+        :param source: TextureRegion or arcade.Texture
+        :param transform: Tint, Blend, Remap, Quantize or Custom
+        """
+        check_transform(transform)
+        key = self.key(source, transform)
+        return self.registry.acquire(key, lambda: self._build(source, transform))
+
+    @staticmethod
+    def _build(source, transform) -> arcade.Texture:
+        pixels = transform.apply(source_pixels(source))
+        # arcade keys textures by name, so every variant gets its own
+        name = "{}|variant{}".format(source.name, next(_names))
+        return arcade.Texture(name, Image.fromarray(np.ascontiguousarray(pixels), "RGBA"))
+
+    def clear(self) -> None:
+        """ drop every variant nobody holds """
+        self.registry.clear()
+
+
+_variants = TextureVariants()
+
+
+def get_texture_variants() -> TextureVariants:
+    """ the variant cache shared by the whole process """
+    return _variants
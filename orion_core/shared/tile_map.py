@@ -1,17 +1,16 @@
 # tile map generation
 
 import logging
-import arcade
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+TILE_DTYPE = np.int16
 
-class TileMap(object):
 
-    map_string = ""
-    texture_map = {}
+class TileMap(object):
 
-    def __init__(self, width, height, tile_size):
+    def __init__(self, width, height, tile_size, chunk_size=16):
         self.width = width * tile_size
         self.height = height * tile_size
         self.tile_width = width
@@ -19,28 +18,150 @@ class TileMap(object):
         self.tile_size = tile_size
         self.tile_offset_x = self.tile_size // 2
         self.tile_offset_y = self.tile_size // 2
-        self.map_sprite_tiles = arcade.SpriteList()
+        self.texture_map = {}
+
+        # the map is split into square chunks of tiles, each with its own
+        # sprite list, so drawing only touches the chunks on screen
+        self.chunk_size = chunk_size
+        self.chunk_width = -(-width // chunk_size)
+        self.chunk_height = -(-height // chunk_size)
+        self.chunks = {}
+
+        # the level is held as a grid of tile ids indexed [tile_y, tile_x],
+        # tile_chars maps an id back to the character used in map strings
+        self.grid = np.zeros((height, width), dtype=TILE_DTYPE)
+        self.tile_chars = []
+        self.tile_ids = {}
+        self.solid_tiles = set()
+        self._solid_lookup = np.zeros(0, dtype=bool)
 
     def load_texture_map(self, textures: dict) -> None:
         self.texture_map = textures
-
-    def parse_map_string(self, map_string) -> None:
-        self.map_string = map_string
-
-        for y in range(self.tile_height):
-            for x in range(self.tile_width):
-                c = map_string[y * self.tile_width + x]
+        for c in textures:
+            self.tile_id(c)
+
+    def tile_id(self, c: str) -> int:
+        """
+        id of a tile character, registering it if it is new
+        :param c:
+        """
+        tile_id = self.tile_ids.get(c)
+        if tile_id is None:
+            tile_id = len(self.tile_chars)
+            self.tile_chars.append(c)
+            self.tile_ids[c] = tile_id
+        return tile_id
+
+    def tile_char(self, tile_id: int) -> str:
+        return self.tile_chars[tile_id]
+
+    def set_solid_tiles(self, chars) -> None:
+        """
+        set which tile characters block movement
+        :param chars: iterable of tile characters
+        """
+        self.solid_tiles = set(chars)
+        for c in self.solid_tiles:
+            self.tile_id(c)
+        self._solid_lookup = np.zeros(0, dtype=bool)
+
+    def solid_lookup(self) -> np.ndarray:
+        """ boolean array indexed by tile id, true for solid tiles """
+        if self._solid_lookup.size != len(self.tile_chars):
+            self._solid_lookup = np.array([c in self.solid_tiles for c in self.tile_chars], dtype=bool)
+        return self._solid_lookup
+
+    @property
+    def map_string(self) -> str:
+        """ the level as a string, one character per tile """
+        if not self.tile_chars:
+            return ""
+        chars = np.array(self.tile_chars)
+        return "".join(chars[self.grid.ravel()])
+
+    def parse_map_string(self, map_string, build_chunks: bool = True) -> None:
+        """
+        fill the grid from a map string, one character per tile
+        :param map_string:
+        :param build_chunks: also build the tile sprites, see build_chunks
+        """
+        count = self.tile_width * self.tile_height
+        codes = np.frombuffer(map_string[:count].encode("utf-32-le"), dtype=np.uint32)
+        if codes.size < count:
+            raise ValueError("map string has {} tiles, expected {}".format(codes.size, count))
+
+        # translate each distinct character once, then the whole grid at once
+        unique_codes, inverse = np.unique(codes, return_inverse=True)
+        lookup = np.array([self.tile_id(chr(code)) for code in unique_codes], dtype=TILE_DTYPE)
+        self.grid = lookup[inverse].reshape(self.tile_height, self.tile_width)
+
+        self.chunks = {}
+        if build_chunks:
+            self.build_chunks()
+
+    def build_chunks(self) -> None:
+        """
+        build the sprite list chunks of the textured tiles from the grid.
+        Sprite lists create GL buffers, so with a window open call this on
+        the thread that owns its context
+        """
+        self.chunks = {}
+        if not self.texture_map:
+            return
+
+        # arcade is only imported once there are sprites to draw
+        import arcade
+        for c, texture in self.texture_map.items():
+            for y, x in np.argwhere(self.grid == self.tile_ids[c]).tolist():
                 sprite = arcade.Sprite()
-                if c not in self.texture_map:
-                    continue
-                sprite.append_texture(self.texture_map[c])
+                sprite.append_texture(texture)
                 sprite.set_texture(0)
                 sprite.center_x = self.tile_size * x + self.tile_offset_x
                 sprite.center_y = self.height - self.tile_size * y - self.tile_offset_y
-                self.map_sprite_tiles.append(sprite)
-
-    def draw(self) -> None:
-        self.map_sprite_tiles.draw()
+                self.get_chunk(x // self.chunk_size, y // self.chunk_size).append(sprite)
+
+    def get_chunk(self, chunk_x: int, chunk_y: int) -> "arcade.SpriteList":
+        chunk = self.chunks.get((chunk_x, chunk_y))
+        if chunk is None:
+            import arcade
+            chunk = arcade.SpriteList(use_spatial_hash=False, is_static=True)
+            self.chunks[(chunk_x, chunk_y)] = chunk
+        return chunk
+
+    def visible_chunks(self, left: int, right: int, bottom: int, top: int) -> list:
+        """
+        chunks that intersect the camera rectangle, in world coordinates
+        :param left:
+        :param right:
+        :param bottom:
+        :param top:
+        """
+        chunk_world = self.chunk_size * self.tile_size
+        first_x = max(int(left // chunk_world), 0)
+        last_x = min(int((right - 1) // chunk_world), self.chunk_width - 1)
+        # tile rows count down from the top of the map
+        first_y = max(int((self.height - top) // chunk_world), 0)
+        last_y = min(int((self.height - bottom - 1) // chunk_world), self.chunk_height - 1)
+
+        visible = []
+        for chunk_y in range(first_y, last_y + 1):
+            for chunk_x in range(first_x, last_x + 1):
+                chunk = self.chunks.get((chunk_x, chunk_y))
+                if chunk is not None:
+                    visible.append(chunk)
+        return visible
+
+    def draw(self, left: int = None, right: int = None, bottom: int = None, top: int = None) -> None:
+        """
+        draw the chunks inside the camera rectangle, or the whole map
+        when no rectangle is given
+        """
+        if left is None:
+            chunks = self.chunks.values()
+        else:
+            chunks = self.visible_chunks(left, right, bottom, top)
+        for chunk in chunks:
+            chunk.draw()
 
     def tile_to_world(self, tile_x: int, tile_y: int) -> (int, int):
         world_x = self.tile_size * tile_x + self.tile_offset_x
@@ -52,8 +173,47 @@ class TileMap(object):
         tile_y = (self.height - world_y) // self.tile_size
         return tile_x, tile_y
 
+    def world_to_tiles(self, world_x, world_y) -> (np.ndarray, np.ndarray):
+        """
+        world_to_tile for arrays of points
+        :param world_x: array of world x coordinates
+        :param world_y: array of world y coordinates
+        """
+        tile_x = np.floor_divide(world_x, self.tile_size).astype(np.intp)
+        tile_y = np.floor_divide(self.height - np.asarray(world_y), self.tile_size).astype(np.intp)
+        return tile_x, tile_y
+
+    def get_tile_ids(self, world_x, world_y) -> np.ndarray:
+        """
+        tile ids under each world point, -1 for points off the map
+        :param world_x: array of world x coordinates
+        :param world_y: array of world y coordinates
+        """
+        tile_x, tile_y = self.world_to_tiles(world_x, world_y)
+        inside = (tile_x >= 0) & (tile_x < self.tile_width) & (tile_y >= 0) & (tile_y < self.tile_height)
+        ids = np.full(tile_x.shape, -1, dtype=TILE_DTYPE)
+        ids[inside] = self.grid[tile_y[inside], tile_x[inside]]
+        return ids
+
+    def get_solid(self, world_x, world_y) -> np.ndarray:
+        """
+        true for each world point over a solid tile, points off the map
+        count as solid
+        :param world_x: array of world x coordinates
+        :param world_y: array of world y coordinates
+        """
+        ids = self.get_tile_ids(world_x, world_y)
+        lookup = self.solid_lookup()
+        inside = ids >= 0
+        solid = np.ones(ids.shape, dtype=bool)
+        solid[inside] = lookup[ids[inside]]
+        return solid
+
+    def get_tile_id(self, tile_x: int, tile_y: int) -> int:
+        return int(self.grid[int(tile_y), int(tile_x)])
+
     def get_tile_type(self, tile_x: int, tile_y: int) -> str:
-        return self.map_string[int(tile_y) * self.tile_width + int(tile_x)]
+        return self.tile_chars[self.grid[int(tile_y), int(tile_x)]]
 
     def get_tile(self, world_x: int, world_y: int) -> str:
         tile_x, tile_y = self.world_to_tile(world_x, world_y)
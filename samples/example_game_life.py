@@ -2,7 +2,6 @@
 import logging
 import orion_core
 import arcade
-import random
 
 logging.basicConfig(format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
                     level=logging.DEBUG, datefmt="%H:%M:%S")
@@ -29,74 +28,29 @@ class Window(orion_core.Window):
         self.sim_active = False
 
         logger.debug("setting the fields, width:{}, Height:{}".format(CELLS_WIDTH, CELLS_HEIGHT))
-        self.active_field = [0] * (CELLS_WIDTH * CELLS_HEIGHT)
-        self.change_field = [0] * (CELLS_WIDTH * CELLS_HEIGHT)
+        self.life = orion_core.CellularAutomaton(CELLS_WIDTH, CELLS_HEIGHT, "B3/S23")
 
-        self.sprites = arcade.SpriteList()
         cell_light = arcade.make_soft_square_texture(CELL_SIZE, orion_core.color.DARK_YELLOW, 255, 30)
-
-        for y in range(CELLS_HEIGHT):
-            for x in range(CELLS_WIDTH):
-                sprite = arcade.Sprite()
-                sprite.append_texture(cell_light)
-                sprite.set_texture(0)
-                sprite.center_x = CELL_SIZE * x + CELL_SIZE // 2
-                sprite.center_y = SCREEN_HEIGHT - CELL_SIZE * y - CELL_SIZE // 2
-                self.sprites.append(sprite)
+        self.renderer = orion_core.GridRenderer(CELLS_WIDTH, CELLS_HEIGHT, CELL_SIZE, cell_light,
+                                                top=SCREEN_HEIGHT)
+        self.stats = orion_core.TextPanel(anchor_x="right")
 
     def on_draw_frame(self) -> None:
 
-        for x in range(1, CELLS_WIDTH - 1):
-            for y in range(1, CELLS_HEIGHT - 1):
-                i = y * CELLS_WIDTH + x
-                if self.change_field[i] == 1:
-                    self.sprites[i].draw()
-
-        out = ""
-        out += "cell count {} \n".format(CELLS_WIDTH * CELLS_HEIGHT)
-        out += "selected cell {}, {} \n".format(self.selected_x, self.selected_y)
-        if self.sim_active:
-            out += "sim active \n"
-        else:
-            out += "sim paused \n"
-
-        line_height = 14
-        padding = 20
-        line_y = self.height - padding - line_height
-        for line in out.split("\n"):
-            if not line:
-                continue
-            arcade.draw_text(text=line,
-                             start_x=self.width - padding, start_y=line_y,
-                             color=orion_core.color.LIGHT_GRAY, font_size=10,
-                             anchor_x="right", anchor_y="bottom")
-            line_y -= line_height
+        self.renderer.update(self.life.cells)
+        self.renderer.draw()
+
+        self.stats.set("cells", "cell count {}".format(CELLS_WIDTH * CELLS_HEIGHT))
+        self.stats.set("selected", "selected cell {}, {}".format(self.selected_x, self.selected_y))
+        self.stats.set("sim", "sim active" if self.sim_active else "sim paused")
+        self.stats.draw(self.width - 20, self.height - 20)
 
     def on_update_frame(self, delta_time: float) -> None:
 
         if not self.sim_active:
             return
 
-        def cell(xc: int, yc: int) -> int:
-            return self.active_field[yc * CELLS_WIDTH + xc]
-
-        for i in range(CELLS_WIDTH * CELLS_HEIGHT):
-            self.active_field[i] = self.change_field[i]
-
-        for x in range(1, CELLS_WIDTH - 1):
-            for y in range(1, CELLS_HEIGHT - 1):
-                neighbours = cell(x - 1, y - 1) + cell(x - 0, y - 1) + cell(x + 1, y - 1) + \
-                             cell(x - 1, y + 0) + 0 + cell(x + 1, y + 0) + \
-                             cell(x - 1, y + 1) + cell(x + 0, y + 1) + cell(x + 1, y + 1)
-
-                i = y * CELLS_WIDTH + x
-                if cell(x, y) == 1:
-                    if neighbours == 2 or neighbours == 3:
-                        self.change_field[i] = 1
-                    else:
-                        self.change_field[i] = 0
-                elif neighbours == 3:
-                    self.change_field[i] = 1
+        self.life.step()
 
     def on_key_press(self, key: int, key_modifiers: int) -> None:
         super().on_key_press(key, key_modifiers)
@@ -126,18 +80,13 @@ class Window(orion_core.Window):
         super().on_mouse_press(x, y, button, key_modifiers)
 
         if button == orion_core.MOUSE_BUTTON_LEFT:
-            self.change_field[self.selected_y * CELLS_WIDTH + self.selected_x] = 1
+            self.life.cells[self.selected_y, self.selected_x] = 1
 
     def board_clear(self) -> None:
-        for x in range(1, CELLS_WIDTH - 1):
-            for y in range(1, CELLS_HEIGHT - 1):
-                i = y * CELLS_WIDTH + x
-                self.change_field[i] = 0
+        self.life.clear()
 
     def board_random(self) -> None:
-        for x in range(1, CELLS_WIDTH - 1):
-            for y in range(1, CELLS_HEIGHT - 1):
-                self.change_field[y * CELLS_WIDTH + x] = random.randint(0, 1)
+        self.life.randomize()
 
     def board_gun(self) -> None:
         self.set( 5,  5, "........................#............")
@@ -154,11 +103,7 @@ class Window(orion_core.Window):
         self.set(20, 20, "########.#####...###......#######.#####")
 
     def set(self, x: int, y: int, string: str) -> None:
-        i = 0
-        for v in string:
-            if v == "#":
-                self.change_field[y * CELLS_WIDTH + (x + i)] = 1
-            i += 1
+        self.life.set_pattern(x, y, string)
 
 
 if __name__ == '__main__':
@@ -61,7 +61,10 @@ class Window(orion_core.Window):
         self.change_x = 0
         self.change_y = 0
         self.debug_color = orion_core.color.WARM_BLACK
-        self.spritesheet = orion_core.Spritesheet(SPRITESHEET, TILE_SIZE)
+        self.spritesheet = orion_core.Spritesheet(SPRITESHEET, TILE_SIZE, lazy=True)
+
+        # run the physics at a fixed rate so long frames do not change it
+        self.set_fixed_step(True, tick_rate=60)
 
     def init(self):
         """ generate the map from the level string and create a player object """
@@ -93,6 +96,7 @@ class Window(orion_core.Window):
         self.map = orion_core.TileMap(64, 16, TILE_SIZE)
         self.map.load_texture_map(textures)
         self.map.parse_map_string(level)
+        self.map.set_solid_tiles("#BG")
         logger.debug("map generated")
 
         player_x, player_y = self.map.tile_to_world(32, 7)
@@ -102,10 +106,10 @@ class Window(orion_core.Window):
             ]
         self.player = Player(player_x, player_y, TILE_SIZE, player_textures)
 
-    def on_draw_frame(self) -> None:
+    def on_draw_frame(self, alpha: float = 1.0) -> None:
         """ frame rendering details """
 
-        self.map.draw()
+        self.map.draw(*self.camera_view)
         self.player.draw()
 
         for _ in range(len(self.debug_points)):
@@ -143,52 +147,19 @@ class Window(orion_core.Window):
         if self.player.vel_y < -400.0:
             self.player.vel_y = -400.0
 
-        # get the new position
-        new_pos_x = player.pos_x + player.vel_x * delta_time
-        new_pos_y = player.pos_y + player.vel_y * delta_time
-
-        # check for collisions
-        if player.vel_x <= 0:  # moving left
-            x1 = new_pos_x - player.offset_x
-            y1 = new_pos_y - player.offset_y * 0.9
-            x2 = new_pos_x - player.offset_x
-            y2 = new_pos_y + player.offset_y * 0.9
-            if cur_map.get_tile(x1, y1) != '.' or cur_map.get_tile(x2, y2) != '.':
-                new_pos_x = int(player.pos_x)
-                player.vel_x = 0
-
-        else:  # moving right
-            x1 = new_pos_x + player.offset_x
-            y1 = new_pos_y - player.offset_y * 0.9
-            x2 = new_pos_x + player.offset_x
-            y2 = new_pos_y + player.offset_y * 0.9
-            if cur_map.get_tile(x1, y1) != '.' or cur_map.get_tile(x2, y2) != '.':
-                new_pos_x = int(player.pos_x)
-                player.vel_x = 0
-
-        player.on_ground = False
-        if player.vel_y <= 0:  # moving down
-            x1 = new_pos_x + player.offset_x * 0.9
-            y1 = new_pos_y - player.offset_y
-            x2 = new_pos_x - player.offset_x * 0.9
-            y2 = new_pos_y - player.offset_y
-            if cur_map.get_tile(x1, y1) != '.' or cur_map.get_tile(x2, y2) != '.':
-                new_pos_y = int(player.pos_y)
-                player.vel_y = 0
-                player.on_ground = True
-
-        else:  # moving up
-            x1 = new_pos_x - player.offset_x * 0.9
-            y1 = new_pos_y + player.offset_y
-            x2 = new_pos_x + player.offset_x * 0.9
-            y2 = new_pos_y + player.offset_y
-            if cur_map.get_tile(x1, y1) != '.' or cur_map.get_tile(x2, y2) != '.':
-                new_pos_y = int(player.pos_y)
-                player.vel_y = 0
+        # move through the map, stopping at solid tiles
+        sweep = orion_core.collision.move_box(cur_map, player.pos_x, player.pos_y,
+                                              player.offset_x * 0.9, player.offset_y,
+                                              player.vel_x * delta_time, player.vel_y * delta_time)
+        if sweep.normal_x != 0:
+            player.vel_x = 0
+        if sweep.normal_y != 0:
+            player.vel_y = 0
+        player.on_ground = sweep.normal_y > 0
 
         # Apply movement to the character
-        player.pos_x = new_pos_x
-        player.pos_y = new_pos_y
+        player.pos_x = sweep.x
+        player.pos_y = sweep.y
 
         # check that the character is still on the map
         if player.pos_x < cur_map.tile_offset_x:
@@ -19,5 +19,5 @@ setup(
     author_email='karnott@jenovarain.com',
     url='https://github.com/nightred',
     license=license,
-    packages=find_packages(exclude=('tests', 'docs', 'sample'))
+    packages=find_packages(exclude=('tests', 'docs', 'sample', 'benchmarks'))
 )
@@ -0,0 +1,35 @@
+# helpers shared by the tests
+
+from .context import orion_core
+from PIL import Image
+
+
+class StubWindow(orion_core.Window):
+    """ headless window that records the updates, key presses and actions it sees """
+
+    @classmethod
+    def headless(cls, width: int = 800, height: int = 600):
+        window = super().headless(width, height)
+        window.updates = []
+        window.presses = []
+        window.actions = []
+        return window
+
+    def on_update_frame(self, delta_time: float) -> None:
+        self.updates.append(delta_time)
+
+    def on_key_press(self, key, key_modifiers):
+        super().on_key_press(key, key_modifiers)
+        self.presses.append(key)
+
+    def on_action(self, event) -> None:
+        self.actions.append((event.type, event.action))
+
+
+def make_sheet_file(path: str, tiles_wide: int, tiles_tall: int, tile_size: int) -> None:
+    image = Image.new("RGBA", (tiles_wide * tile_size, tiles_tall * tile_size))
+    for y in range(tiles_tall):
+        for x in range(tiles_wide):
+            color = (x * 40 % 256, y * 40 % 256, 100, 255)
+            image.paste(color, (x * tile_size, y * tile_size, (x + 1) * tile_size, (y + 1) * tile_size))
+    image.save(path)
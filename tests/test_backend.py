@@ -0,0 +1,95 @@
+
+from .context import orion_core
+import time
+import unittest
+from orion_core import backend
+
+
+class BackendTestSuite(unittest.TestCase):
+    """ Simulation backend test cases """
+
+    def test_step_runs_systems(self):
+        sim = backend.Simulation(tick_rate=50)
+
+        def counter(state, delta_time):
+            state["count"] = state.get("count", 0) + 1
+            state["time"] = state.get("time", 0.0) + delta_time
+
+        sim.add_system(counter)
+        sim.step(10)
+
+        snapshot = sim.snapshot()
+        self.assertEqual(snapshot.tick, 10)
+        self.assertEqual(snapshot.get("count"), 10)
+        self.assertAlmostEqual(snapshot.get("time"), 0.2)
+
+    def test_snapshot_is_not_mutated(self):
+        sim = backend.Simulation()
+
+        def append(state, delta_time):
+            state.setdefault("items", []).append(delta_time)
+
+        sim.add_system(append)
+        sim.step()
+        snapshot = sim.snapshot()
+        sim.step()
+        self.assertEqual(len(snapshot.get("items")), 1)
+        self.assertEqual(len(sim.snapshot().get("items")), 2)
+
+    def test_copy_state(self):
+        copies = []
+
+        def shallow(state):
+            copies.append(state)
+            return dict(state)
+
+        sim = backend.Simulation(copy_state=shallow)
+        sim.add_system(lambda state, delta_time: state.update(tick=state.get("tick", 0) + 1))
+        sim.step(2)
+        sim.step()
+        self.assertIs(sim.buffer.copy_state, shallow)
+        # nothing is copied until a snapshot is read, then once per publish
+        self.assertEqual(copies, [])
+        self.assertEqual(sim.snapshot().get("tick"), 3)
+        self.assertIs(sim.snapshot(), sim.snapshot())
+        self.assertEqual(len(copies), 1)
+
+    def test_thread_ticks(self):
+        sim = backend.Simulation(tick_rate=200)
+        sim.add_system(lambda state, delta_time: None)
+        sim.start()
+        time.sleep(0.1)
+        sim.stop()
+        self.assertFalse(sim.running)
+        self.assertGreater(sim.snapshot().tick, 0)
+
+    def test_failing_system_stops(self):
+        sim = backend.Simulation(tick_rate=200)
+
+        def fail(state, delta_time):
+            raise ValueError("broken system")
+
+        sim.add_system(fail)
+        with self.assertLogs("orion_core.backend.base_backend", "ERROR"):
+            sim.start()
+            sim._thread.join(1.0)
+        self.assertFalse(sim.running)
+        self.assertIsInstance(sim.error, ValueError)
+        with self.assertLogs("orion_core.backend.base_backend", "ERROR"):
+            self.assertRaises(ValueError, sim.run)
+        sim.stop()
+
+    def test_init_again_stops_the_old_simulation(self):
+        first = orion_core.init(tick_rate=200)
+        second = orion_core.init(tick_rate=200)
+        try:
+            self.assertIsNot(first, second)
+            self.assertFalse(first.running)
+            self.assertTrue(second.running)
+            self.assertIs(orion_core.get_simulation(), second)
+        finally:
+            second.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+
+from .context import orion_core
+import unittest
+from benchmarks import harness
+
+
+def results(calibration: float, **timings) -> dict:
+    return {"calibration": calibration,
+            "benchmarks": dict((name, {"seconds": seconds, "number": 1}) for name, seconds in timings.items())}
+
+
+class BenchmarkHarnessTestSuite(unittest.TestCase):
+    """ Benchmark harness test cases """
+
+    def test_compare(self):
+        baseline = results(1.0, fast=1.0, slow=1.0)
+        lines, regressions = harness.compare(results(1.0, fast=1.1, slow=1.5, new=2.0), baseline, 0.25)
+        self.assertEqual(regressions, ["slow"])
+        self.assertIn("REGRESSION", [line for line in lines if line.startswith("slow")][0])
+        self.assertIn("new", [line for line in lines if line.startswith("new")][0])
+
+    def test_compare_scales_for_machine(self):
+        baseline = results(1.0, slow=1.0)
+        # everything twice as slow on a machine half the speed is fine
+        self.assertEqual(harness.compare(results(2.0, slow=2.0), baseline)[1], [])
+        self.assertEqual(harness.compare(results(1.0, slow=2.0), baseline)[1], ["slow"])
+
+    def test_compare_allows_for_noise(self):
+        baseline = results(1.0, noisy=1.0, tiny=1e-6)
+        current = results(1.0, noisy=1.4, tiny=2e-6)
+        self.assertEqual(harness.compare(current, baseline)[1], ["noisy"])
+        # batches that varied by 20% widen the tolerance by as much
+        current["benchmarks"]["noisy"]["spread"] = 0.2
+        self.assertEqual(harness.compare(current, baseline)[1], [])
+
+    def test_compare_scales_by_benchmark_calibration(self):
+        baseline = results(1.0, slow=1.0)
+        baseline["benchmarks"]["slow"]["calibration"] = 1.0
+        current = results(1.0, slow=1.8)
+        # the machine was busy while this benchmark ran
+        current["benchmarks"]["slow"]["calibration"] = 2.0
+        self.assertEqual(harness.compare(current, baseline)[1], [])
+
+    def test_merge_keeps_fastest(self):
+        merged = harness.merge_results(results(2.0, a=1.0, b=3.0), results(1.5, b=2.0))
+        self.assertEqual(merged["benchmarks"]["a"]["seconds"], 1.0)
+        self.assertEqual(merged["benchmarks"]["b"]["seconds"], 2.0)
+        self.assertEqual(merged["calibration"], 1.5)
+
+    def test_measure(self):
+        seconds, number = harness.measure(lambda: None, repeat=2, min_time=0.001)
+        self.assertGreater(number, 1)
+        self.assertGreater(seconds, 0.0)
+
+    def test_sample(self):
+        timing = harness.sample(lambda: None, repeat=3, min_time=0.001)
+        self.assertGreater(timing["number"], 1)
+        self.assertGreater(timing["calibration"], 0.0)
+        self.assertGreaterEqual(timing["spread"], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
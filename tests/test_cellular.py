@@ -0,0 +1,92 @@
+
+from .context import orion_core
+import unittest
+import numpy as np
+from orion_core.shared.cellular import parse_rule
+
+
+def reference_step(cells: np.ndarray, birth: tuple, survive: tuple, wrap: bool) -> np.ndarray:
+    """ cell by cell implementation to check the engine against """
+    height, width = cells.shape
+    result = np.zeros_like(cells)
+    for y in range(height):
+        for x in range(width):
+            count = 0
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    if dx == 0 and dy == 0:
+                        continue
+                    ny, nx = y + dy, x + dx
+                    if wrap:
+                        count += cells[ny % height, nx % width]
+                    elif 0 <= ny < height and 0 <= nx < width:
+                        count += cells[ny, nx]
+            rule = survive if cells[y, x] else birth
+            result[y, x] = 1 if count in rule else 0
+    return result
+
+
+class CellularTestSuite(unittest.TestCase):
+    """ Cellular automaton test cases """
+
+    def test_parse_rule(self):
+        self.assertEqual(parse_rule("B3/S23"), ((3,), (2, 3)))
+        self.assertEqual(parse_rule("b36/s"), ((3, 6), ()))
+        with self.assertRaises(ValueError):
+            parse_rule("B9/S2")
+
+    def test_blinker(self):
+        life = orion_core.CellularAutomaton(5, 5)
+        life.set_pattern(1, 2, "###")
+        life.step()
+        self.assertEqual(life.cells[:, 2].tolist(), [0, 1, 1, 1, 0])
+        life.step()
+        self.assertEqual(life.cells[2].tolist(), [0, 1, 1, 1, 0])
+        self.assertEqual(life.generation, 2)
+
+    def test_matches_reference(self):
+        for edges, wrap in (("dead", False), ("wrap", True)):
+            for rule in ("B3/S23", "B36/S23", "B5678/S45678"):
+                life = orion_core.CellularAutomaton(17, 11, rule, edges)
+                life.randomize(0.4, seed=7)
+                expected = life.cells.copy()
+                for _ in range(4):
+                    expected = reference_step(expected, life.birth, life.survive, wrap)
+                life.step(4)
+                self.assertTrue(np.array_equal(life.cells, expected), "{} {}".format(rule, edges))
+
+    def test_clamp_edges(self):
+        life = orion_core.CellularAutomaton(4, 4, "B3/S23", "clamp")
+        life.cells[0, :] = 1
+        counts = life.neighbours()
+        # a corner cell sees its repeated edge neighbours as well
+        self.assertEqual(counts[0, 0], 5)
+        self.assertEqual(counts[1, 1], 3)
+
+    def test_bit_packed_matches_dense(self):
+        for width, height in ((64, 10), (130, 70), (7, 5)):
+            for edges in ("dead", "wrap", "clamp"):
+                for sparse in (False, True):
+                    dense = orion_core.CellularAutomaton(width, height, "B36/S23", edges)
+                    dense.randomize(0.3, seed=width + height)
+                    packed = orion_core.BitPackedAutomaton(width, height, "B36/S23", edges, sparse)
+                    packed.load(dense.cells)
+                    dense.step(6)
+                    packed.step(6)
+                    self.assertTrue(np.array_equal(packed.cells, dense.cells),
+                                    "{}x{} {} sparse={}".format(width, height, edges, sparse))
+                    self.assertEqual(packed.population, dense.population)
+
+    def test_bit_packed_sparse_glider(self):
+        life = orion_core.BitPackedAutomaton(300, 300, sparse=True)
+        life.set_pattern(60, 60, ".#.\n..#\n###")
+        for _ in range(8):
+            life.step(4)
+        self.assertEqual(life.population, 5)
+        # the glider moves one cell down and right every four generations
+        self.assertEqual(life.get_cell(69, 70), 1)
+        self.assertEqual(life.get_cell(61, 60), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
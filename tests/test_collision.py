@@ -0,0 +1,72 @@
+
+from .context import orion_core
+import unittest
+import numpy as np
+from orion_core.shared import collision
+
+LEVEL = (
+    "#........#"
+    "#........#"
+    "#...##...#"
+    "#........#"
+    "##########"
+)
+
+
+def make_map() -> orion_core.TileMap:
+    tile_map = orion_core.TileMap(10, 5, 10)
+    tile_map.parse_map_string(LEVEL)
+    tile_map.set_solid_tiles("#")
+    return tile_map
+
+
+class CollisionTestSuite(unittest.TestCase):
+    """ Swept box collision test cases """
+
+    def test_free_move(self):
+        tile_map = make_map()
+        sweep = collision.move_box(tile_map, 25, 15, 4, 4, 3, 2)
+        self.assertEqual((sweep.x, sweep.y), (28, 17))
+        self.assertEqual((sweep.normal_x, sweep.normal_y), (0, 0))
+        self.assertEqual((sweep.time_x, sweep.time_y), (1.0, 1.0))
+
+    def test_land_on_floor(self):
+        tile_map = make_map()
+        # floor top is at y = 10, box bottom starts at y = 16
+        sweep = collision.move_box(tile_map, 25, 20, 4, 4, 0, -12)
+        self.assertAlmostEqual(sweep.y, 14)
+        self.assertEqual(sweep.normal_y, 1)
+        self.assertAlmostEqual(sweep.time_y, 0.5)
+
+    def test_no_tunnelling(self):
+        tile_map = make_map()
+        # fast enough to skip the whole map in one step
+        sweep = collision.move_box(tile_map, 25, 15, 4, 4, 500, 0)
+        self.assertAlmostEqual(sweep.x, 86)
+        self.assertEqual(sweep.normal_x, -1)
+
+    def test_resting_contact(self):
+        tile_map = make_map()
+        sweep = collision.move_box(tile_map, 25, 14, 4, 4, 0, -1)
+        self.assertAlmostEqual(sweep.y, 14)
+        self.assertEqual(sweep.time_y, 0.0)
+        # sliding along the floor is not blocked by it
+        sweep = collision.move_box(tile_map, 25, 14, 4, 4, 5, 0)
+        self.assertAlmostEqual(sweep.x, 30)
+
+    def test_batch_matches_single(self):
+        tile_map = make_map()
+        rng = np.random.RandomState(1)
+        x = rng.uniform(15, 85, 50)
+        y = rng.uniform(15, 25, 50)
+        delta_x = rng.uniform(-40, 40, 50)
+        delta_y = rng.uniform(-40, 40, 50)
+        batch = collision.move_boxes(tile_map, x, y, 3, 3, delta_x, delta_y)
+        for i in range(50):
+            single = collision.move_box(tile_map, x[i], y[i], 3, 3, delta_x[i], delta_y[i])
+            for name in collision.Sweep._fields:
+                self.assertAlmostEqual(getattr(batch, name)[i], getattr(single, name))
+
+
+if __name__ == '__main__':
+    unittest.main()
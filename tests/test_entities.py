@@ -0,0 +1,101 @@
+
+from .context import orion_core
+import unittest
+import numpy as np
+from orion_core.shared import entities
+
+
+class EntitiesTestSuite(unittest.TestCase):
+    """ Entity component store test cases """
+
+    def test_create_and_query(self):
+        store = orion_core.EntityStore(capacity=2)
+        moving = store.create(position=(0, 0), velocity=(1, 0))
+        still = store.create(position=(5, 5), sprite=3)
+        boxed = store.create(position=(1, 1), velocity=(0, 1), aabb=(2, 2))
+        self.assertEqual(len(store), 3)
+        self.assertGreaterEqual(store.capacity, 3)
+        self.assertEqual(store.query(entities.POSITION | entities.VELOCITY).tolist(), [moving, boxed])
+        self.assertEqual(store.query(entities.SPRITE).tolist(), [still])
+        self.assertEqual(store.sprite[still], 3)
+
+        store.remove(moving, "velocity")
+        self.assertEqual(store.query(entities.VELOCITY).tolist(), [boxed])
+        store.set(moving, velocity=(2, 0))
+        self.assertEqual(store.query(entities.VELOCITY).tolist(), [moving, boxed])
+
+    def test_destroy_reuses_ids(self):
+        store = orion_core.EntityStore()
+        ids = [store.create(position=(i, 0)) for i in range(4)]
+        store.destroy(ids[2])
+        store.destroy(ids[1])
+        self.assertNotIn(ids[1], store)
+        self.assertEqual(store.query(entities.POSITION).tolist(), [0, 3])
+        self.assertEqual(store.create(position=(9, 9)), 1)
+        self.assertEqual(len(store), 3)
+
+    def test_set_checks(self):
+        store = orion_core.EntityStore()
+        entity = store.create(position=(1, 2))
+        self.assertRaises(KeyError, store.set, entity, alive=False)
+        self.assertRaises(KeyError, store.set, entity, velocity=(1, 1), mask=0)
+        self.assertTrue(store.alive[entity])
+        self.assertEqual(store.mask[entity], entities.POSITION)
+        self.assertRaises(KeyError, store.remove, entity, "alive")
+
+        store.destroy(entity)
+        self.assertRaises(KeyError, store.set, entity, velocity=(1, 0))
+        self.assertRaises(KeyError, store.set, 100, velocity=(1, 0))
+        self.assertRaises(KeyError, store.remove, entity, "position")
+        self.assertEqual(store.query(entities.VELOCITY).tolist(), [])
+
+    def test_select(self):
+        store = orion_core.EntityStore()
+        for i in range(4):
+            store.create(position=(i, 0))
+        self.assertEqual(store.select(entities.POSITION), slice(0, 4))
+        store.destroy(1)
+        self.assertEqual(store.select(entities.POSITION).tolist(), [0, 2, 3])
+
+    def test_systems(self):
+        store = orion_core.EntityStore()
+        first = store.create(position=(10, 10), velocity=(60, 0), aabb=(5, 5))
+        store.create(position=(50, 50), sprite=0)
+        gap = store.create(position=(0, 0))
+        store.destroy(gap)
+        last = store.create(position=(90, 50), velocity=(600, 0), aabb=(5, 5))
+        store.add_system(entities.integrate, entities.POSITION | entities.VELOCITY)
+        store.add_system(entities.confine(0, 0, 100, 100), entities.POSITION | entities.AABB)
+        store.update(0.5)
+        self.assertEqual(store.position[first].tolist(), [40, 10])
+        self.assertEqual(store.position[last].tolist(), [95, 50])
+        self.assertEqual(store.position[1].tolist(), [50, 50])
+
+        store.remove_system(entities.integrate)
+        store.update(0.5)
+        self.assertEqual(store.position[first].tolist(), [40, 10])
+
+    def test_collide_tiles(self):
+        tile_map = orion_core.TileMap(4, 4, 10)
+        tile_map.parse_map_string("    " "    " "    " "####")
+        tile_map.set_solid_tiles("#")
+        store = orion_core.EntityStore()
+        falling = store.create(position=(15, 25), velocity=(0, -100), aabb=(4, 4))
+        store.add_system(entities.collide_tiles(tile_map), entities.POSITION | entities.VELOCITY | entities.AABB)
+        store.update(0.5)
+        self.assertAlmostEqual(store.position[falling, 1], 14)
+        self.assertEqual(store.velocity[falling].tolist(), [0, 0])
+
+    def test_many_entities(self):
+        store = orion_core.EntityStore()
+        rng = np.random.default_rng(0)
+        for position in rng.uniform(0, 800, (10000, 2)):
+            store.create(position=position, velocity=(1, 1), aabb=(4, 4))
+        store.add_system(entities.integrate, entities.POSITION | entities.VELOCITY)
+        before = store.position[:10000].copy()
+        store.update(1.0)
+        np.testing.assert_allclose(store.position[:10000], before + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
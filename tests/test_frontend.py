@@ -0,0 +1,140 @@
+
+from .context import orion_core
+import unittest
+import arcade
+import numpy as np
+from PIL import Image
+from .helpers import StubWindow
+
+
+class FrontendTestSuite(unittest.TestCase):
+    """ Frontend window test cases """
+
+    def test_variable_step(self):
+        window = StubWindow.headless()
+        window.on_update(0.03)
+        self.assertEqual(window.updates, [0.03])
+
+    def test_fixed_step_accumulates(self):
+        window = StubWindow.headless()
+        window.set_fixed_step(True, tick_rate=50)
+        window.on_update(0.01)
+        self.assertEqual(window.updates, [])
+        self.assertAlmostEqual(window.alpha, 0.5)
+        window.on_update(0.035)
+        self.assertEqual(window.updates, [0.02, 0.02])
+        self.assertAlmostEqual(window.alpha, 0.25)
+
+    def test_fixed_step_caps_catch_up(self):
+        window = StubWindow.headless()
+        window.set_fixed_step(True, tick_rate=100)
+        window.max_update_steps = 3
+        window.on_update(1.0)
+        self.assertEqual(len(window.updates), 3)
+        self.assertLess(window.update_accumulator, window.update_step)
+
+    def test_key_repeat(self):
+        window = StubWindow.headless()
+        window.input.bind("left", orion_core.key.LEFT)
+        window.on_key_press(orion_core.key.LEFT, 0)
+        window.on_key_press(orion_core.key.RETURN, 0)
+        for _ in range(3):
+            window.on_update(0.1)
+        # held for 0.3s, repeats at 0.2 and 0.25 and 0.3, never for RETURN
+        self.assertEqual(window.presses, [orion_core.key.LEFT, orion_core.key.RETURN] +
+                         [orion_core.key.LEFT] * 3)
+        self.assertEqual(window.actions[0], (0, "left"))
+        self.assertEqual(len(window.actions), 4)
+
+        window.on_key_release(orion_core.key.LEFT, 0)
+        window.on_update(0.5)
+        self.assertEqual(len(window.presses), 5)
+
+    def test_grid_renderer_updates_changed_cells(self):
+        texture = arcade.Texture("test_cell", Image.new("RGBA", (4, 4), (255, 255, 255, 255)))
+        renderer = orion_core.GridRenderer(5, 3, 4, texture, top=12)
+        self.assertEqual(len(renderer.sprites), 0)
+
+        state = np.zeros((3, 5), dtype=np.uint8)
+        state[1, 2] = 1
+        self.assertEqual(renderer.update(state), 1)
+        sprite = renderer.cell_sprites[7]
+        self.assertEqual(list(renderer.sprites), [sprite])
+        self.assertEqual((sprite.center_x, sprite.center_y, sprite.alpha), (10, 6, 255))
+        self.assertEqual(renderer.update(state), 0)
+
+        # the sprite of the cell that died moves to the one born
+        state[1, 2] = 0
+        state[0, 0] = 1
+        self.assertEqual(renderer.update(state), 2)
+        self.assertEqual(list(renderer.cell_sprites), [0])
+        self.assertIs(renderer.cell_sprites[0], sprite)
+        self.assertEqual((sprite.center_x, sprite.center_y), (2, 10))
+        self.assertEqual(len(renderer.sprites), 1)
+
+        # any non zero value is a live cell, not only 1
+        state[0, 0] = 2
+        self.assertEqual(renderer.update(state), 0)
+        state[2, 4] = 7
+        self.assertEqual(renderer.update(state), 1)
+        self.assertEqual(renderer.update(state), 0)
+        self.assertEqual(len(renderer.sprites), 2)
+
+        renderer.update(np.zeros((3, 5), dtype=np.uint8))
+        self.assertEqual(len(renderer.spare), 2)
+        self.assertTrue(all(sprite.alpha == 0 for sprite in renderer.sprites))
+
+    def test_grid_renderer_compacts(self):
+        texture = arcade.Texture("test_cell", Image.new("RGBA", (4, 4), (255, 255, 255, 255)))
+        renderer = orion_core.GridRenderer(64, 64, 4, texture)
+        state = np.ones((64, 64), dtype=np.uint8)
+        renderer.update(state)
+        self.assertEqual(len(renderer.sprites), 64 * 64)
+        state[1:] = 0
+        renderer.update(state)
+        # a mostly empty board only draws its live cells
+        self.assertEqual(len(renderer.sprites), 64)
+        self.assertEqual(renderer.spare, [])
+        self.assertEqual(set(renderer.sprites), set(renderer.cell_sprites.values()))
+
+    def test_text_panel_refresh_rate(self):
+        now = [0.0]
+        panel = orion_core.TextPanel(clock=lambda: now[0])
+        self.assertTrue(panel.set("fps", "FPS: 60", refresh_rate=4))
+        self.assertFalse(panel.set("fps", "FPS: 60"))
+
+        # changes inside the refresh period wait for the line to be due
+        now[0] = 0.1
+        self.assertFalse(panel.set("fps", "FPS: 59"))
+        self.assertEqual(panel.lines["fps"].text, "FPS: 60")
+        now[0] = 0.3
+        self.assertTrue(panel.lines["fps"].commit(now[0]))
+        self.assertEqual(panel.lines["fps"].text, "FPS: 59")
+
+        # lines without a rate re-render on every change
+        panel.set("mouse", "Mouse (0 x 0)")
+        self.assertTrue(panel.set("mouse", "Mouse (1 x 0)"))
+        self.assertEqual(list(panel.lines), ["fps", "mouse"])
+
+    def test_debug_stats_follow_refresh_rate(self):
+        now = [0.0]
+        calls = []
+        window = StubWindow.headless()
+        window.debug_panel = orion_core.TextPanel(clock=lambda: now[0])
+        window.debug_panel.draw = lambda x, top: None
+        window.draw_frame_graph = lambda left, top: None
+        stats = window.profiler.stats
+        window.profiler.stats = lambda: calls.append(now[0]) or stats()
+        window.profiler.start("update")
+        window.profiler.stop("update")
+
+        for frame in range(30):
+            now[0] = frame / 60.0
+            window.draw_debug(600, 0)
+        # 4 refreshes a second over half a second
+        self.assertEqual(len(calls), 2)
+        self.assertIn("profile_update", window.debug_panel.lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+
+from .context import orion_core
+import os
+import sys
+import json
+import subprocess
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# seconds import orion_core may take, it should not load the graphics stack
+IMPORT_BUDGET = 0.25
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import orion_core
+elapsed = time.perf_counter() - start
+loaded = [name for name in ("arcade", "pyglet", "PIL", "numpy") if name in sys.modules]
+orion_core.TileMap, orion_core.collision, orion_core.CellularAutomaton, orion_core.InputState, orion_core.key
+headless = [name for name in ("arcade", "pyglet") if name in sys.modules]
+print(json.dumps({"elapsed": elapsed, "loaded": loaded, "headless": headless}))
+"""
+
+
+def probe() -> dict:
+    output = subprocess.check_output([sys.executable, "-c", PROBE], cwd=ROOT)
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+class ImportTestSuite(unittest.TestCase):
+    """ Package import cost test cases """
+
+    def test_import_budget(self):
+        # best of a few runs, the first may pay for a cold disk cache
+        results = [probe() for _ in range(3)]
+        elapsed = min(result["elapsed"] for result in results)
+        self.assertLess(elapsed, IMPORT_BUDGET, "import orion_core took {:.3f}s".format(elapsed))
+        self.assertEqual(results[0]["loaded"], [])
+
+    def test_headless_names_skip_graphics(self):
+        self.assertEqual(probe()["headless"], [])
+
+    def test_public_names(self):
+        for name in orion_core.__all__:
+            self.assertTrue(hasattr(orion_core, name), name)
+        self.assertIn("Window", dir(orion_core))
+        self.assertRaises(AttributeError, getattr, orion_core, "missing_name")
+
+
+if __name__ == '__main__':
+    unittest.main()
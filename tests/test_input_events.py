@@ -0,0 +1,72 @@
+
+from .context import orion_core
+import unittest
+from pyglet.window import key as pyglet_key
+from orion_core.shared import input_events
+
+
+class InputEventsTestSuite(unittest.TestCase):
+    """ Input event queue test cases """
+
+    def test_key_set(self):
+        keys = input_events.KeySet()
+        self.assertTrue(keys.add(65307))
+        self.assertFalse(keys.add(65307))
+        self.assertIn(65307, keys)
+        self.assertNotIn(65306, keys)
+        self.assertTrue(keys.add(1 << 20))
+        self.assertEqual(len(keys), 2)
+        self.assertTrue(keys.discard(65307))
+        self.assertFalse(keys.discard(65307))
+        self.assertEqual(len(keys), 1)
+        self.assertEqual(list(keys), [1 << 20])
+
+    def test_user_keys(self):
+        # unmapped keys arrive as scancode << 32 on xlib and win32
+        key = pyglet_key.user_key(0x80)
+        state = orion_core.InputState()
+        self.assertTrue(state.press(key, 0, 0.0))
+        self.assertTrue(state.is_pressed(key))
+        self.assertLess(len(state.pressed.bits), 1 << 16)
+        self.assertEqual(list(state.pressed), [key])
+        self.assertTrue(state.release(key, 0, 0.1))
+        self.assertFalse(state.is_pressed(key))
+        self.assertEqual(len(state.pressed), 0)
+
+    def test_events_in_order(self):
+        state = orion_core.InputState(repeat_delay=0.2, repeat_time=0.05)
+        self.assertEqual(state.poll(0.0), [])
+        state.press(10, 1, 0.0)
+        state.mouse_motion(5, 6, 0.22)
+        events = state.poll(0.31)
+        self.assertEqual([(e.time, e.type) for e in events],
+                         [(0.0, input_events.KEY_PRESS), (0.2, input_events.KEY_REPEAT),
+                          (0.22, input_events.MOUSE_MOTION), (0.25, input_events.KEY_REPEAT),
+                          (0.30, input_events.KEY_REPEAT)])
+        self.assertEqual(events[1].modifiers, 1)
+
+    def test_release_cancels_repeat(self):
+        state = orion_core.InputState(repeat_delay=0.2, repeat_time=0.05)
+        state.press(10, 0, 0.0)
+        state.release(10, 0, 0.1)
+        state.press(10, 0, 0.15)
+        events = state.poll(0.3)
+        # the repeat scheduled by the first press is dropped
+        self.assertEqual([e.type for e in events],
+                         [input_events.KEY_PRESS, input_events.KEY_RELEASE, input_events.KEY_PRESS])
+        repeats = state.poll(0.36)
+        self.assertEqual(len(repeats), 1)
+        self.assertAlmostEqual(repeats[0].time, 0.35)
+
+    def test_actions(self):
+        state = orion_core.InputState()
+        state.bind("jump", 32, 119)
+        state.press(119, 0, 0.0)
+        self.assertTrue(state.is_action_pressed("jump"))
+        self.assertEqual(state.poll(0.0)[0].action, "jump")
+        state.unbind("jump")
+        self.assertFalse(state.is_action_pressed("jump"))
+
+
+if __name__ == '__main__':
+    unittest.main()
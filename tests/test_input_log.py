@@ -0,0 +1,91 @@
+
+from .context import orion_core
+import os
+import tempfile
+import unittest
+import pyglet
+from orion_core.shared import input_log
+from .helpers import StubWindow
+
+
+class FakeDispatcher(pyglet.event.EventDispatcher):
+    """ stands in for the arcade window event stack """
+
+
+for event_type in ("on_key_press", "on_key_release", "on_mouse_motion", "on_mouse_press",
+                   "on_mouse_release", "on_update"):
+    FakeDispatcher.register_event_type(event_type)
+
+
+def record_session() -> orion_core.InputLog:
+    dispatcher = FakeDispatcher()
+    recorder = orion_core.InputRecorder()
+    recorder.attach(dispatcher)
+    dispatcher.dispatch_event("on_update", 1 / 60)
+    dispatcher.dispatch_event("on_key_press", orion_core.key.LEFT, 0)
+    dispatcher.dispatch_event("on_mouse_motion", 10, 20, 1, -1)
+    for _ in range(20):
+        dispatcher.dispatch_event("on_update", 1 / 60)
+    dispatcher.dispatch_event("on_mouse_press", 10, 20, 1, 0)
+    dispatcher.dispatch_event("on_key_release", orion_core.key.LEFT, 0)
+    dispatcher.dispatch_event("on_mouse_release", 10, 20, 1, 0)
+    dispatcher.dispatch_event("on_update", 0.021)
+    recorder.detach()
+    dispatcher.dispatch_event("on_update", 1 / 60)
+    return recorder.log
+
+
+class InputLogTestSuite(unittest.TestCase):
+    """ Input recording and replay test cases """
+
+    def test_record(self):
+        log = record_session()
+        self.assertEqual(log.frames, 22)
+        records = list(log)
+        self.assertEqual(records[1], (input_log.KEY_PRESS, orion_core.key.LEFT, 0))
+        self.assertEqual(records[2], (input_log.MOUSE_MOTION, 10, 20, 1, -1))
+        self.assertEqual(records[-1], (input_log.FRAME, 0.021))
+
+    def test_save_load(self):
+        log = record_session()
+        with tempfile.TemporaryDirectory() as path:
+            file = os.path.join(path, "session.oril")
+            log.save(file)
+            loaded = orion_core.InputLog.load(file)
+            self.assertEqual(list(loaded), list(log))
+            self.assertEqual(loaded.frames, log.frames)
+
+            with open(file, "wb") as f:
+                f.write(b"nope" + bytes(8))
+            self.assertRaises(ValueError, orion_core.InputLog.load, file)
+
+    def test_replay_is_deterministic(self):
+        log = record_session()
+        runs = []
+        for _ in range(2):
+            window = StubWindow.headless()
+            window.set_fixed_step(True, tick_rate=60)
+            self.assertEqual(orion_core.replay(window, log), 22)
+            runs.append((window.time_elapsed, window.updates, window.presses, window.mouse_x))
+        self.assertEqual(runs[0], runs[1])
+        time_elapsed, updates, presses, mouse_x = runs[0]
+        self.assertAlmostEqual(time_elapsed, 21 / 60 + 0.021)
+        self.assertEqual(mouse_x, 10)
+        # the press plus the repeats while it was held
+        self.assertGreater(len(presses), 1)
+        self.assertEqual(set(presses), {orion_core.key.LEFT})
+
+    def test_replay_into_headless_window(self):
+        class Game(orion_core.Window):
+            pass
+
+        window = Game.headless(320, 200)
+        self.assertEqual((window.width, window.height), (320, 200))
+        self.assertEqual(window.camera_offset_x, 160)
+        self.assertEqual(orion_core.replay(window, record_session()), 22)
+        self.assertEqual(window.mouse_x, 10)
+        self.assertFalse(window.input.is_pressed(orion_core.key.LEFT))
+
+
+if __name__ == '__main__':
+    unittest.main()
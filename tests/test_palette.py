@@ -0,0 +1,71 @@
+
+from .context import orion_core
+import unittest
+import numpy as np
+from orion_core.shared import palette
+
+
+class PaletteTestSuite(unittest.TestCase):
+    """ Palette table test cases """
+
+    def test_table(self):
+        table = orion_core.get_palette()
+        self.assertEqual(table.colors.dtype, np.uint8)
+        self.assertEqual(table.colors.shape, (len(table), 4))
+        self.assertEqual(table["RED"], (255, 0, 0, 255))
+        self.assertEqual(table.rgb[table.index["RED"]].tolist(), [255, 0, 0])
+        self.assertIn("ALICE_BLUE", table)
+        self.assertEqual(table.name_of(orion_core.color.ALICE_BLUE), "ALICE_BLUE")
+        self.assertIsNone(table.name_of((1, 2, 3)))
+
+    def test_lookup(self):
+        table = orion_core.Palette(["black", "white"], [(0, 0, 0), (255, 255, 255)])
+        rows = table.lookup(np.array([[[0, 0, 0, 255], [255, 255, 255, 255], [9, 9, 9, 255]]], dtype=np.uint8))
+        self.assertEqual(rows.tolist(), [[0, 1, -1]])
+        self.assertEqual(table.lookup((255, 255, 255, 40)).tolist(), -1)
+        self.assertEqual(table.lookup((255, 255, 255, 40), alpha=False).tolist(), 1)
+
+        empty = orion_core.Palette([], np.zeros((0, 4), dtype=np.uint8))
+        self.assertRaises(ValueError, empty.lookup, (0, 0, 0))
+
+    def test_quantize(self):
+        table = orion_core.Palette(["red", "green", "blue"], [(255, 0, 0), (0, 255, 0), (0, 0, 255)])
+        pixels = np.array([[[200, 30, 30, 10], [20, 220, 40, 255], [0, 10, 180, 128]]], dtype=np.uint8)
+        expected = [[[255, 0, 0, 10], [0, 255, 0, 255], [0, 0, 255, 128]]]
+        self.assertEqual(table.quantize(pixels).tolist(), expected)
+        self.assertEqual(table.quantize(pixels, exact=True).tolist(), expected)
+
+    def test_cube_close_to_exact(self):
+        table = orion_core.get_palette()
+        pixels = np.random.default_rng(3).integers(0, 256, (32, 32, 4), dtype=np.uint8)
+        rgb = pixels[..., :3].astype(np.int32)
+        cube = ((table.rgb[table.nearest(pixels)] - rgb) ** 2).sum(axis=-1)
+        exact = ((table.rgb[table.nearest(pixels, exact=True)] - rgb) ** 2).sum(axis=-1)
+        self.assertTrue((cube >= exact).all())
+        # a cube cell is 8 wide, so the pick is never far off the closest
+        self.assertLess(np.sqrt(cube).max() - np.sqrt(exact).max(), 16)
+
+    def test_tint_and_blend(self):
+        pixels = np.full((2, 2, 4), 200, dtype=np.uint8)
+        self.assertEqual(palette.tint(pixels, (255, 128, 0))[0, 0].tolist(), [200, 100, 0, 200])
+        self.assertEqual(palette.tint(pixels, (255, 128, 0), 0.0)[0, 0].tolist(), [200, 200, 200, 200])
+        self.assertEqual(palette.blend(pixels, (0, 0, 0, 0), 0.25)[0, 0].tolist(), [150, 150, 150, 150])
+        light = np.array([[0.0, 1.0], [0.5, 0.5]], dtype=np.float32)
+        blended = palette.blend(pixels, np.zeros_like(pixels), light)
+        self.assertEqual(blended[..., 0].tolist(), [[200, 0], [100, 100]])
+
+    def test_remap(self):
+        source = orion_core.Palette(["main", "trim"], [(255, 0, 0), (128, 0, 0)])
+        target = orion_core.Palette(["main", "trim"], [(0, 0, 255), (0, 0, 128)])
+        pixels = np.array([[[255, 0, 0, 255], [128, 0, 0, 255], [7, 7, 7, 255]]], dtype=np.uint8)
+        self.assertEqual(palette.remap(pixels, source, target).tolist(),
+                         [[[0, 0, 255, 255], [0, 0, 128, 255], [7, 7, 7, 255]]])
+
+        # semi transparent team color pixels swap too and keep their alpha
+        edges = np.array([[[255, 0, 0, 128], [128, 0, 0, 0], [7, 7, 7, 64]]], dtype=np.uint8)
+        self.assertEqual(palette.remap(edges, source, target).tolist(),
+                         [[[0, 0, 255, 128], [0, 0, 128, 0], [7, 7, 7, 64]]])
+
+
+if __name__ == '__main__':
+    unittest.main()
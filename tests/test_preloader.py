@@ -0,0 +1,105 @@
+
+from .context import orion_core
+import os
+import shutil
+import tempfile
+import unittest
+from PIL import Image
+
+
+class PreloaderTestSuite(unittest.TestCase):
+    """ Asset preloader test cases """
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.file = os.path.join(self.path, "sheet.png")
+        Image.new("RGBA", (16, 8), (10, 20, 30, 255)).save(self.file)
+        self.level = os.path.join(self.path, "level.txt")
+        with open(self.level, "w") as f:
+            f.write("#..#\n####\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_preload_manifest(self):
+        manifest = {
+            "tiles": {"type": "spritesheet", "file": self.file, "tile_size": 8},
+            "level": {"type": "tile_map", "width": 4, "height": 2, "tile_size": 8,
+                      "map_file": self.level, "textures": {"#": ("tiles", 1)}, "solid": "#"},
+            "inline": {"type": "tile_map", "width": 2, "height": 1, "tile_size": 8, "map": ".#"},
+            "answer": {"type": "custom", "loader": lambda: 42},
+        }
+        progress = orion_core.preload(manifest, workers=4, registry=orion_core.TextureRegistry())
+        assets = progress.wait(10)
+        self.assertTrue(progress.done)
+        self.assertEqual(progress.fraction, 1.0)
+        self.assertEqual(progress.errors(), {})
+        self.assertEqual(assets["answer"], 42)
+        self.assertEqual(assets["level"].map_string, "#..#####")
+        self.assertEqual(assets["inline"].get_tile_type(1, 0), "#")
+        self.assertIs(assets["level"].texture_map["#"], assets["tiles"].get_texture(1))
+        self.assertEqual(sum(len(chunk) for chunk in assets["level"].chunks.values()), 6)
+
+    def test_map_file_keeps_spaces(self):
+        with open(self.level, "w", newline="") as f:
+            f.write("# #\r\n  #\n")
+        manifest = {"level": {"type": "tile_map", "width": 3, "height": 2, "tile_size": 8,
+                              "map_file": self.level}}
+        level = orion_core.preload(manifest, workers=1).result("level", 10)
+        self.assertEqual(level.map_string, "# #  #")
+        self.assertEqual(level.get_tile_type(1, 1), " ")
+
+    def test_sprites_built_by_caller(self):
+        manifest = {
+            "tiles": {"type": "spritesheet", "file": self.file, "tile_size": 8},
+            "level": {"type": "tile_map", "width": 4, "height": 2, "tile_size": 8,
+                      "map": "#..#####", "textures": {"#": ("tiles", 1)}},
+        }
+        progress = orion_core.preload(manifest, workers=2, registry=orion_core.TextureRegistry())
+        level = progress.futures["level"].result(10)
+        self.assertEqual(level.chunks, {})
+        self.assertIs(progress.result("level"), level)
+        self.assertEqual(sum(len(chunk) for chunk in level.chunks.values()), 6)
+
+    def test_dependencies_on_one_worker(self):
+        registry = orion_core.TextureRegistry()
+        # the tile maps come first and the sheets they need after them
+        manifest = {
+            "level": {"type": "tile_map", "width": 2, "height": 1, "tile_size": 8,
+                      "map": "#.", "textures": {"#": ("custom_tiles", 0)}},
+            "broken_level": {"type": "tile_map", "width": 2, "height": 1, "tile_size": 8,
+                             "map": "#.", "textures": {"#": ("broken", 0)}},
+            "custom_tiles": {"type": "custom", "loader": lambda: orion_core.Spritesheet(self.file, 8,
+                                                                                        registry=registry)},
+            "broken": {"type": "custom", "loader": lambda: 1 / 0},
+        }
+        progress = orion_core.preload(manifest, workers=1, registry=registry)
+        self.assertEqual(progress.futures["level"].result(10).get_tile_type(0, 0), "#")
+        self.assertRaises(ZeroDivisionError, progress.futures["broken_level"].result, 10)
+        self.assertEqual(sorted(progress.errors()), ["broken", "broken_level"])
+
+    def test_textures_from_tile_maps(self):
+        manifest = {
+            "inline": {"type": "tile_map", "width": 2, "height": 1, "tile_size": 8, "map": ".#"},
+            "level": {"type": "tile_map", "width": 2, "height": 1, "tile_size": 8,
+                      "map": "#.", "textures": {"#": ("inline", 0)}},
+        }
+        with self.assertRaises(ValueError):
+            orion_core.preload(manifest)
+
+    def test_errors(self):
+        def broken():
+            raise IOError("broken asset")
+
+        progress = orion_core.preload({"broken": {"type": "custom", "loader": broken}}, workers=1)
+        with self.assertRaises(IOError):
+            progress.result("broken", 10)
+        self.assertIn("broken", progress.errors())
+
+    def test_unknown_type(self):
+        with self.assertRaises(ValueError):
+            orion_core.preload({"odd": {"type": "sound"}})
+
+
+if __name__ == '__main__':
+    unittest.main()
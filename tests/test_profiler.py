@@ -0,0 +1,51 @@
+
+from .context import orion_core
+import unittest
+import numpy as np
+
+
+class FakeClock(object):
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ProfilerTestSuite(unittest.TestCase):
+    """ Frame profiler test cases """
+
+    def test_phase_timing(self):
+        clock = FakeClock()
+        profiler = orion_core.FrameProfiler(("update", "draw"), capacity=4, clock=clock)
+        for frame in range(6):
+            profiler.next_frame()
+            with profiler.phase("update"):
+                clock.now += 0.001 * (frame + 1)
+            profiler.start("draw")
+            clock.now += 0.002
+            profiler.stop("draw")
+
+        # only the last four frames are kept, oldest first
+        self.assertEqual(profiler.count, 4)
+        np.testing.assert_allclose(profiler.history()[:, 0], [0.003, 0.004, 0.005, 0.006])
+        np.testing.assert_allclose(profiler.frame_times(), [0.005, 0.006, 0.007, 0.008])
+
+    def test_percentiles(self):
+        clock = FakeClock()
+        profiler = orion_core.FrameProfiler(("update",), capacity=100, clock=clock)
+        self.assertEqual(profiler.percentiles("update"), (0.0, 0.0, 0.0))
+        for frame in range(100):
+            profiler.next_frame()
+            profiler.start("update")
+            clock.now += 0.001 if frame < 90 else 0.020
+            profiler.stop("update")
+        p50, p95, p99 = profiler.percentiles("update")
+        self.assertAlmostEqual(p50, 1.0)
+        self.assertAlmostEqual(p95, 20.0)
+        self.assertEqual(sorted(profiler.stats()), ["frame", "update"])
+
+
+if __name__ == '__main__':
+    unittest.main()
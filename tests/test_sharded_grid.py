@@ -0,0 +1,56 @@
+
+from .context import orion_core
+import gc
+import unittest
+import numpy as np
+from multiprocessing import shared_memory
+from orion_core.backend import ShardedAutomaton, split_bands
+
+
+class ShardedGridTestSuite(unittest.TestCase):
+    """ Sharded grid simulation test cases """
+
+    def test_split_bands(self):
+        self.assertEqual(split_bands(10, 3), [(0, 4), (4, 3), (7, 3)])
+        self.assertEqual(split_bands(2, 8), [(0, 1), (1, 1)])
+
+    def test_matches_single_process(self):
+        for edges in ("dead", "wrap", "clamp"):
+            for workers in (1, 3):
+                single = orion_core.CellularAutomaton(41, 23, "B36/S23", edges)
+                single.randomize(0.35, seed=workers)
+                with ShardedAutomaton(41, 23, "B36/S23", edges, workers=workers) as sharded:
+                    sharded.load(single.cells)
+                    for _ in range(3):
+                        single.step(4)
+                        sharded.step(4)
+                        self.assertTrue(np.array_equal(sharded.cells, single.cells),
+                                        "{} workers={}".format(edges, workers))
+                    self.assertEqual(sharded.generation, 12)
+
+    def test_dead_worker(self):
+        sharded = ShardedAutomaton(16, 16, workers=2, timeout=5.0)
+        names = [block.name for block in sharded.blocks]
+        sharded.processes[1].terminate()
+        sharded.processes[1].join()
+        self.assertRaises(RuntimeError, sharded.step)
+        self.assertEqual(sharded.processes, [])
+        for name in names:
+            self.assertRaises(FileNotFoundError, shared_memory.SharedMemory, name=name)
+        self.assertRaises(RuntimeError, sharded.step)
+        sharded.close()
+
+    def test_collected_without_close(self):
+        sharded = ShardedAutomaton(16, 16, workers=2)
+        sharded.step()
+        names = [block.name for block in sharded.blocks]
+        processes = list(sharded.processes)
+        del sharded
+        gc.collect()
+        self.assertFalse(any(process.is_alive() for process in processes))
+        for name in names:
+            self.assertRaises(FileNotFoundError, shared_memory.SharedMemory, name=name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+
+from .context import orion_core
+import unittest
+import numpy as np
+
+
+class SpatialHashTestSuite(unittest.TestCase):
+    """ Spatial hash test cases """
+
+    def test_cell_size_from_tile_map(self):
+        tile_map = orion_core.TileMap(4, 4, 32)
+        self.assertEqual(orion_core.SpatialHash(tile_map=tile_map).cell_size, 32)
+
+    def test_queries(self):
+        grid = orion_core.SpatialHash(10)
+        grid.insert(1, 5, 5, 2, 2)
+        grid.insert(2, 25, 5, 2, 2)
+        grid.insert(300, 50, 50, 1, 1)
+        self.assertEqual(len(grid), 3)
+        self.assertEqual(grid.query_rect(0, 0, 10, 10).tolist(), [1])
+        self.assertEqual(grid.query_rect(0, 0, 60, 60).tolist(), [1, 2, 300])
+        self.assertEqual(grid.query_radius(15, 5, 8.5).tolist(), [1, 2])
+        self.assertEqual(grid.query_point(50, 50).tolist(), [300])
+
+    def test_move_and_remove(self):
+        grid = orion_core.SpatialHash(10)
+        grid.insert(1, 5, 5, 2, 2)
+        cells = dict((key, set(bucket)) for key, bucket in grid.cells.items())
+        grid.move(1, 6, 6)
+        self.assertEqual(grid.cells, cells)
+        grid.move(1, 45, 45)
+        self.assertEqual(grid.query_rect(0, 0, 10, 10).tolist(), [])
+        self.assertEqual(grid.query_rect(40, 40, 50, 50).tolist(), [1])
+        grid.remove(1)
+        self.assertEqual(len(grid), 0)
+        self.assertEqual(grid.cells, {})
+
+    def test_move_unknown_handle(self):
+        spatial = orion_core.SpatialHash(16, capacity=4)
+        self.assertRaises(KeyError, spatial.move, 2, 10, 10)
+        self.assertRaises(KeyError, spatial.move, 100, 10, 10)
+        self.assertEqual(spatial.query_rect(0, 0, 64, 64).tolist(), [])
+        self.assertRaises(ValueError, spatial.insert, -1, 0, 0)
+
+    def test_capacity(self):
+        self.assertRaises(ValueError, orion_core.SpatialHash, 16, capacity=0)
+        spatial = orion_core.SpatialHash(16, capacity=1)
+        spatial.insert(40, 8, 8)
+        self.assertIn(40, spatial)
+        self.assertGreater(spatial.active.size, 40)
+
+    def test_pairs_match_brute_force(self):
+        rng = np.random.RandomState(3)
+        grid = orion_core.SpatialHash(16)
+        boxes = []
+        for handle in range(200):
+            x, y = rng.uniform(0, 400, 2)
+            grid.insert(handle, x, y, 4, 4)
+            boxes.append((x - 4, y - 4, x + 4, y + 4))
+        expected = []
+        for a in range(200):
+            for b in range(a + 1, 200):
+                if boxes[a][0] <= boxes[b][2] and boxes[a][2] >= boxes[b][0] and \
+                        boxes[a][1] <= boxes[b][3] and boxes[a][3] >= boxes[b][1]:
+                    expected.append([a, b])
+        self.assertEqual(grid.pairs().tolist(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+
+from .context import orion_core
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from PIL import Image
+from .helpers import make_sheet_file
+
+
+class SpritesheetTestSuite(unittest.TestCase):
+    """ Spritesheet test cases """
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.file = os.path.join(self.path, "sheet.png")
+        make_sheet_file(self.file, 4, 2, 8)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_regions(self):
+        sheet = orion_core.Spritesheet(self.file, 8)
+        self.assertEqual(len(sheet.regions), 8)
+        region = sheet.get_region(5)
+        self.assertEqual((region.x, region.y), (8, 8))
+        self.assertEqual(region.uv, (0.25, 0.5, 0.5, 1.0))
+        self.assertEqual(region.image().getpixel((0, 0)), (40, 40, 100, 255))
+        self.assertIsNone(sheet.get_region(8))
+
+    def test_textures(self):
+        sheet = orion_core.Spritesheet(self.file, 8)
+        self.assertEqual(sheet.get_texture(1).image.getpixel((3, 3)), (40, 0, 100, 255))
+        self.assertIsNone(sheet.get_texture(8))
+
+    def test_lazy(self):
+        sheet = orion_core.Spritesheet(self.file, 8, lazy=True)
+        self.assertEqual(sheet.sprite_textures, [None] * 8)
+        texture = sheet.get_texture(1)
+        self.assertEqual(texture.image.getpixel((3, 3)), (40, 0, 100, 255))
+        self.assertIs(sheet.get_texture(1), texture)
+        self.assertEqual(sum(t is not None for t in sheet.sprite_textures), 1)
+        sheet.prefetch([4, 5])
+        self.assertEqual(sum(t is not None for t in sheet.sprite_textures), 3)
+
+    def test_missing_file(self):
+        sheet = orion_core.Spritesheet(os.path.join(self.path, "missing.png"), 8)
+        self.assertIsNone(sheet.get_texture(0))
+
+    def test_pack_atlas(self):
+        other_file = os.path.join(self.path, "other.png")
+        make_sheet_file(other_file, 2, 3, 8)
+        sheets = [orion_core.Spritesheet(self.file, 8), orion_core.Spritesheet(other_file, 8)]
+        before = [[region.image().tobytes() for region in sheet.regions] for sheet in sheets]
+
+        atlas = orion_core.pack_atlas(sheets, max_width=64)
+        for sheet, images in zip(sheets, before):
+            self.assertIs(sheet.atlas, atlas)
+            self.assertIs(sheet.handles["atlas"].value, atlas)
+            self.assertEqual([region.image().tobytes() for region in sheet.regions], images)
+
+    def test_packs_with_the_same_name(self):
+        registry = orion_core.TextureRegistry()
+        red_file = os.path.join(self.path, "red.png")
+        blue_file = os.path.join(self.path, "blue.png")
+        Image.new("RGBA", (8, 8), (255, 0, 0, 255)).save(red_file)
+        Image.new("RGBA", (8, 8), (0, 0, 255, 255)).save(blue_file)
+        red = orion_core.Spritesheet(red_file, 8, lazy=True, registry=registry)
+        blue = orion_core.Spritesheet(blue_file, 8, lazy=True, registry=registry)
+        orion_core.pack_atlas([red])
+        orion_core.pack_atlas([blue])
+        self.assertEqual(registry.refs(("atlas", os.path.abspath(red_file))), 0)
+        self.assertEqual(red.get_texture(0).image.getpixel((0, 0)), (255, 0, 0, 255))
+        self.assertEqual(blue.get_texture(0).image.getpixel((0, 0)), (0, 0, 255, 255))
+
+    def test_cache(self):
+        cache = orion_core.SpritesheetCache(os.path.join(self.path, "cache"))
+        self.assertIsNone(cache.load(self.file, 8))
+        cold = orion_core.Spritesheet(self.file, 8, cache=cache)
+        warm_pixels = cache.load(self.file, 8)
+        self.assertIsInstance(warm_pixels, np.memmap)
+
+        warm = orion_core.Spritesheet(self.file, 8, cache=cache)
+        self.assertEqual(warm.get_texture(5).image.tobytes(), cold.get_texture(5).image.tobytes())
+
+        # a different tile size or a changed file is a different entry
+        self.assertIsNone(cache.load(self.file, 4))
+        make_sheet_file(self.file, 4, 3, 8)
+        os.utime(self.file, ns=(0, 0))
+        self.assertIsNone(cache.load(self.file, 8))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+
+from .context import orion_core
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from PIL import Image
+
+
+class Resource(object):
+
+    def __init__(self, size: int) -> None:
+        self.pixels = np.zeros(size, dtype=np.uint8)
+
+
+class TextureRegistryTestSuite(unittest.TestCase):
+    """ Texture registry test cases """
+
+    def test_dedupe_and_refs(self):
+        registry = orion_core.TextureRegistry()
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return Resource(10)
+
+        first = registry.acquire("a", loader)
+        second = registry.acquire("a", loader)
+        self.assertIs(first.value, second.value)
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(registry.refs("a"), 2)
+        first.release()
+        first.release()
+        self.assertEqual(registry.refs("a"), 1)
+
+    def test_failed_load(self):
+        registry = orion_core.TextureRegistry()
+        self.assertIsNone(registry.acquire("missing", lambda: None))
+        self.assertNotIn("missing", registry)
+
+    def test_lru_eviction(self):
+        registry = orion_core.TextureRegistry(budget=25)
+        held = registry.acquire("held", lambda: Resource(10))
+        registry.acquire("old", lambda: Resource(10)).release()
+        registry.acquire("new", lambda: Resource(10)).release()
+        # over budget, the oldest unreferenced entry goes first
+        self.assertNotIn("old", registry)
+        self.assertIn("new", registry)
+        self.assertIn("held", registry)
+        self.assertEqual(registry.memory_used, 20)
+
+        registry.acquire("big", lambda: Resource(30)).release()
+        self.assertEqual(list(registry.entries), ["held"])
+        held.release()
+        registry.clear()
+        self.assertEqual(len(registry), 0)
+        self.assertEqual(registry.memory_used, 0)
+
+    def test_spritesheets_share_textures(self):
+        path = tempfile.mkdtemp()
+        try:
+            file = os.path.join(path, "sheet.png")
+            Image.new("RGBA", (16, 8), (10, 20, 30, 255)).save(file)
+            registry = orion_core.TextureRegistry()
+            first = orion_core.Spritesheet(file, 8, registry=registry)
+            second = orion_core.Spritesheet(file, 8, registry=registry, lazy=True)
+            self.assertIs(first.atlas, second.atlas)
+            self.assertIs(first.get_texture(1), second.get_texture(1))
+
+            first.release()
+            second.release()
+            self.assertGreater(len(registry), 0)
+            registry.clear()
+            self.assertEqual(len(registry), 0)
+        finally:
+            shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+
+from .context import orion_core
+import os
+import shutil
+import tempfile
+import unittest
+import arcade
+from PIL import Image
+from .helpers import make_sheet_file
+
+
+class TextureVariantsTestSuite(unittest.TestCase):
+    """ Texture variant cache test cases """
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.file = os.path.join(self.path, "sheet.png")
+        make_sheet_file(self.file, 4, 2, 8)
+        self.registry = orion_core.TextureRegistry()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_shared_variants(self):
+        variants = orion_core.TextureVariants()
+        sheet = orion_core.Spritesheet(self.file, 8, lazy=True, registry=self.registry)
+        red = sheet.get_variant(1, orion_core.Tint((255, 0, 0)), variants)
+        self.assertEqual(red.image.getpixel((0, 0)), (40, 0, 0, 255))
+        self.assertIs(sheet.get_variant(1, orion_core.Tint((255, 0, 0)), variants), red)
+        self.assertIsNot(sheet.get_variant(1, orion_core.Tint((0, 0, 255)), variants), red)
+        self.assertIsNot(sheet.get_variant(2, orion_core.Tint((255, 0, 0)), variants), red)
+        self.assertEqual(len(variants), 3)
+
+        # the sheet holds its variants until it is released
+        self.assertEqual(variants.registry.refs(variants.key(sheet.get_region(1), orion_core.Tint((255, 0, 0)))), 1)
+        sheet.release()
+        self.assertEqual(variants.registry.refs(variants.key(sheet.get_region(1), orion_core.Tint((255, 0, 0)))), 0)
+        self.assertIsNone(sheet.get_variant(8, orion_core.Tint((255, 0, 0)), variants))
+
+    def test_texture_source(self):
+        variants = orion_core.TextureVariants()
+        texture = arcade.Texture("solid", Image.new("RGBA", (4, 4), (10, 20, 30, 255)))
+        source = orion_core.Palette(["a"], [(10, 20, 30)])
+        target = orion_core.Palette(["a"], [(1, 2, 3)])
+        with variants.acquire(texture, orion_core.Remap(source, target)) as swapped:
+            self.assertEqual(swapped.value.image.getpixel((2, 2)), (1, 2, 3, 255))
+
+    def test_custom_transforms(self):
+        variants = orion_core.TextureVariants()
+        texture = arcade.Texture("solid", Image.new("RGBA", (4, 4), (10, 20, 30, 255)))
+        first = variants.acquire(texture, orion_core.Custom("invert", lambda pixels: 255 - pixels))
+        second = variants.acquire(texture, orion_core.Custom("invert", lambda pixels: 255 - pixels))
+        self.assertIs(first.value, second.value)
+        self.assertEqual(first.value.image.getpixel((0, 0)), (245, 235, 225, 0))
+        self.assertEqual(len(variants), 1)
+        self.assertRaises(TypeError, variants.acquire, texture, lambda pixels: pixels)
+
+    def test_packs_with_the_same_name(self):
+        variants = orion_core.TextureVariants()
+        files = []
+        for name, rgb in (("red.png", (255, 0, 0, 255)), ("blue.png", (0, 0, 255, 255))):
+            files.append(os.path.join(self.path, name))
+            Image.new("RGBA", (8, 8), rgb).save(files[-1])
+        sheets = [orion_core.Spritesheet(file, 8, lazy=True, registry=self.registry) for file in files]
+        for sheet in sheets:
+            orion_core.pack_atlas([sheet])
+        tint = orion_core.Tint((255, 255, 255))
+        self.assertEqual(sheets[0].get_variant(0, tint, variants).image.getpixel((0, 0)), (255, 0, 0, 255))
+        self.assertEqual(sheets[1].get_variant(0, tint, variants).image.getpixel((0, 0)), (0, 0, 255, 255))
+
+    def test_lru_eviction(self):
+        # each 8x8 RGBA variant is 256 bytes, room for two
+        variants = orion_core.TextureVariants(budget=512)
+        sheet = orion_core.Spritesheet(self.file, 8, lazy=True, registry=self.registry)
+        region = sheet.get_region(0)
+        tints = [orion_core.Tint((i * 50, 0, 0)) for i in range(3)]
+        for tint in (tints[0], tints[1], tints[0], tints[2]):
+            variants.acquire(region, tint).release()
+        self.assertIn(variants.key(region, tints[0]), variants)
+        self.assertNotIn(variants.key(region, tints[1]), variants)
+        self.assertEqual(variants.registry.memory_used, 512)
+
+    def test_held_variants_stay(self):
+        variants = orion_core.TextureVariants(budget=0)
+        sheet = orion_core.Spritesheet(self.file, 8, lazy=True, registry=self.registry)
+        handle = variants.acquire(sheet.get_region(0), orion_core.Blend((0, 0, 0), 0.5))
+        self.assertEqual(len(variants), 1)
+        handle.release()
+        self.assertEqual(len(variants), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
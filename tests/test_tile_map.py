@@ -0,0 +1,69 @@
+
+from .context import orion_core
+import unittest
+import arcade
+import numpy as np
+from PIL import Image
+
+
+def make_map(width: int, height: int, tile_size: int = 8, chunk_size: int = 4) -> orion_core.TileMap:
+    texture = arcade.Texture("test_tile", Image.new("RGBA", (tile_size, tile_size)))
+    tile_map = orion_core.TileMap(width, height, tile_size, chunk_size)
+    tile_map.load_texture_map({"#": texture})
+    level = ""
+    for y in range(height):
+        level += "".join("#" if (x + y) % 3 == 0 else "." for x in range(width))
+    tile_map.parse_map_string(level)
+    return tile_map
+
+
+class TileMapTestSuite(unittest.TestCase):
+    """ Tile map test cases """
+
+    def test_chunks_cover_map(self):
+        tile_map = make_map(10, 6)
+        self.assertEqual(tile_map.chunk_width, 3)
+        self.assertEqual(tile_map.chunk_height, 2)
+        total = sum(len(chunk) for chunk in tile_map.chunks.values())
+        self.assertEqual(total, sum(1 for x in range(10) for y in range(6) if (x + y) % 3 == 0))
+
+    def test_visible_chunks(self):
+        tile_map = make_map(16, 16)
+        # camera over the bottom left corner sees a single chunk
+        visible = tile_map.visible_chunks(0, 32, 0, 32)
+        self.assertEqual(visible, [tile_map.chunks[(0, 3)]])
+        # whole map and beyond sees everything
+        visible = tile_map.visible_chunks(-100, 1000, -100, 1000)
+        self.assertEqual(len(visible), len(tile_map.chunks))
+
+    def test_get_tile(self):
+        tile_map = make_map(10, 6)
+        self.assertEqual(tile_map.get_tile(4, tile_map.height - 4), "#")
+        self.assertEqual(tile_map.get_tile(12, tile_map.height - 4), ".")
+
+    def test_grid_round_trip(self):
+        tile_map = make_map(10, 6)
+        self.assertEqual(tile_map.grid.shape, (6, 10))
+        self.assertEqual(tile_map.tile_char(tile_map.tile_id("#")), "#")
+        self.assertEqual(tile_map.get_tile_id(0, 0), tile_map.tile_id("#"))
+        level = tile_map.map_string
+        self.assertEqual(len(level), 60)
+        self.assertEqual(level[:4], "#..#")
+
+    def test_batch_lookup_matches_get_tile(self):
+        tile_map = make_map(10, 6)
+        world_x = np.array([4, 12, 20.5, 79, 0])
+        world_y = np.array([44, 44, 30, 1, 47.9])
+        ids = tile_map.get_tile_ids(world_x, world_y)
+        for i in range(world_x.size):
+            self.assertEqual(tile_map.tile_char(ids[i]), tile_map.get_tile(world_x[i], world_y[i]))
+
+    def test_batch_solid(self):
+        tile_map = make_map(10, 6)
+        tile_map.set_solid_tiles("#")
+        solid = tile_map.get_solid(np.array([4, 12, -5, 4]), np.array([44, 44, 10, 100]))
+        self.assertEqual(solid.tolist(), [True, False, True, True])
+
+
+if __name__ == '__main__':
+    unittest.main()